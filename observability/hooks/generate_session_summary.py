@@ -9,23 +9,64 @@ Session Summary Generator - Pure Python, no external dependencies.
 Reads Claude Code session JSONL files and generates summary JSON files.
 Tracks: tool counts, outcomes, compactions, interruptions, workflow stages.
 
-Output: ~/.claude/session-summaries/{date}_{session_id}.json
+Output: ~/.claude/session-summaries/{date}_{session_id}.json, also upserted
+into the SQLite index ~/.claude/observability-cache/summaries.db that
+collect_usage.py --quick-stats aggregates.
+
+Stop fires after every turn, so the parse checkpoint (byte offset plus
+accumulated stats) is kept in ~/.claude/observability-cache/hook-state/
+and each run only reads the lines appended since the previous one.
 """
 
+import copy
+import hashlib
 import json
 import os
 import re
+import sqlite3
 import subprocess
 import sys
+import time
 from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Callable, Iterator
 
 # Path constants (ADR-020: Centralize Path.home())
 HOME = Path.home()
 CLAUDE_DIR = HOME / ".claude"
 PROJECTS_DIR = CLAUDE_DIR / "projects"
 SUMMARY_DIR = CLAUDE_DIR / "session-summaries"
+STATE_DIR = CLAUDE_DIR / "observability-cache" / "hook-state"
+SESSION_INDEX_FILE = CLAUDE_DIR / "observability-cache" / "session-index.json"
+SUMMARY_INDEX_FILE = CLAUDE_DIR / "observability-cache" / "summaries.db"
+
+# Bump whenever the parse state layout or _consume_line output changes; discards saved states
+HOOK_STATE_VERSION = 2
+# State files untouched for this long belong to finished sessions and are removed
+HOOK_STATE_MAX_AGE_DAYS = 30
+# Bump whenever the summary index tables change; an older index is rebuilt
+SUMMARY_INDEX_VERSION = 1
+# Most recent session_id -> transcript entries kept for files not named <session_id>.jsonl
+SESSION_INDEX_MAX_ENTRIES = 500
+
+# Characters of each end of a tool result that detect_outcome searches
+OUTCOME_WINDOW_CHARS = 16 * 1024
+# Lowercase outcome markers per tool family, checked by detect_outcome. Bash
+# output with a success marker is a success whatever failure markers it has
+BASH_SUCCESS_MARKERS = ("exit code: 0", "succeeded")
+BASH_FAILURE_MARKERS = ("exit code:", "timeout", "error:", "failed", "traceback", "permission denied")
+EDIT_FAILURE_MARKERS = ("permission denied", "file not found", "no such file", "old_string not found", "not unique", "error")
+FAILURE_MARKERS = ("error", "failed")
+
+# Bytes read per chunk when streaming session JSONL (bounds memory to one line)
+JSONL_READ_CHUNK_SIZE = 1 << 20
+
+# Transcript line decoders, fastest first; msgspec and orjson are used only if
+# importable. OBSERVABILITY_JSON_BACKEND picks one (auto, msgspec, orjson, json)
+JSON_BACKENDS = ("msgspec", "orjson", "json")
+JSON_BACKEND_ENV = "OBSERVABILITY_JSON_BACKEND"
 
 
 def get_session_file(session_id: str, cwd: str) -> Path | None:
@@ -41,43 +82,89 @@ def get_session_file(session_id: str, cwd: str) -> Path | None:
     if not project_dir.exists():
         project_dir = PROJECTS_DIR / project_folder
 
+    # Transcripts are normally named <session_id>.jsonl: one stat, however big the directory
+    if "/" not in session_id:
+        direct = project_dir / f"{session_id}.jsonl"
+        if direct.is_file():
+            return direct
+
     if not project_dir.exists():
         return None
 
+    # Otherwise scan once and remember where this session's transcript lives
+    index = load_session_index()
+    indexed = index.get(session_id)
+    if indexed and Path(indexed).parent == project_dir and Path(indexed).is_file():
+        return Path(indexed)
+
     for jsonl_file in project_dir.glob("*.jsonl"):
         if session_id in jsonl_file.name:
+            index.pop(session_id, None)
+            index[session_id] = str(jsonl_file)
+            save_session_index(index)
             return jsonl_file
 
     return None
 
 
-def detect_outcome(tool_name: str, result: str) -> str:
+def load_session_index() -> dict[str, str]:
+    """Load the session_id -> transcript path index, oldest entries first."""
+    try:
+        index = json.loads(SESSION_INDEX_FILE.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def save_session_index(index: dict[str, str]) -> None:
+    """Persist the newest SESSION_INDEX_MAX_ENTRIES entries; failures are not fatal."""
+    entries = list(index.items())[-SESSION_INDEX_MAX_ENTRIES:]
+    try:
+        SESSION_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(SESSION_INDEX_FILE, json.dumps(dict(entries)))
+    except OSError as e:
+        print(f"WARNING: Could not save session index {SESSION_INDEX_FILE}: {e}", file=sys.stderr)
+
+
+def detect_outcome(tool_name: str, result: str | list) -> str:
     """Detect outcome from tool result content.
 
+    result is the tool_result content: a string, or a list of content blocks
+    whose text blocks are checked together. Of a text longer than twice
+    OUTCOME_WINDOW_CHARS only the head and tail windows are checked, since
+    that is where exit codes and error markers appear.
+
     NOTE: This function is intentionally duplicated in collect_usage.py.
     Both scripts use 'uv run --script' for standalone operation without dependencies.
     Keep implementations in sync when making changes (ADR-003).
     """
-    result_lower = result.lower()
+    if isinstance(result, str):
+        texts = [result]
+    else:
+        texts = [
+            item["text"] for item in result
+            if isinstance(item, dict) and item.get("type") == "text" and isinstance(item.get("text"), str)
+        ]
+    # Markers hold no newline, so none can match across the joined windows
+    result_lower = "\n".join([
+        text if len(text) <= 2 * OUTCOME_WINDOW_CHARS
+        else text[:OUTCOME_WINDOW_CHARS] + "\n" + text[-OUTCOME_WINDOW_CHARS:]
+        for text in texts
+    ]).lower()
 
     if tool_name == "Bash":
-        if "exit code: 0" in result_lower or "succeeded" in result_lower:
+        if any(marker in result_lower for marker in BASH_SUCCESS_MARKERS):
             return "success"
-        if "exit code:" in result_lower:
-            return "failure"
-        if "timeout" in result_lower:
-            return "failure"
-        if any(kw in result_lower for kw in ["error:", "failed", "traceback", "permission denied"]):
+        if any(marker in result_lower for marker in BASH_FAILURE_MARKERS):
             return "failure"
         return "success"
 
     if tool_name in ("Edit", "Write", "NotebookEdit"):
-        if any(kw in result_lower for kw in ["permission denied", "file not found", "no such file",
-                                              "old_string not found", "not unique", "error"]):
+        if any(marker in result_lower for marker in EDIT_FAILURE_MARKERS):
             return "failure"
         return "success"
 
-    if "error" in result_lower or "failed" in result_lower:
+    if any(marker in result_lower for marker in FAILURE_MARKERS):
         return "failure"
     return "success"
 
@@ -145,9 +232,50 @@ def classify_session_type(tool_counts: dict, stages: list, final_stage: str) ->
     return "READ"
 
 
-def parse_session_file(session_path: Path) -> dict:
-    """Parse a session JSONL file and extract summary data."""
-    stats = {
+def iter_lines_from(path: Path, offset: int = 0, chunk_size: int = JSONL_READ_CHUNK_SIZE) -> Iterator[tuple[bytes, int, bool]]:
+    """Yield (line, end_offset, terminated) for each newline-separated line from offset.
+
+    Reads in binary chunks so memory is bounded by the longest line.
+    end_offset is the byte position just past the line's newline. The segment
+    after the last newline comes last with terminated=False (possibly empty);
+    a writer may still be appending to it.
+
+    NOTE: Duplicated in collect_usage.py for standalone operation.
+    Keep implementations in sync (ADR-013).
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        pos = offset
+        tail: list[bytes] = []
+        while chunk := f.read(chunk_size):
+            start = 0
+            while (nl := chunk.find(b"\n", start)) != -1:
+                line = chunk[start:nl]
+                if tail:
+                    tail.append(line)
+                    line = b"".join(tail)
+                    tail = []
+                pos += len(line) + 1
+                yield line, pos, True
+                start = nl + 1
+            if start < len(chunk):
+                tail.append(chunk[start:])
+        line = b"".join(tail)
+        yield line, pos + len(line), False
+
+
+def _prefix_digest(session_path: Path, offset: int, window: int = 4096) -> str:
+    """Fingerprint the bytes just before offset to detect rewritten transcripts."""
+    if offset <= 0:
+        return ""
+    with open(session_path, "rb") as f:
+        f.seek(max(0, offset - window))
+        return hashlib.sha256(f.read(min(offset, window))).hexdigest()
+
+
+def new_summary_stats() -> dict:
+    """Empty session-summary stats, as add_summary_events accumulates them."""
+    return {
         "tool_counts": defaultdict(int),
         "success_count": 0,
         "failure_count": 0,
@@ -160,88 +288,281 @@ def parse_session_file(session_path: Path) -> dict:
         "agents_used": defaultdict(int),
     }
 
-    try:
-        lines = session_path.read_text().strip().split("\n")
-    except Exception as e:
-        print(f"ERROR: Failed to read {session_path}: {e}", file=sys.stderr)
-        return stats
 
-    for line in lines:
-        try:
-            entry = json.loads(line)
-        except json.JSONDecodeError:
-            continue
+def new_parse_state() -> dict:
+    """Empty stats plus the checkpoint fields parse_session_file resumes from."""
+    return {
+        **new_summary_stats(),
+        "byte_offset": 0,  # End of the last complete line consumed
+        "prefix_digest": "",  # Fingerprint of the bytes before byte_offset
+    }
 
-        entry_type = entry.get("type")
 
-        # Detect compactions
-        if entry_type == "system" and entry.get("subtype") == "compact_boundary":
+@dataclass
+class ToolUse:
+    """An assistant tool call; id links it to its ToolResult."""
+    id: str
+    name: str
+    input: dict
+    timestamp: float | str | None = None
+
+
+@dataclass
+class ToolResult:
+    """A tool result returned in a user entry."""
+    tool_use_id: str
+    content: object
+    timestamp: float | str | None = None
+
+
+@dataclass
+class Prompt:
+    """User text: string content with non-blank text, or a text item."""
+    text: str
+    timestamp: float | str | None = None
+
+
+@dataclass
+class Interruption:
+    """The "[Request interrupted by user]" marker, once per text that carries it."""
+    timestamp: float | str | None = None
+
+
+@dataclass
+class Compaction:
+    """A compact_boundary system entry."""
+    timestamp: float | str | None = None
+
+
+def entry_events(entry: dict) -> list:
+    """Walk one decoded transcript entry into events, in content order.
+
+    This is the one walk over entries shared by both parsers: the
+    collector's SessionData and the hook's summary stats both consume these
+    events.
+
+    NOTE: Duplicated in generate_session_summary.py / collect_usage.py for
+    standalone operation. Keep implementations in sync (ADR-013).
+    """
+    entry_type = entry.get("type")
+    timestamp = entry.get("timestamp")
+
+    if entry_type == "system":
+        return [Compaction(timestamp)] if entry.get("subtype") == "compact_boundary" else []
+
+    if entry_type == "assistant":
+        content = entry.get("message", {}).get("content", [])
+        if not isinstance(content, list):
+            return []
+        return [
+            ToolUse(item.get("id", ""), item.get("name", ""), item.get("input", {}), timestamp)
+            for item in content
+            if isinstance(item, dict) and item.get("type") == "tool_use"
+        ]
+
+    if entry_type != "user":
+        return []
+    content = entry.get("message", {}).get("content", "")
+    if isinstance(content, str):
+        if "[Request interrupted by user]" in content:
+            return [Interruption(timestamp)]
+        return [Prompt(content, timestamp)] if content.strip() else []
+
+    events = []
+    if isinstance(content, list):
+        for item in content:
+            if not isinstance(item, dict):
+                continue
+            item_type = item.get("type")
+            if item_type == "text":
+                text = item.get("text", "")
+                if "[Request interrupted by user]" in text:
+                    events.append(Interruption(timestamp))
+                else:
+                    events.append(Prompt(text, timestamp))
+            elif item_type == "tool_result":
+                # Tool results are in user messages
+                events.append(ToolResult(item.get("tool_use_id", ""), item.get("content", ""), timestamp))
+    return events
+
+
+def add_summary_events(stats: dict, events: list) -> None:
+    """Apply one entry's events to session-summary stats (see new_summary_stats)."""
+    for event in events:
+        if isinstance(event, ToolUse):
+            tool_name = event.name
+            if not tool_name:
+                continue
+            stats["tool_counts"][tool_name] += 1
+            # Track pending for interruption detection
+            if event.id:
+                stats["pending_tools"][event.id] = tool_name
+
+            # Track skill/agent usage
+            if tool_name == "Skill":
+                skill = event.input.get("skill", "unknown")
+                stats["skills_used"][skill] += 1
+            elif tool_name == "Task":
+                agent = event.input.get("subagent_type", "unknown")
+                stats["agents_used"][agent] += 1
+
+            # Infer workflow stage
+            new_stage = infer_workflow_stage(tool_name, event.input, stats["current_stage"])
+            if new_stage != stats["current_stage"]:
+                if new_stage not in stats["stages_visited"]:
+                    stats["stages_visited"].append(new_stage)
+                stats["current_stage"] = new_stage
+
+        elif isinstance(event, ToolResult):
+            # Get tool name from pending and remove (completed)
+            tool_name = stats["pending_tools"].pop(event.tool_use_id, "unknown")
+            if isinstance(event.content, (str, list)):
+                outcome = detect_outcome(tool_name, event.content)
+                if outcome == "success":
+                    stats["success_count"] += 1
+                else:
+                    stats["failure_count"] += 1
+
+        elif isinstance(event, Interruption):
+            stats["interrupted_count"] += 1
+
+        elif isinstance(event, Compaction):
             stats["compaction_count"] += 1
+
+
+def make_entry_decoder(backend: str = "auto") -> tuple[str, Callable[[bytes], object]]:
+    """Return (backend, decode) for transcript lines; "auto" takes the first importable of JSON_BACKENDS.
+
+    msgspec decodes into typed structs holding only the fields the parsers
+    read (type, subtype, timestamp and the type/id/name/input/tool_use_id/
+    text/content of message items), so other fields such as thinking blocks
+    and usage are skipped instead of built. orjson builds the same dicts as
+    the stdlib, faster, except that integers beyond 64 bits become floats.
+    A line a fast backend rejects or cannot type is decoded again with
+    json.loads, so parse errors and their messages never depend on the
+    backend. Raises ImportError for a named backend that is not installed.
+    """
+    if backend != "auto" and backend not in JSON_BACKENDS:
+        raise ValueError(f"unknown JSON backend {backend!r} (choose auto, {', '.join(JSON_BACKENDS)})")
+    for name in JSON_BACKENDS if backend == "auto" else (backend,):
+        try:
+            if name == "msgspec":
+                import msgspec
+                from typing import Any, Union
+
+                # UNSET fields are left out of to_builtins(), like keys missing from the line
+                class Item(msgspec.Struct):
+                    type: Any = msgspec.UNSET
+                    id: Any = msgspec.UNSET
+                    name: Any = msgspec.UNSET
+                    input: Any = msgspec.UNSET
+                    tool_use_id: Any = msgspec.UNSET
+                    text: Any = msgspec.UNSET
+                    content: Any = msgspec.UNSET
+
+                class Message(msgspec.Struct):
+                    content: Union[str, list[Item], None, msgspec.UnsetType] = msgspec.UNSET
+
+                class Entry(msgspec.Struct):
+                    type: Any = msgspec.UNSET
+                    subtype: Any = msgspec.UNSET
+                    timestamp: Any = msgspec.UNSET
+                    message: Union[Message, None, msgspec.UnsetType] = msgspec.UNSET
+
+                decoder = msgspec.json.Decoder(Entry)
+
+                def fast_loads(line: bytes) -> object:
+                    if not line.isascii():
+                        line.decode("utf-8")  # Skipped fields are not validated by msgspec
+                    return msgspec.to_builtins(decoder.decode(line))
+
+                errors = (msgspec.DecodeError, UnicodeDecodeError)
+            elif name == "orjson":
+                import orjson
+                fast_loads, errors = orjson.loads, (orjson.JSONDecodeError,)
+            else:
+                return name, json.loads
+        except ImportError:
+            if backend != "auto":
+                raise
             continue
 
-        # Process assistant messages (tool calls)
-        if entry_type == "assistant":
-            message = entry.get("message", {})
-            content = message.get("content", [])
-
-            if isinstance(content, list):
-                for item in content:
-                    if isinstance(item, dict) and item.get("type") == "tool_use":
-                        tool_name = item.get("name", "")
-                        tool_use_id = item.get("id", "")
-                        tool_input = item.get("input", {})
-
-                        if tool_name:
-                            stats["tool_counts"][tool_name] += 1
-                            # Track pending for interruption detection
-                            if tool_use_id:
-                                stats["pending_tools"][tool_use_id] = tool_name
-
-                            # Track skill/agent usage
-                            if tool_name == "Skill":
-                                skill = tool_input.get("skill", "unknown")
-                                stats["skills_used"][skill] += 1
-                            elif tool_name == "Task":
-                                agent = tool_input.get("subagent_type", "unknown")
-                                stats["agents_used"][agent] += 1
-
-                            # Infer workflow stage
-                            new_stage = infer_workflow_stage(tool_name, tool_input, stats["current_stage"])
-                            if new_stage != stats["current_stage"]:
-                                if new_stage not in stats["stages_visited"]:
-                                    stats["stages_visited"].append(new_stage)
-                                stats["current_stage"] = new_stage
-
-        # Process user messages (contain prompts, interruptions, and tool results)
-        if entry_type == "user":
-            message = entry.get("message", {})
-            content = message.get("content", "")
-
-            if isinstance(content, str):
-                if "[Request interrupted by user]" in content:
-                    stats["interrupted_count"] += 1
-            elif isinstance(content, list):
-                for item in content:
-                    if isinstance(item, dict):
-                        item_type = item.get("type")
-                        if item_type == "text":
-                            text = item.get("text", "")
-                            if "[Request interrupted by user]" in text:
-                                stats["interrupted_count"] += 1
-                        elif item_type == "tool_result":
-                            # Tool results are in user messages
-                            tool_use_id = item.get("tool_use_id", "")
-                            result = item.get("content", "")
-
-                            # Get tool name from pending and remove (completed)
-                            tool_name = stats["pending_tools"].pop(tool_use_id, "unknown")
-
-                            if isinstance(result, str):
-                                outcome = detect_outcome(tool_name, result)
-                                if outcome == "success":
-                                    stats["success_count"] += 1
-                                else:
-                                    stats["failure_count"] += 1
+        def decode(line: bytes, fast_loads=fast_loads, errors=errors) -> object:
+            try:
+                return fast_loads(line)
+            except errors:
+                return json.loads(line)
+
+        return name, decode
+
+
+try:
+    _json_backend, _decode_entry = make_entry_decoder(os.environ.get(JSON_BACKEND_ENV, "auto"))
+except (ImportError, ValueError) as e:
+    print(f"WARNING: {JSON_BACKEND_ENV}: {e}; using the default backend", file=sys.stderr)
+    _json_backend, _decode_entry = make_entry_decoder()
+
+
+def _may_change_stats(line: bytes) -> bool:
+    """Byte-level prefilter: can this raw JSONL line change the stats?
+
+    Only tool calls, tool results, interruptions and compaction boundaries
+    count here; prompts, assistant text and progress entries are skipped
+    without decoding. A false positive only costs a decode.
+    """
+    return (
+        b'"tool_use"' in line
+        or b'"tool_result"' in line
+        or b"[Request interrupted by user]" in line
+        or b'"compact_boundary"' in line
+    )
+
+
+def _consume_line(stats: dict, line: bytes) -> None:
+    """Apply one JSONL line to the stats."""
+    if not _may_change_stats(line):
+        return
+    try:
+        entry = _decode_entry(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return
+    add_summary_events(stats, entry_events(entry))
+
+
+def parse_session_file(session_path: Path, state: dict | None = None) -> dict:
+    """Parse a session JSONL file and extract summary data.
+
+    Pass the state from an earlier call (it is JSON-serializable) to resume at
+    its byte offset so only appended lines are read; the state is advanced in
+    place and the finished stats are returned as a separate dict.
+    """
+    stats = new_parse_state() if state is None else state
+    for key in ("tool_counts", "skills_used", "agents_used"):
+        if not isinstance(stats[key], defaultdict):
+            stats[key] = defaultdict(int, stats[key])
+
+    unterminated: list[bytes] = []
+    try:
+        if stats["byte_offset"] and stats["prefix_digest"] != _prefix_digest(session_path, stats["byte_offset"]):
+            # Transcript was rewritten rather than appended to: start over
+            stats.clear()
+            stats.update(new_parse_state())
+        for line, end_offset, terminated in iter_lines_from(session_path, stats["byte_offset"]):
+            if not terminated:
+                unterminated.append(line)
+                continue
+            _consume_line(stats, line)
+            stats["byte_offset"] = end_offset
+        stats["prefix_digest"] = _prefix_digest(session_path, stats["byte_offset"])
+    except Exception as e:
+        print(f"ERROR: Failed to read {session_path}: {e}", file=sys.stderr)
+        return stats if state is None else copy.deepcopy(stats)
+
+    # The checkpoint stops at the last complete line; a partial one is still being written
+    if state is not None:
+        stats = copy.deepcopy(stats)
+    for line in unterminated:
+        _consume_line(stats, line)
 
     # Any remaining pending tools are interrupted (PreToolUse without PostToolUse/result)
     stats["interrupted_count"] += len(stats["pending_tools"])
@@ -249,6 +570,145 @@ def parse_session_file(session_path: Path) -> dict:
     return stats
 
 
+def _state_file(session_id: str) -> Path:
+    return STATE_DIR / f"{re.sub(r'[^A-Za-z0-9_-]', '_', session_id)}.json"
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Write text to path via a temp file + rename, so readers never see a partial file."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(text)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def load_parse_state(session_id: str, session_file: Path) -> dict | None:
+    """Return the saved parse state for session_id, or None if absent, stale or unreadable."""
+    try:
+        data = json.loads(_state_file(session_id).read_text())
+        if data["version"] == HOOK_STATE_VERSION and data["session_file"] == str(session_file):
+            return data["state"]
+    except (OSError, json.JSONDecodeError, KeyError, TypeError):
+        pass
+    return None
+
+
+def save_parse_state(session_id: str, session_file: Path, state: dict) -> None:
+    """Persist state atomically; a failure only costs a full re-parse next time."""
+    state_file = _state_file(session_id)
+    try:
+        if not state_file.exists():
+            STATE_DIR.mkdir(parents=True, exist_ok=True)
+            prune_parse_states()
+        write_atomic(state_file, json.dumps({
+            "version": HOOK_STATE_VERSION,
+            "session_file": str(session_file),
+            "state": state,
+        }))
+    except OSError as e:
+        print(f"WARNING: Could not save parse state {state_file}: {e}", file=sys.stderr)
+
+
+def prune_parse_states(max_age_days: int = HOOK_STATE_MAX_AGE_DAYS) -> None:
+    """Remove state files of sessions not updated in max_age_days."""
+    cutoff = time.time() - max_age_days * 86400
+    try:
+        entries = list(os.scandir(STATE_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.name.endswith(".json") and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+        except OSError:
+            continue
+
+
+def connect_summary_index(path: Path) -> sqlite3.Connection:
+    """Open the SQLite index of session summaries, (re)creating its tables if needed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SUMMARY_INDEX_VERSION:
+        conn.executescript(f"""
+            DROP TABLE IF EXISTS summaries;
+            DROP TABLE IF EXISTS summary_tools;
+            DROP TABLE IF EXISTS summary_stages;
+            DROP TABLE IF EXISTS meta;
+            CREATE TABLE summaries (
+                summary_file TEXT PRIMARY KEY,
+                date TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                project TEXT NOT NULL,
+                session_type TEXT NOT NULL,
+                total_tools INTEGER NOT NULL,
+                success INTEGER NOT NULL,
+                failure INTEGER NOT NULL,
+                compactions INTEGER NOT NULL
+            );
+            -- Covering indexes: quick stats read only the index entries of the requested days
+            CREATE INDEX summaries_by_date ON summaries
+                (date, project, session_type, total_tools, success, failure, compactions);
+            CREATE TABLE summary_tools (summary_file TEXT NOT NULL, date TEXT NOT NULL, tool TEXT NOT NULL, count INTEGER NOT NULL);
+            CREATE INDEX summary_tools_by_file ON summary_tools (summary_file);
+            CREATE INDEX summary_tools_by_date ON summary_tools (date, tool, count);
+            CREATE TABLE summary_stages (summary_file TEXT NOT NULL, date TEXT NOT NULL, stage TEXT NOT NULL);
+            CREATE INDEX summary_stages_by_file ON summary_stages (summary_file);
+            CREATE INDEX summary_stages_by_date ON summary_stages (date, stage);
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            PRAGMA user_version = {SUMMARY_INDEX_VERSION};
+        """)
+    return conn
+
+
+def index_summary(conn: sqlite3.Connection, summary_file: str, summary: dict) -> None:
+    """Insert or replace one summary, keyed by its file name (date prefix included)."""
+    outcomes = summary.get("outcomes", {})
+    conn.execute("DELETE FROM summary_tools WHERE summary_file = ?", (summary_file,))
+    conn.execute("DELETE FROM summary_stages WHERE summary_file = ?", (summary_file,))
+    conn.execute(
+        "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            summary_file, summary_file[:10], summary.get("session_id", ""),
+            summary.get("project", "unknown"), summary.get("session_type", "UNKNOWN"),
+            summary.get("total_tools", 0), outcomes.get("success", 0), outcomes.get("failure", 0),
+            summary.get("compactions", 0),
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO summary_tools VALUES (?, ?, ?, ?)",
+        [(summary_file, summary_file[:10], tool, count) for tool, count in summary.get("tool_breakdown", {}).items()],
+    )
+    conn.executemany(
+        "INSERT INTO summary_stages VALUES (?, ?, ?)",
+        [(summary_file, summary_file[:10], stage) for stage in summary.get("stages_visited", [])],
+    )
+
+
+def update_summary_index(summary_file: Path, summary: dict) -> None:
+    """Upsert the summary into the index and record the summary directory's mtime.
+
+    Quick stats trust the index only while that mtime matches, so a failed
+    update (or any other change to the directory) costs one rebuild from
+    the JSON files rather than wrong numbers.
+    """
+    try:
+        conn = connect_summary_index(SUMMARY_INDEX_FILE)
+        try:
+            with conn:
+                index_summary(conn, summary_file.name, summary)
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('dir_mtime_ns', ?)",
+                    (str(summary_file.parent.stat().st_mtime_ns),),
+                )
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error) as e:
+        print(f"WARNING: Could not update summary index {SUMMARY_INDEX_FILE}: {e}", file=sys.stderr)
+
+
 def notify_macos(title: str, message: str):
     """Send macOS notification."""
     try:
@@ -308,7 +768,25 @@ def main():
     if not session_file:
         sys.exit(0)
 
-    stats = parse_session_file(session_file)
+    summary_file = SUMMARY_DIR / f"{datetime.now().strftime('%Y-%m-%d')}_{session_id[:8]}.json"
+    state = load_parse_state(session_id, session_file)
+    if state is None:
+        state = new_parse_state()
+    else:
+        try:
+            unchanged = (
+                session_file.stat().st_size == state["byte_offset"]
+                and state["prefix_digest"] == _prefix_digest(session_file, state["byte_offset"])
+            )
+            if unchanged and summary_file.exists():
+                # Nothing appended since the last run: the summary is already fresh
+                sys.exit(0)
+        except OSError:
+            sys.exit(0)
+
+    # Resume from the checkpoint: only lines appended since the last Stop are read
+    stats = parse_session_file(session_file, state)
+    save_parse_state(session_id, session_file, state)
 
     # Only generate summary if there was actual activity
     if sum(stats["tool_counts"].values()) == 0:
@@ -318,8 +796,8 @@ def main():
 
     # Save summary
     SUMMARY_DIR.mkdir(parents=True, exist_ok=True)
-    filename = f"{datetime.now().strftime('%Y-%m-%d')}_{session_id[:8]}.json"
-    (SUMMARY_DIR / filename).write_text(json.dumps(summary, indent=2))
+    write_atomic(summary_file, json.dumps(summary, indent=2))
+    update_summary_index(summary_file, summary)
 
     # Send notification
     success = summary["outcomes"]["success"]
@@ -7,18 +7,25 @@
 Measures the full detection pipeline: tokenization + stemming + Jaccard
 + classification + hint generation + rendered dict.
 
+Two candidate strategies are compared: "exhaustive" scores every pair,
+"indexed" scores only pairs sharing a stem (via a stem -> trigger inverted
+index, as compute_setup_profile does). Both find the same matches.
+
 Usage:
     uv run observability/scripts/benchmark_overlap_detection.py
     uv run observability/scripts/benchmark_overlap_detection.py --counts 50 100 200 500
+    uv run observability/scripts/benchmark_overlap_detection.py --counts 5000 20000 --mode indexed --vocab 2000
     uv run observability/scripts/benchmark_overlap_detection.py --real-data
 """
 import argparse
+import bisect
 import itertools
 import random
 import string
 import subprocess
 import sys
 import time
+from collections import defaultdict
 from pathlib import Path
 from nltk.stem.porter import PorterStemmer
 
@@ -86,21 +93,47 @@ def generate_rendered(hint: str, items: list[str], trigger: str, detection_metho
     }
 
 
-def generate_triggers(n: int) -> list[str]:
+WORDS = ["code", "test", "build", "deploy", "scan",
+         "review", "debug", "fix", "run", "check",
+         "write", "read", "parse", "format", "lint",
+         "audit", "trace", "profile", "optimize"]
+
+
+def generate_triggers(n: int, vocab: int = 0) -> list[str]:
+    """Synthetic triggers; vocab > 0 adds that many extra words (large marketplaces have wide vocabularies)."""
+    words = WORDS + [f"term{i}" for i in range(vocab)]
     base = list(SAMPLE_TRIGGERS)
     while len(base) < n:
-        words = random.sample(["code", "test", "build", "deploy", "scan",
-                                "review", "debug", "fix", "run", "check",
-                                "write", "read", "parse", "format", "lint",
-                                "audit", "trace", "profile", "optimize"],
-                               k=random.randint(1, 3))
-        base.append(" ".join(words))
+        base.append(" ".join(random.sample(words, k=random.randint(1, 3))))
     return base[:n]
 
 
-def benchmark(trigger_count: int, threshold: float = 0.4, triggers: list[str] | None = None) -> dict:
+def exhaustive_pairs(stemmed: list[frozenset]):
+    return itertools.combinations(range(len(stemmed)), 2)
+
+
+def indexed_pairs(stemmed: list[frozenset]):
+    """Pairs (i < j) sharing at least one stem, in the same order as exhaustive_pairs."""
+    postings: dict[str, list[int]] = defaultdict(list)
+    for i, stems in enumerate(stemmed):
+        for s in stems:
+            postings[s].append(i)
+    for i, stems in enumerate(stemmed):
+        candidates: set[int] = set()
+        for s in stems:
+            posting = postings[s]
+            candidates.update(posting[bisect.bisect_right(posting, i):])
+        for j in sorted(candidates):
+            yield i, j
+
+
+PAIR_STRATEGIES = {"exhaustive": exhaustive_pairs, "indexed": indexed_pairs}
+
+
+def benchmark(trigger_count: int, threshold: float = 0.4, triggers: list[str] | None = None,
+              mode: str = "exhaustive", vocab: int = 0) -> dict:
     if triggers is None:
-        triggers = generate_triggers(trigger_count)
+        triggers = generate_triggers(trigger_count, vocab)
     else:
         trigger_count = len(triggers)
 
@@ -110,10 +143,12 @@ def benchmark(trigger_count: int, threshold: float = 0.4, triggers: list[str] |
     t_stem = time.perf_counter() - t0
 
     # Phase 2: pairwise Jaccard + classification + hint + rendered
+    # (indexed mode skips pairs without a shared stem; exact duplicates always share one
+    # unless every token is blocklisted, and the collector detects those separately)
     pairs = 0
     matches = 0
     t1 = time.perf_counter()
-    for i, j in itertools.combinations(range(len(stemmed)), 2):
+    for i, j in PAIR_STRATEGIES[mode](stemmed):
         score = jaccard(stemmed[i], stemmed[j])
         pairs += 1
         is_exact = triggers[i].lower() == triggers[j].lower()
@@ -128,6 +163,7 @@ def benchmark(trigger_count: int, threshold: float = 0.4, triggers: list[str] |
 
     total = t_stem + t_pipeline
     return {
+        "mode": mode,
         "triggers": trigger_count,
         "pairs": pairs,
         "matches": matches,
@@ -163,18 +199,33 @@ def collect_real_triggers() -> list[str]:
     return triggers
 
 
+def print_row(results: list[dict]) -> None:
+    """Print the median run."""
+    results.sort(key=lambda r: r["total_ms"])
+    r = results[len(results) // 2]
+    print(f"{r['mode']:>10} {r['triggers']:>8} {r['pairs']:>10} {r['matches']:>8} "
+          f"{r['stem_ms']:>10.2f} {r['pipeline_ms']:>12.2f} {r['total_ms']:>10.2f}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Benchmark overlap detection (ADR-077)")
     parser.add_argument("--counts", nargs="+", type=int,
-                        default=[50, 100, 200, 500, 1000],
+                        default=[50, 100, 200, 500, 1000, 5000, 20000],
                         help="Trigger counts to benchmark")
     parser.add_argument("--threshold", type=float, default=0.4)
     parser.add_argument("--runs", type=int, default=3, help="Runs per count (takes median)")
+    parser.add_argument("--mode", choices=["exhaustive", "indexed", "both"], default="both",
+                        help="Pair candidate strategy to benchmark")
+    parser.add_argument("--max-exhaustive", type=int, default=5000,
+                        help="Skip the exhaustive scan above this many triggers (it is quadratic)")
+    parser.add_argument("--vocab", type=int, default=0,
+                        help="Extra synthetic words for generated triggers")
     parser.add_argument("--real-data", action="store_true",
                         help="Benchmark with actual installed plugin triggers")
     args = parser.parse_args()
 
-    header = f"{'Triggers':>8} {'Pairs':>8} {'Matches':>8} {'Stem(ms)':>10} {'Pipeline(ms)':>12} {'Total(ms)':>10}"
+    modes = ["exhaustive", "indexed"] if args.mode == "both" else [args.mode]
+    header = f"{'Mode':>10} {'Triggers':>8} {'Pairs':>10} {'Matches':>8} {'Stem(ms)':>10} {'Pipeline(ms)':>12} {'Total(ms)':>10}"
     print("Full pipeline: tokenization + stemming + Jaccard + classification + hint + rendered")
     print()
 
@@ -184,28 +235,28 @@ def main():
         print(f"Collected {len(triggers)} triggers from installed plugins")
         print()
         print(header)
-        print("-" * 64)
-        results = []
-        for _ in range(args.runs):
-            results.append(benchmark(0, args.threshold, triggers=triggers))
-        results.sort(key=lambda r: r["total_ms"])
-        r = results[len(results) // 2]
-        print(f"{r['triggers']:>8} {r['pairs']:>8} {r['matches']:>8} "
-              f"{r['stem_ms']:>10.2f} {r['pipeline_ms']:>12.2f} {r['total_ms']:>10.2f}")
+        print("-" * 77)
+        for mode in modes:
+            results = []
+            for _ in range(args.runs):
+                results.append(benchmark(0, args.threshold, triggers=triggers, mode=mode))
+            print_row(results)
         print()
 
     print("=== Synthetic Benchmark ===")
     print(header)
-    print("-" * 64)
+    print("-" * 77)
 
     for count in args.counts:
-        results = []
-        for _ in range(args.runs):
-            results.append(benchmark(count, args.threshold))
-        results.sort(key=lambda r: r["total_ms"])
-        r = results[len(results) // 2]
-        print(f"{r['triggers']:>8} {r['pairs']:>8} {r['matches']:>8} "
-              f"{r['stem_ms']:>10.2f} {r['pipeline_ms']:>12.2f} {r['total_ms']:>10.2f}")
+        triggers = generate_triggers(count, args.vocab)
+        for mode in modes:
+            if mode == "exhaustive" and count > args.max_exhaustive:
+                print(f"{mode:>10} {count:>8} {'(skipped, see --max-exhaustive)':>52}")
+                continue
+            results = []
+            for _ in range(args.runs):
+                results.append(benchmark(count, args.threshold, triggers=triggers, mode=mode))
+            print_row(results)
 
     print()
     print("If total_ms > 100 for your expected trigger count, consider adding")
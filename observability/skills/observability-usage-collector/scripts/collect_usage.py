@@ -18,18 +18,31 @@ This script performs DATA COLLECTION only - no analysis or recommendations.
 
 import argparse
 import base64
+import bisect
+import contextlib
+import copy
+import fnmatch
+import functools
 import json
+import mmap
+import multiprocessing
 import os
 import re
+import sqlite3
 import string
 import sys
 import hashlib
+import heapq
+import itertools
+import time
+import urllib.error
 import urllib.request
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, TextIO
 
 # Constants (ADR-009: Extract magic numbers)
 MAX_DESCRIPTION_LENGTH = 200
@@ -39,6 +52,21 @@ DEFAULT_SESSIONS = 10
 DEFAULT_DAYS = 7  # PRD specification: 7-day default analysis period
 MIN_TRIGGER_LENGTH = 3  # ADR-001: Unified trigger length threshold
 MIN_PARSE_SUCCESS_RATE = 0.80  # ADR-026: Fail if <80% entries parse
+JSONL_READ_CHUNK_SIZE = 1 << 20  # 1 MiB binary reads; peak memory ~ longest line + one chunk
+JSONL_MMAP_MIN_BYTES = 8 << 20  # Larger transcripts are memory-mapped when read in full
+OUTCOME_WINDOW_CHARS = 16 * 1024  # Characters of each end of a tool result that detect_outcome searches
+FRONTMATTER_READ_CHUNK_SIZE = 4096  # Characters read at a time while looking for the closing "---"
+FRONTMATTER_READ_CAP = 64 * 1024  # Longer frontmatter falls back to reading the whole file
+# Transcript line decoders, fastest first; msgspec and orjson are optional (see make_entry_decoder)
+JSON_BACKENDS = ("msgspec", "orjson", "json")
+JSON_BACKEND_ENV = "OBSERVABILITY_JSON_BACKEND"  # Default for --json-backend
+PROJECT_CWD_SCAN_LINES = 20  # Leading transcript lines searched for the project's cwd (--all-projects)
+PARALLEL_MIN_SESSIONS = 8  # Below this, worker start-up costs more than parallel parsing saves
+# --deadline: share of the budget that must still be left for a phase to start (or keep going)
+DEADLINE_DISCOVERY_RESERVE = 0.6  # Plugin discovery and CLAUDE.md parsing
+DEADLINE_PARSE_RESERVE = 0.4  # Session parsing stops here; remaining sessions are dropped
+DEADLINE_MATCH_RESERVE = 0.2  # Prompt matching stops here; unmatched sessions are dropped
+DEADLINE_OPTIONAL_RESERVE = 0.1  # Semantic overlaps, missed opportunities, remote version checks
 SEMANTIC_DETECTION_ENABLED: bool = True  # ADR-077: Toggle semantic overlap detection
 SEMANTIC_THRESHOLD: float = 0.4  # ADR-077: Jaccard similarity threshold
 _PUNCT_TABLE = str.maketrans("", "", string.punctuation)  # ADR-077: Reusable punctuation strip table
@@ -50,12 +78,34 @@ COMMON_WORD_BLOCKLIST = frozenset({
     "now", "see", "try", "how", "why", "who", "its", "out", "two", "way",
 })
 
+# Lowercase outcome markers per tool family, checked by detect_outcome. Bash
+# output with a success marker is a success whatever failure markers it has
+BASH_SUCCESS_MARKERS = ("exit code: 0", "succeeded")
+BASH_FAILURE_MARKERS = ("exit code:", "timeout", "error:", "failed", "traceback", "permission denied")
+EDIT_FAILURE_MARKERS = ("permission denied", "file not found", "no such file", "old_string not found", "not unique", "error")
+FAILURE_MARKERS = ("error", "failed")
+
 # Path constants (ADR-020: Centralize Path.home())
 HOME = Path.home()
 CLAUDE_DIR = HOME / ".claude"
 PROJECTS_DIR = CLAUDE_DIR / "projects"
 SUMMARIES_DIR = CLAUDE_DIR / "session-summaries"
 PLUGINS_CACHE = CLAUDE_DIR / "plugins" / "cache"
+CACHE_DIR = CLAUDE_DIR / "observability-cache"
+SESSION_CACHE_DIR = CACHE_DIR / "sessions"
+DISCOVERY_CACHE_FILE = CACHE_DIR / "discovery.json"
+REMOTE_VERSION_CACHE_FILE = CACHE_DIR / "remote-versions.json"
+SESSION_STORE_FILE = CACHE_DIR / "sessions.db"
+SUMMARY_INDEX_FILE = CACHE_DIR / "summaries.db"
+
+# Bump whenever parse_session_file output changes; invalidates every cached session
+SESSION_PARSER_VERSION = 4
+# Bump whenever the session store tables change; an older store is rebuilt from scratch
+SESSION_STORE_VERSION = 2
+# Bump whenever the summary index tables change (kept in sync with the session-summary hook)
+SUMMARY_INDEX_VERSION = 1
+# Bump whenever component parsing (frontmatter, triggers) changes; invalidates the discovery cache
+DISCOVERY_CACHE_VERSION = 1
 
 # Frequency band thresholds (ADR-005)
 FREQ_NEVER = 0
@@ -66,6 +116,97 @@ FREQ_SOMETIMES_MAX = 10
 # Track YAML parsing issues for summary reporting (graceful handling)
 _yaml_parse_issues: list[str] = []
 
+# Discovery cache (see load_discovery_cache): entries from the last run, None when disabled,
+# and the entries used by this run, which are what gets saved
+_discovery_cache: dict | None = None
+_discovery_fresh: dict[str, dict] = {"files": {}, "dirs": {}}
+
+
+class Deadline:
+    """Wall-clock budget for one collector run (--deadline).
+
+    Phases call expired(reserve) before work they can drop, where reserve is
+    the share of the budget to leave for the phases after them, and record
+    what they dropped with skip(). to_dict() is reported as _run["deadline"].
+    Without a budget (seconds=None) nothing ever expires.
+    """
+
+    def __init__(self, seconds: float | None = None):
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.skipped: list[dict] = []
+
+    def remaining(self, reserve: float = 0.0) -> float | None:
+        """Seconds until only reserve * budget is left, or None without a budget."""
+        if self.seconds is None:
+            return None
+        return self.seconds * (1 - reserve) - (time.monotonic() - self.started)
+
+    def expired(self, reserve: float = 0.0) -> bool:
+        remaining = self.remaining(reserve)
+        return remaining is not None and remaining <= 0
+
+    def skip(self, phase: str, what: str, **details) -> None:
+        """Record that phase dropped what to stay within the budget."""
+        self.skipped.append({"phase": phase, "skipped": what, **details})
+        print(f"  ⊘ Deadline: skipped {what}", file=sys.stderr)
+
+    def to_dict(self) -> dict:
+        return {
+            "budget_seconds": self.seconds,
+            "elapsed_seconds": round(time.monotonic() - self.started, 3),
+            "skipped": self.skipped,
+        }
+
+
+class Profiler:
+    """Phase timers and work counters for one collector run.
+
+    Printed to stderr with --profile, which also reports it as _run.performance
+    in JSON output. Counters cover work done in this process only: sessions
+    parsed by --jobs workers are counted by parse_sessions, not per line.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.counters: dict[str, int] = defaultdict(int)
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block; repeated phases accumulate."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def to_dict(self) -> dict:
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "phases_seconds": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def report(self) -> None:
+        """Print phase timings and counters to stderr."""
+        data = self.to_dict()
+        print(f"\n[Profile] {data['total_seconds']:.3f}s total", file=sys.stderr)
+        for name, seconds in data["phases_seconds"].items():
+            share = seconds / data["total_seconds"] * 100 if data["total_seconds"] else 0
+            print(f"  {name:<18} {seconds:8.3f}s {share:5.1f}%", file=sys.stderr)
+        for name, value in data["counters"].items():
+            print(f"  {name:<28} {value:>12,}", file=sys.stderr)
+
+
+_profiler = Profiler()
+
 # Lazy-initialized Porter Stemmer (ADR-077)
 _stemmer = None
 
@@ -98,6 +239,36 @@ def _jaccard_similarity(set_a: frozenset, set_b: frozenset) -> float:
     return len(set_a & set_b) / len(set_a | set_b)
 
 
+def _similar_pairs(stem_sets: list[frozenset[str]], threshold: float) -> Iterator[tuple[int, int, float]]:
+    """Yield (i, j, score) for i < j with Jaccard score >= threshold, in (i, j) order.
+
+    With a positive threshold only sets sharing a stem can qualify, so pairs
+    are drawn from a stem -> set index inverted index instead of all pairs.
+    """
+    if threshold <= 0:
+        for i in range(len(stem_sets)):
+            _profiler.count("trigger_pairs_compared", len(stem_sets) - i - 1)
+            for j in range(i + 1, len(stem_sets)):
+                yield i, j, _jaccard_similarity(stem_sets[i], stem_sets[j])
+        return
+
+    postings: dict[str, list[int]] = defaultdict(list)  # Ascending set indexes per stem
+    for i, stems in enumerate(stem_sets):
+        for stem in stems:
+            postings[stem].append(i)
+
+    for i, stems in enumerate(stem_sets):
+        candidates: set[int] = set()
+        for stem in stems:
+            posting = postings[stem]
+            candidates.update(posting[bisect.bisect_right(posting, i):])
+        _profiler.count("trigger_pairs_compared", len(candidates))
+        for j in sorted(candidates):
+            score = _jaccard_similarity(stems, stem_sets[j])
+            if score >= threshold:
+                yield i, j, score
+
+
 # Story 1.2: Skill classification constants
 class SkillClassification:
     """Classification for skill/agent usage status."""
@@ -247,6 +418,7 @@ class SessionData:
     # Parse statistics (ADR-026)
     entries_total: int = 0
     entries_parsed: int = 0
+    entries_skipped: int = 0  # Prefiltered, never decoded
     parsing_errors: list[dict] = field(default_factory=list)
     # ADR-047: Temporal tracking
     session_date: Optional[datetime] = None
@@ -265,6 +437,9 @@ FEEDBACK_FILE = CLAUDE_DIR / "observability-feedback.json"
 MAX_FINDINGS_PER_CATEGORY = 5
 MAX_TOTAL_FINDINGS = 15
 MAX_FINDINGS_DETAILED = 30  # For detailed JSON output
+JSON_INDENT = 2  # Default --format json layout (--compact drops it)
+# _schema.sections entry for the trailing _run section, present only when _run is written
+RUN_SECTION_DESCRIPTION = "Run metadata known only at the end: deadline skips (--deadline) and performance (--profile); written last"
 
 # ADR-050: Statistical significance thresholds
 MIN_SESSIONS_FOR_PATTERN = 5  # Need at least 5 sessions for pattern detection
@@ -286,6 +461,12 @@ CLEANUP_MIN_SESSIONS = 20
 
 SEMVER_RE = re.compile(r"^\d+\.\d+\.\d+$")
 GITHUB_API_TIMEOUT = 5
+GITHUB_API_BASE = "https://api.github.com"
+# At most this many GitHub API requests in flight at once
+GITHUB_API_MAX_WORKERS = 8
+# Cached remote versions younger than this are used without contacting GitHub;
+# older ones are revalidated with If-None-Match
+REMOTE_VERSION_TTL_SECONDS = 6 * 60 * 60
 
 
 def _is_semver(version: str) -> bool:
@@ -356,17 +537,91 @@ def check_stale_cache(plugins_cache: Path, settings_path: Path) -> list[dict]:
     return findings
 
 
-def check_outdated_plugins(plugins_cache: Path, settings_path: Path) -> list[dict]:
-    """Compare installed plugin versions against remote marketplace versions."""
-    findings = []
+def load_remote_version_cache(cache_file: Path) -> dict:
+    """Load cached remote plugin.json versions keyed by API URL; missing or corrupt files give {}."""
+    try:
+        data = json.loads(cache_file.read_text())
+        if isinstance(data, dict) and isinstance(data.get("entries"), dict):
+            return data["entries"]
+    except (OSError, json.JSONDecodeError):
+        pass
+    return {}
+
+
+def save_remote_version_cache(cache_file: Path, entries: dict) -> None:
+    """Write the remote version cache atomically."""
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file.write_text(json.dumps({"entries": entries}))
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Warning: Could not write remote version cache {cache_file}: {e}", file=sys.stderr)
+        tmp_file.unlink(missing_ok=True)
+
+
+def fetch_remote_version(
+    api_url: str,
+    cache: dict | None = None,
+    offline: bool = False,
+    ttl: float = REMOTE_VERSION_TTL_SECONDS,
+    timeout: float | None = None,
+) -> str | None:
+    """Fetch the version field of a plugin.json from the GitHub contents API.
+
+    With a cache, entries younger than ttl are returned as-is and older ones
+    are revalidated with If-None-Match, so an unchanged file costs a 304.
+    Offline, any cached entry is returned however stale and nothing is fetched.
+    A failed request falls back to the cached entry. Returns None when no
+    version is known. timeout defaults to GITHUB_API_TIMEOUT.
+    """
+    entry = cache.get(api_url) if cache is not None else None
+    if not isinstance(entry, dict):
+        entry = None
+    now = time.time()
+    if entry is not None and (offline or now - entry.get("fetched_at", 0) < ttl):
+        return entry.get("version")
+    if offline:
+        return None
+
+    try:
+        req = urllib.request.Request(api_url)
+        req.add_header("Accept", "application/vnd.github.v3+json")
+        if entry is not None and entry.get("etag"):
+            req.add_header("If-None-Match", entry["etag"])
+        with urllib.request.urlopen(req, timeout=GITHUB_API_TIMEOUT if timeout is None else timeout) as resp:
+            api_data = json.loads(resp.read())
+            etag = resp.headers.get("ETag") if cache is not None else None
+
+        content = base64.b64decode(api_data["content"]).decode()
+        version = json.loads(content).get("version")
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and entry is not None:
+            cache[api_url] = {**entry, "fetched_at": now}
+        return entry.get("version") if entry is not None else None
+    except Exception:
+        return entry.get("version") if entry is not None else None
+
+    if cache is not None:
+        cache[api_url] = {
+            "version": version,
+            "etag": etag if isinstance(etag, str) else None,
+            "fetched_at": now,
+        }
+    return version
+
+
+def _installed_plugin_versions(plugins_cache: Path, settings_path: Path) -> list[tuple[str, str, str, str, str]]:
+    """List (plugin, marketplace, repo, installed_version, api_url) for every remotely checkable plugin."""
+    candidates = []
 
     if not settings_path.exists():
-        return findings
+        return candidates
 
     try:
         settings = json.loads(settings_path.read_text())
     except (json.JSONDecodeError, OSError):
-        return findings
+        return candidates
 
     known = settings.get("extraKnownMarketplaces", {})
 
@@ -431,34 +686,86 @@ def check_outdated_plugins(plugins_cache: Path, settings_path: Path) -> list[dic
             if not installed_version or not _is_semver(installed_version):
                 continue
 
-            # Fetch remote version from GitHub API
             # Normalize source path: "./observability" -> "observability"
             source_path = plugin_source.lstrip("./")
-            api_url = f"https://api.github.com/repos/{repo}/contents/{source_path}/.claude-plugin/plugin.json"
+            api_url = f"{GITHUB_API_BASE}/repos/{repo}/contents/{source_path}/.claude-plugin/plugin.json"
+            candidates.append((plugin_name, mp_name, repo, installed_version, api_url))
 
-            try:
-                req = urllib.request.Request(api_url)
-                req.add_header("Accept", "application/vnd.github.v3+json")
-                with urllib.request.urlopen(req, timeout=GITHUB_API_TIMEOUT) as resp:
-                    api_data = json.loads(resp.read())
+    return candidates
 
-                content = base64.b64decode(api_data["content"]).decode()
-                remote_data = json.loads(content)
-                remote_version = remote_data.get("version")
 
-                if not remote_version or not _is_semver(remote_version):
-                    continue
+def check_outdated_plugins(
+    plugins_cache: Path,
+    settings_path: Path,
+    cache_file: Path | None = None,
+    offline: bool = False,
+    deadline: Deadline | None = None,
+) -> list[dict]:
+    """Compare installed plugin versions against remote marketplace versions.
 
-                if _parse_semver(remote_version) > _parse_semver(installed_version):
-                    findings.append({
-                        "plugin": plugin_name,
-                        "marketplace": mp_name,
-                        "installed_version": installed_version,
-                        "latest_version": remote_version,
-                        "source_repo": repo,
-                    })
-            except Exception:
-                continue
+    Remote versions are fetched concurrently (at most GITHUB_API_MAX_WORKERS
+    requests in flight); findings keep marketplace/plugin order. cache_file
+    enables the on-disk version cache; offline answers from it alone.
+
+    With a deadline, all checks share one wait of whatever is left before
+    DEADLINE_OPTIONAL_RESERVE. URLs still queued or in flight then get their
+    cached version (if any) and are recorded as skipped; requests already
+    sent are not waited for, and their socket timeout never exceeds the time
+    that was left when they started.
+    """
+    candidates = _installed_plugin_versions(plugins_cache, settings_path)
+    if not candidates:
+        return []
+
+    cache = load_remote_version_cache(cache_file) if cache_file is not None else None
+
+    def fetch(api_url: str) -> str | None:
+        timeout = deadline.remaining(DEADLINE_OPTIONAL_RESERVE) if deadline is not None else None
+        if timeout is None:
+            return fetch_remote_version(api_url, cache, offline)
+        if timeout <= 0:
+            return fetch_remote_version(api_url, cache, offline=True)
+        return fetch_remote_version(api_url, cache, offline, timeout=min(GITHUB_API_TIMEOUT, timeout))
+
+    unique_urls = list(dict.fromkeys(c[4] for c in candidates))
+    _profiler.count("remote_version_checks", len(unique_urls))
+    budget = deadline.remaining(DEADLINE_OPTIONAL_RESERVE) if deadline is not None else None
+    workers = min(GITHUB_API_MAX_WORKERS, len(unique_urls))
+    if offline or (workers <= 1 and budget is None):
+        remote_versions = {url: fetch(url) for url in unique_urls}
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+        futures = {url: pool.submit(fetch, url) for url in unique_urls}
+        done, pending = wait(futures.values(), timeout=budget)
+        pool.shutdown(wait=False, cancel_futures=True)
+        remote_versions = {
+            url: future.result() if future in done else fetch_remote_version(url, cache, offline=True)
+            for url, future in futures.items()
+        }
+        if pending:
+            deadline.skip("freshness_checks", f"{len(pending)} of {len(unique_urls)} remote plugin version checks (cached versions used)",
+                          checks_completed=len(done), checks_skipped=len(pending))
+        if cache is not None:
+            # Unfinished requests may still store their answers; save what is known now
+            cache = dict(cache)
+
+    if cache is not None and not offline:
+        save_remote_version_cache(cache_file, cache)
+
+    findings = []
+    for plugin_name, mp_name, repo, installed_version, api_url in candidates:
+        remote_version = remote_versions[api_url]
+        if not isinstance(remote_version, str) or not _is_semver(remote_version):
+            continue
+
+        if _parse_semver(remote_version) > _parse_semver(installed_version):
+            findings.append({
+                "plugin": plugin_name,
+                "marketplace": mp_name,
+                "installed_version": installed_version,
+                "latest_version": remote_version,
+                "source_repo": repo,
+            })
 
     return findings
 
@@ -474,6 +781,9 @@ def compute_pre_computed_findings(
     jsonl_stats: dict | None = None,
     plugins_cache: Path | None = None,
     settings_path: Path | None = None,
+    remote_version_cache: Path | None = None,
+    offline: bool = False,
+    deadline: Deadline | None = None,
 ) -> dict:
     """ADR-054: Pre-compute deterministic findings that don't need LLM.
 
@@ -573,7 +883,10 @@ def compute_pre_computed_findings(
     stale_cache = []
     if plugins_cache and settings_path:
         stale_cache = check_stale_cache(plugins_cache, settings_path)
-        outdated_plugins = check_outdated_plugins(plugins_cache, settings_path)
+        if deadline is not None and not offline and deadline.expired(DEADLINE_OPTIONAL_RESERVE):
+            offline = True
+            deadline.skip("freshness_checks", "remote plugin version checks (cached versions only)")
+        outdated_plugins = check_outdated_plugins(plugins_cache, settings_path, remote_version_cache, offline, deadline)
 
     result = {
         "_note": "Deterministic findings - 100% certain, no LLM inference needed",
@@ -1055,12 +1368,24 @@ def _generate_rendered_dict(overlap: dict) -> dict:
     return {"problem": problem, "evidence": evidence, "action": action}
 
 
+def _is_delegation(a: SkillOrAgent, b: SkillOrAgent) -> bool:
+    """ADR-077: Same-source components where one's name appears in the other's triggers."""
+    if a.source_type != b.source_type or a.source_type == "":
+        return False
+    a_name = a.name.lower().replace("-", " ").replace("_", " ")
+    b_name = b.name.lower().replace("-", " ").replace("_", " ")
+    a_in_b_triggers = any(a_name in t.lower() for t in b.triggers)
+    b_in_a_triggers = any(b_name in t.lower() for t in a.triggers)
+    return a_in_b_triggers or b_in_a_triggers
+
+
 def compute_setup_profile(
     skills: list[SkillOrAgent],
     agents: list[SkillOrAgent],
     commands: list[SkillOrAgent],
     hooks: list[Hook],
     claude_md: dict,
+    deadline: Deadline | None = None,
 ) -> SetupProfile:
     """Compute setup profile for context-first analysis."""
 
@@ -1203,21 +1528,26 @@ def compute_setup_profile(
     overlapping = name_collision_entries + overlapping
 
     # ADR-077: Detect delegation patterns (parent-child name-in-trigger)
-    delegation_pairs: set[frozenset[str]] = set()
-    for i in range(len(all_components)):
-        for j in range(i + 1, len(all_components)):
-            a, b = all_components[i], all_components[j]
-            if a.source_type != b.source_type or a.source_type == "":
-                continue
-            a_name = a.name.lower().replace("-", " ").replace("_", " ")
-            b_name = b.name.lower().replace("-", " ").replace("_", " ")
-            a_in_b_triggers = any(a_name in t.lower() for t in b.triggers)
-            b_in_a_triggers = any(b_name in t.lower() for t in a.triggers)
-            if a_in_b_triggers or b_in_a_triggers:
-                delegation_pairs.add(frozenset({f"{a.type}:{a.name}", f"{b.type}:{b.name}"}))
+    # Checked lazily: only component pairs with a semantic overlap need it
+    components_by_label: dict[str, list[SkillOrAgent]] = defaultdict(list)
+    for item in all_components:
+        components_by_label[f"{item.type}:{item.name}"].append(item)
+    delegation_pairs: dict[frozenset[str], bool] = {}
+
+    def is_delegation_pair(label_a: str, label_b: str) -> bool:
+        pair_key = frozenset({label_a, label_b})
+        if pair_key not in delegation_pairs:
+            delegation_pairs[pair_key] = any(
+                _is_delegation(a, b)
+                for a in components_by_label[label_a]
+                for b in components_by_label[label_b]
+            )
+        return delegation_pairs[pair_key]
 
     # ADR-077: Semantic overlap detection via stemmed token-set Jaccard similarity
-    if SEMANTIC_DETECTION_ENABLED:
+    if SEMANTIC_DETECTION_ENABLED and deadline is not None and deadline.expired(DEADLINE_OPTIONAL_RESERVE):
+        deadline.skip("setup_profile", "semantic overlap detection")
+    elif SEMANTIC_DETECTION_ENABLED:
         # Build stemmed token sets for all components
         component_stems: list[tuple[str, str, frozenset[str]]] = []  # (type:name, original_trigger, stemmed)
         for item in all_components:
@@ -1228,47 +1558,47 @@ def compute_setup_profile(
                     if stems:  # AC-1: skip empty token sets
                         component_stems.append((f"{item.type}:{item.name}", trigger_lower, stems))
 
-        # Compare all pairs
-        for i in range(len(component_stems)):
-            for j in range(i + 1, len(component_stems)):
-                comp_a, trig_a, stems_a = component_stems[i]
-                comp_b, trig_b, stems_b = component_stems[j]
-                if comp_a == comp_b:
-                    continue
-                # AC-3: skip pairs already flagged by exact-match
-                pair_key = frozenset({comp_a, comp_b})
-                if pair_key in exact_pairs:
-                    continue
-                score = _jaccard_similarity(stems_a, stems_b)
-                if score >= SEMANTIC_THRESHOLD:
-                    if pair_key in delegation_pairs:
-                        sem_entry = {
-                            "trigger": f"{trig_a} ↔ {trig_b}",
-                            "items": [comp_a, comp_b],
-                            "severity": "INFO",
-                            "classification": "PATTERN",
-                            "detection_method": "stemmed",
-                            "similarity": round(score, 4),
-                            "intentional": True,
-                            "hint": None,
-                        }
-                    else:
-                        severity = "MEDIUM" if score >= 0.8 else "LOW"
-                        sem_entry = {
-                            "trigger": f"{trig_a} ↔ {trig_b}",
-                            "items": [comp_a, comp_b],
-                            "severity": severity,
-                            "classification": "SEMANTIC",
-                            "detection_method": "stemmed",
-                            "similarity": round(score, 4),
-                            "intentional": False,
-                            "hint": None,
-                        }
-                    sem_entry["hint"] = _generate_overlap_hint(sem_entry)
-                    sem_entry["rendered"] = _generate_rendered_dict(sem_entry)
-                    overlapping.append(sem_entry)
-                    # Avoid duplicate semantic pairs
-                    exact_pairs.add(pair_key)
+        # Compare pairs sharing at least one stem, in all-pairs order
+        for i, j, score in _similar_pairs([stems for _, _, stems in component_stems], SEMANTIC_THRESHOLD):
+            if deadline is not None and deadline.expired(DEADLINE_OPTIONAL_RESERVE):
+                deadline.skip("setup_profile", "rest of semantic overlap detection")
+                break
+            comp_a, trig_a, stems_a = component_stems[i]
+            comp_b, trig_b, stems_b = component_stems[j]
+            if comp_a == comp_b:
+                continue
+            # AC-3: skip pairs already flagged by exact-match
+            pair_key = frozenset({comp_a, comp_b})
+            if pair_key in exact_pairs:
+                continue
+            if is_delegation_pair(comp_a, comp_b):
+                sem_entry = {
+                    "trigger": f"{trig_a} ↔ {trig_b}",
+                    "items": [comp_a, comp_b],
+                    "severity": "INFO",
+                    "classification": "PATTERN",
+                    "detection_method": "stemmed",
+                    "similarity": round(score, 4),
+                    "intentional": True,
+                    "hint": None,
+                }
+            else:
+                severity = "MEDIUM" if score >= 0.8 else "LOW"
+                sem_entry = {
+                    "trigger": f"{trig_a} ↔ {trig_b}",
+                    "items": [comp_a, comp_b],
+                    "severity": severity,
+                    "classification": "SEMANTIC",
+                    "detection_method": "stemmed",
+                    "similarity": round(score, 4),
+                    "intentional": False,
+                    "hint": None,
+                }
+            sem_entry["hint"] = _generate_overlap_hint(sem_entry)
+            sem_entry["rendered"] = _generate_rendered_dict(sem_entry)
+            overlapping.append(sem_entry)
+            # Avoid duplicate semantic pairs
+            exact_pairs.add(pair_key)
 
     if high_severity_count > 0:
         red_flags.append(f"{high_severity_count} HIGH severity trigger/name collisions (skill/command overlap)")
@@ -1495,27 +1825,83 @@ def compute_plugin_usage(
 # JSONL Parser
 # =============================================================================
 
-def extract_yaml_frontmatter(content: str, source_path: str = "") -> dict:
-    """Extract YAML frontmatter from markdown content.
+def read_frontmatter_text(path: Path, cap: int = FRONTMATTER_READ_CAP) -> str | None:
+    """Return the text between a file's opening and closing "---", or None without frontmatter.
 
-    Falls back to regex extraction if YAML parsing fails, since Claude Code
-    uses a more lenient parser that handles unquoted colons in values.
+    Equivalent to content.split("---", 2)[1] on the full file but stops reading
+    at the closing delimiter. Reads in text mode, so decoding and newline
+    handling match read_text(). Frontmatter longer than cap characters falls
+    back to reading the rest of the file.
     """
-    import yaml
+    _profiler.count("component_files_read")
+    with open(path) as f:
+        buf = f.read(3)
+        if buf != "---":
+            return None
+        search_from = 3
+        while (end := buf.find("---", search_from)) == -1:
+            if len(buf) >= cap:
+                buf += f.read()
+                end = buf.find("---", search_from)
+                break
+            chunk = f.read(FRONTMATTER_READ_CHUNK_SIZE)
+            if not chunk:
+                return None
+            search_from = max(3, len(buf) - 2)  # The delimiter may span two chunks
+            buf += chunk
+    return None if end == -1 else buf[3:end]
 
-    if not content.startswith("---"):
-        return {}
 
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return {}
+# Plain YAML scalars that resolve to booleans or null rather than strings
+_YAML_NON_STRING_WORDS = frozenset({
+    "yes", "no", "true", "false", "on", "off", "null",
+})
+_FLAT_FRONTMATTER_LINE = re.compile(r'([A-Za-z][A-Za-z0-9_-]*):[ ]+([A-Za-z].*?)[ ]*')
+
+
+def _parse_flat_frontmatter(text: str) -> dict | None:
+    """Parse frontmatter made only of `key: plain text` lines without PyYAML.
+
+    Returns None for anything else (nesting, quoting, lists, comments, values
+    YAML would not read as a plain string) so the caller falls back to YAML;
+    when it returns a dict it equals yaml.safe_load(text).
+    """
+    result = {}
+    for line in text.split("\n"):
+        if not line.strip():
+            continue
+        m = _FLAT_FRONTMATTER_LINE.fullmatch(line)
+        if not m:
+            return None
+        key, value = m.groups()
+        if key in result or key.lower() in _YAML_NON_STRING_WORDS or value.lower() in _YAML_NON_STRING_WORDS:
+            return None
+        # ": " and " #" would start a mapping or a comment; a trailing ":" a nested key
+        if not value.isprintable() or ": " in value or " #" in value or value.endswith(":"):
+            return None
+        result[key] = value
+    return result
+
+
+def parse_frontmatter_text(frontmatter_text: str, source_path: str = "") -> dict:
+    """Parse the text between frontmatter delimiters.
+
+    Flat `key: value` frontmatter (the common case) is parsed directly; PyYAML
+    is imported only for anything else. Falls back to regex extraction if YAML
+    parsing fails, since Claude Code uses a more lenient parser that handles
+    unquoted colons in values.
+    """
+    flat = _parse_flat_frontmatter(frontmatter_text)
+    if flat is not None:
+        return flat
+
+    import yaml
 
     try:
-        return yaml.safe_load(parts[1]) or {}
+        return yaml.safe_load(frontmatter_text) or {}
     except yaml.YAMLError:
         # Fallback: extract key fields with regex (handles unquoted colons)
         # Claude Code uses a more lenient parser, so we do too
-        frontmatter_text = parts[1]
         result = {}
 
         # Extract name: value (first line match)
@@ -1535,6 +1921,30 @@ def extract_yaml_frontmatter(content: str, source_path: str = "") -> dict:
         return result
 
 
+def extract_yaml_frontmatter(content: str, source_path: str = "") -> dict:
+    """Extract YAML frontmatter from markdown content.
+
+    Falls back to regex extraction if YAML parsing fails, since Claude Code
+    uses a more lenient parser that handles unquoted colons in values.
+    """
+    if not content.startswith("---"):
+        return {}
+
+    parts = content.split("---", 2)
+    if len(parts) < 3:
+        return {}
+
+    return parse_frontmatter_text(parts[1], source_path)
+
+
+def read_yaml_frontmatter(path: Path) -> dict:
+    """extract_yaml_frontmatter(path.read_text(), str(path)) without reading the markdown body."""
+    frontmatter_text = read_frontmatter_text(path)
+    if frontmatter_text is None:
+        return {}
+    return parse_frontmatter_text(frontmatter_text, str(path))
+
+
 def extract_triggers_from_description(description: str) -> list[str]:
     """Extract trigger phrases from a description string."""
     triggers = []
@@ -1558,6 +1968,172 @@ def extract_triggers_from_description(description: str) -> list[str]:
     return list(set(triggers))
 
 
+def _parse_skill_file(skill_md: Path, default_name: str, source_type: str) -> SkillOrAgent:
+    frontmatter = read_yaml_frontmatter(skill_md)
+
+    name = frontmatter.get("name", default_name)
+    description = frontmatter.get("description", "")
+    triggers = extract_triggers_from_description(description)
+    triggers.append(name.lower())
+
+    return SkillOrAgent(
+        name=name,
+        type="skill",
+        description=description,
+        triggers=triggers,
+        source_path=str(skill_md),
+        source_type=source_type,
+    )
+
+
+def _parse_agent_file(agent_file: Path, default_name: str, source_type: str, describe_from_body: bool = True) -> SkillOrAgent:
+    frontmatter = read_yaml_frontmatter(agent_file)
+
+    name = frontmatter.get("name", default_name)
+    description = frontmatter.get("description", "")
+
+    # Local agents without a description fall back to the first paragraph after a heading
+    if not description and describe_from_body:
+        lines = agent_file.read_text().split("\n")
+        for i, line in enumerate(lines):
+            if line.startswith("#"):
+                for next_line in lines[i+1:]:
+                    if next_line.strip() and not next_line.startswith("#"):
+                        description = next_line.strip()
+                        break
+                break
+
+    triggers = extract_triggers_from_description(description)
+    triggers.append(name.lower())
+
+    return SkillOrAgent(
+        name=name,
+        type="agent",
+        description=description[:MAX_DESCRIPTION_LENGTH],
+        triggers=triggers,
+        source_path=str(agent_file),
+        source_type=source_type,
+    )
+
+
+def _parse_plugin_agent_file(agent_file: Path, default_name: str, source_type: str) -> SkillOrAgent:
+    return _parse_agent_file(agent_file, default_name, source_type, describe_from_body=False)
+
+
+def _parse_command_file(cmd_file: Path, default_name: str, source_type: str) -> SkillOrAgent:
+    frontmatter = read_yaml_frontmatter(cmd_file)
+    name = frontmatter.get("name", default_name)
+    description = frontmatter.get("description", "")
+    triggers = extract_triggers_from_description(description)
+    triggers.append(name.lower())
+    triggers.append(f"/{name.lower()}")
+
+    return SkillOrAgent(
+        name=name,
+        type="command",
+        description=description[:MAX_DESCRIPTION_LENGTH],
+        triggers=triggers,
+        source_path=str(cmd_file),
+        source_type=source_type,
+    )
+
+
+_COMPONENT_PARSERS = {
+    "skill": _parse_skill_file,
+    "agent": _parse_agent_file,
+    "plugin_agent": _parse_plugin_agent_file,
+    "command": _parse_command_file,
+}
+
+
+def load_discovery_cache(cache_file: Path | None) -> None:
+    """Enable the discovery cache for this run, seeded from cache_file; None disables it."""
+    global _discovery_cache
+    _discovery_fresh["files"].clear()
+    _discovery_fresh["dirs"].clear()
+    if cache_file is None:
+        _discovery_cache = None
+        return
+
+    _discovery_cache = {"files": {}, "dirs": {}}
+    try:
+        data = json.loads(cache_file.read_text())
+        if data.get("version") == DISCOVERY_CACHE_VERSION:
+            _discovery_cache = {"files": dict(data["files"]), "dirs": dict(data["dirs"])}
+    except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError, AttributeError):
+        pass
+
+
+def save_discovery_cache(cache_file: Path, keep_unvisited: bool = False) -> None:
+    """Write the entries used by this run atomically, dropping files no longer discovered.
+
+    With keep_unvisited, entries loaded from the cache but not visited this
+    run are kept too: a run that skipped part of discovery (--deadline) has
+    not seen those files go away.
+    """
+    entries = _discovery_fresh
+    if keep_unvisited and _discovery_cache is not None:
+        entries = {kind: {**_discovery_cache[kind], **_discovery_fresh[kind]} for kind in ("files", "dirs")}
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file.write_text(json.dumps({"version": DISCOVERY_CACHE_VERSION, **entries}))
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Warning: Could not write discovery cache {cache_file}: {e}", file=sys.stderr)
+        tmp_file.unlink(missing_ok=True)
+
+
+def _cached_listdir(directory: Path) -> list[tuple[str, bool]]:
+    """List (name, is_dir) entries of directory in iterdir order.
+
+    Adding, removing or renaming an entry changes the directory mtime, so a
+    cached listing stays valid while that mtime is unchanged.
+    """
+    if _discovery_cache is None:
+        return [(p.name, p.is_dir()) for p in directory.iterdir()]
+
+    mtime_ns = directory.stat().st_mtime_ns
+    cached = _discovery_cache["dirs"].get(str(directory))
+    if cached is not None and cached["mtime_ns"] == mtime_ns:
+        entries = [(name, is_dir) for name, is_dir in cached["entries"]]
+    else:
+        entries = [(p.name, p.is_dir()) for p in directory.iterdir()]
+    _discovery_fresh["dirs"][str(directory)] = {"mtime_ns": mtime_ns, "entries": entries}
+    return entries
+
+
+def _glob_md(directory: Path) -> list[Path]:
+    """Same files as directory.glob("*.md"), from the cached listing."""
+    return [directory / name for name, _ in _cached_listdir(directory) if fnmatch.fnmatchcase(name, "*.md")]
+
+
+def _cached_component(path: Path, kind: str, source_type: str, default_name: str) -> SkillOrAgent:
+    """Parse a component file, reusing the record from the last run if the file is unchanged.
+
+    Records are keyed by path + mtime + size (+ parser kind and source type).
+    YAML frontmatter issues recorded while parsing are replayed on cache hits.
+    """
+    parse = _COMPONENT_PARSERS[kind]
+    if _discovery_cache is None:
+        return parse(path, default_name, source_type)
+
+    st = path.stat()
+    key = [st.st_mtime_ns, st.st_size, kind, source_type, default_name]
+    cached = _discovery_cache["files"].get(str(path))
+    if cached is not None and cached["key"] == key:
+        item = SkillOrAgent(**cached["item"])
+        _profiler.count("component_cache_hits")
+        if cached["yaml_issue"]:
+            _yaml_parse_issues.append(str(path))
+    else:
+        issues_before = len(_yaml_parse_issues)
+        item = parse(path, default_name, source_type)
+        cached = {"key": key, "item": vars(item), "yaml_issue": len(_yaml_parse_issues) > issues_before}
+    _discovery_fresh["files"][str(path)] = cached
+    return item
+
+
 def discover_skills(paths: list[Path]) -> list[SkillOrAgent]:
     """Discover skills from given paths."""
     skills = []
@@ -1568,9 +2144,10 @@ def discover_skills(paths: list[Path]) -> list[SkillOrAgent]:
 
         source_type = "global" if str(base_path).startswith(global_claude_dir) else "project"
 
-        for skill_dir in base_path.iterdir():
-            if not skill_dir.is_dir():
+        for entry_name, is_dir in _cached_listdir(base_path):
+            if not is_dir:
                 continue
+            skill_dir = base_path / entry_name
 
             # Support both SKILL.md and skill.md (case variations)
             skill_md = skill_dir / "SKILL.md"
@@ -1580,22 +2157,7 @@ def discover_skills(paths: list[Path]) -> list[SkillOrAgent]:
                 continue
 
             try:
-                content = skill_md.read_text()
-                frontmatter = extract_yaml_frontmatter(content, str(skill_md))
-
-                name = frontmatter.get("name", skill_dir.name)
-                description = frontmatter.get("description", "")
-                triggers = extract_triggers_from_description(description)
-                triggers.append(name.lower())
-
-                skills.append(SkillOrAgent(
-                    name=name,
-                    type="skill",
-                    description=description,
-                    triggers=triggers,
-                    source_path=str(skill_md),
-                    source_type=source_type,
-                ))
+                skills.append(_cached_component(skill_md, "skill", source_type, skill_dir.name))
             except Exception as e:
                 print(f"Warning: Could not parse {skill_md}: {e}", file=sys.stderr)
 
@@ -1612,35 +2174,9 @@ def discover_agents(paths: list[Path]) -> list[SkillOrAgent]:
 
         source_type = "global" if str(base_path).startswith(global_claude_dir) else "project"
 
-        for agent_file in base_path.glob("*.md"):
+        for agent_file in _glob_md(base_path):
             try:
-                content = agent_file.read_text()
-                frontmatter = extract_yaml_frontmatter(content, str(agent_file))
-
-                name = frontmatter.get("name", agent_file.stem)
-                description = frontmatter.get("description", "")
-
-                if not description:
-                    lines = content.split("\n")
-                    for i, line in enumerate(lines):
-                        if line.startswith("#"):
-                            for next_line in lines[i+1:]:
-                                if next_line.strip() and not next_line.startswith("#"):
-                                    description = next_line.strip()
-                                    break
-                            break
-
-                triggers = extract_triggers_from_description(description)
-                triggers.append(name.lower())
-
-                agents.append(SkillOrAgent(
-                    name=name,
-                    type="agent",
-                    description=description[:MAX_DESCRIPTION_LENGTH],
-                    triggers=triggers,
-                    source_path=str(agent_file),
-                    source_type=source_type,
-                ))
+                agents.append(_cached_component(agent_file, "agent", source_type, agent_file.stem))
             except Exception as e:
                 print(f"Warning: Could not parse {agent_file}: {e}", file=sys.stderr)
 
@@ -1658,24 +2194,9 @@ def discover_commands(paths: list[Path]) -> list[SkillOrAgent]:
 
         source_type = "global" if str(base_path).startswith(global_claude_dir) else "project"
 
-        for cmd_file in base_path.glob("*.md"):
+        for cmd_file in _glob_md(base_path):
             try:
-                content = cmd_file.read_text()
-                frontmatter = extract_yaml_frontmatter(content, str(cmd_file))
-                name = frontmatter.get("name", cmd_file.stem)
-                description = frontmatter.get("description", "")
-                triggers = extract_triggers_from_description(description)
-                triggers.append(name.lower())
-                triggers.append(f"/{name.lower()}")
-
-                commands.append(SkillOrAgent(
-                    name=name,
-                    type="command",
-                    description=description[:MAX_DESCRIPTION_LENGTH],
-                    triggers=triggers,
-                    source_path=str(cmd_file),
-                    source_type=source_type,
-                ))
+                commands.append(_cached_component(cmd_file, "command", source_type, cmd_file.stem))
             except Exception as e:
                 print(f"Warning: Could not parse {cmd_file}: {e}", file=sys.stderr)
     return commands
@@ -1688,28 +2209,30 @@ def discover_from_plugins(plugins_cache: Path) -> tuple[list[SkillOrAgent], list
     if not plugins_cache.exists():
         return skills, agents, commands
 
-    for marketplace_dir in plugins_cache.iterdir():
-        if not marketplace_dir.is_dir() or marketplace_dir.name.startswith("temp_"):
+    for marketplace_name, is_dir in _cached_listdir(plugins_cache):
+        if not is_dir or marketplace_name.startswith("temp_"):
             continue
+        marketplace_dir = plugins_cache / marketplace_name
 
-        for plugin_dir in marketplace_dir.iterdir():
-            if not plugin_dir.is_dir():
+        for plugin_name, is_dir in _cached_listdir(marketplace_dir):
+            if not is_dir:
                 continue
+            plugin_dir = marketplace_dir / plugin_name
 
-            version_dirs = [d for d in plugin_dir.iterdir() if d.is_dir() and not d.name.startswith(".")]
+            version_dirs = [plugin_dir / name for name, is_dir in _cached_listdir(plugin_dir) if is_dir and not name.startswith(".")]
             if not version_dirs:
                 continue
 
             latest_version = max(version_dirs, key=lambda d: d.stat().st_mtime)
-            plugin_name = plugin_dir.name
             source_type = f"plugin:{plugin_name}"
 
             # Skills
             skills_path = latest_version / "skills"
             if skills_path.exists():
-                for skill_dir in skills_path.iterdir():
-                    if not skill_dir.is_dir():
+                for entry_name, is_dir in _cached_listdir(skills_path):
+                    if not is_dir:
                         continue
+                    skill_dir = skills_path / entry_name
                     # Support both SKILL.md and skill.md
                     skill_md = skill_dir / "SKILL.md"
                     if not skill_md.exists():
@@ -1718,62 +2241,25 @@ def discover_from_plugins(plugins_cache: Path) -> tuple[list[SkillOrAgent], list
                         continue
 
                     try:
-                        content = skill_md.read_text()
-                        frontmatter = extract_yaml_frontmatter(content, str(skill_md))
-                        name = frontmatter.get("name", skill_dir.name)
-                        triggers = extract_triggers_from_description(frontmatter.get("description", ""))
-                        triggers.append(name.lower())
-                        skills.append(SkillOrAgent(
-                            name=name,
-                            type="skill",
-                            description=frontmatter.get("description", ""),
-                            triggers=triggers,
-                            source_path=str(skill_md),
-                            source_type=source_type,
-                        ))
+                        skills.append(_cached_component(skill_md, "skill", source_type, skill_dir.name))
                     except Exception as e:
                         print(f"Warning: Could not parse {skill_md}: {e}", file=sys.stderr)
 
             # Agents
             agents_path = latest_version / "agents"
             if agents_path.exists():
-                for agent_file in agents_path.glob("*.md"):
+                for agent_file in _glob_md(agents_path):
                     try:
-                        content = agent_file.read_text()
-                        frontmatter = extract_yaml_frontmatter(content, str(agent_file))
-                        name = frontmatter.get("name", agent_file.stem)
-                        triggers = extract_triggers_from_description(frontmatter.get("description", ""))
-                        triggers.append(name.lower())
-                        agents.append(SkillOrAgent(
-                            name=name,
-                            type="agent",
-                            description=frontmatter.get("description", "")[:MAX_DESCRIPTION_LENGTH],
-                            triggers=triggers,
-                            source_path=str(agent_file),
-                            source_type=source_type,
-                        ))
+                        agents.append(_cached_component(agent_file, "plugin_agent", source_type, agent_file.stem))
                     except Exception as e:
                         print(f"Warning: Could not parse {agent_file}: {e}", file=sys.stderr)
 
             # Commands
             commands_path = latest_version / "commands"
             if commands_path.exists():
-                for cmd_file in commands_path.glob("*.md"):
+                for cmd_file in _glob_md(commands_path):
                     try:
-                        content = cmd_file.read_text()
-                        frontmatter = extract_yaml_frontmatter(content, str(cmd_file))
-                        name = frontmatter.get("name", cmd_file.stem)
-                        triggers = extract_triggers_from_description(frontmatter.get("description", ""))
-                        triggers.append(name.lower())
-                        triggers.append(f"/{name.lower()}")
-                        commands.append(SkillOrAgent(
-                            name=name,
-                            type="command",
-                            description=frontmatter.get("description", "")[:MAX_DESCRIPTION_LENGTH],
-                            triggers=triggers,
-                            source_path=str(cmd_file),
-                            source_type=source_type,
-                        ))
+                        commands.append(_cached_component(cmd_file, "command", source_type, cmd_file.stem))
                     except Exception as e:
                         print(f"Warning: Could not parse {cmd_file}: {e}", file=sys.stderr)
 
@@ -1897,6 +2383,7 @@ def parse_claude_md_files(paths: list[Path]) -> dict:
         if path.exists():
             result["files_found"].append(str(path))
             content = path.read_text()
+            _profiler.count("claude_md_files_read")
             result["content"][str(path)] = content
 
             # Extract section headers
@@ -1944,33 +2431,45 @@ def _summarize_tool_input(tool_name: str, tool_input: dict) -> str:
     return str(tool_input)[:MAX_TOOL_INPUT_LENGTH]
 
 
-def detect_outcome(tool_name: str, result: str) -> str:
+def detect_outcome(tool_name: str, result: str | list) -> str:
     """Detect outcome from tool result content.
 
+    result is the tool_result content: a string, or a list of content blocks
+    whose text blocks are checked together. Of a text longer than twice
+    OUTCOME_WINDOW_CHARS only the head and tail windows are checked, since
+    that is where exit codes and error markers appear.
+
     NOTE: This function is intentionally duplicated in generate_session_summary.py.
     Both scripts use 'uv run --script' for standalone operation without dependencies.
     Keep implementations in sync when making changes (ADR-003).
     """
-    result_lower = result.lower()
+    if isinstance(result, str):
+        texts = [result]
+    else:
+        texts = [
+            item["text"] for item in result
+            if isinstance(item, dict) and item.get("type") == "text" and isinstance(item.get("text"), str)
+        ]
+    # Markers hold no newline, so none can match across the joined windows
+    result_lower = "\n".join([
+        text if len(text) <= 2 * OUTCOME_WINDOW_CHARS
+        else text[:OUTCOME_WINDOW_CHARS] + "\n" + text[-OUTCOME_WINDOW_CHARS:]
+        for text in texts
+    ]).lower()
 
     if tool_name == "Bash":
-        if "exit code: 0" in result_lower or "succeeded" in result_lower:
+        if any(marker in result_lower for marker in BASH_SUCCESS_MARKERS):
             return "success"
-        if "exit code:" in result_lower:
-            return "failure"
-        if "timeout" in result_lower:
-            return "failure"
-        if any(kw in result_lower for kw in ["error:", "failed", "traceback", "permission denied"]):
+        if any(marker in result_lower for marker in BASH_FAILURE_MARKERS):
             return "failure"
         return "success"
 
     if tool_name in ("Edit", "Write", "NotebookEdit"):
-        if any(kw in result_lower for kw in ["permission denied", "file not found", "no such file",
-                                              "old_string not found", "not unique", "error"]):
+        if any(marker in result_lower for marker in EDIT_FAILURE_MARKERS):
             return "failure"
         return "success"
 
-    if "error" in result_lower or "failed" in result_lower:
+    if any(marker in result_lower for marker in FAILURE_MARKERS):
         return "failure"
     return "success"
 
@@ -2002,250 +2501,1330 @@ def resolve_project_path(projects_dir: Path, project_path: str) -> tuple[Path |
     return None, matches
 
 
-def find_project_sessions(projects_dir: Path, project_dir: Path, max_sessions: int) -> list[Path]:
-    """Find session files for a project."""
+def find_project_sessions(
+    projects_dir: Path,
+    project_dir: Path,
+    max_sessions: int | None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> list[Path]:
+    """Find a project's session files, newest first.
+
+    One os.scandir pass reusing each entry's stat; only the newest
+    max_sessions are kept (heap selection, no full sort), or every match when
+    max_sessions is None. since/until keep files modified in [since, until).
+    """
     if not project_dir.exists():
         return []
+    return [Path(path) for _, path in _newest_session_files(project_dir, max_sessions, since, until)]
 
-    session_files = sorted(
-        project_dir.glob("*.jsonl"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True
-    )
 
-    return session_files[:max_sessions]
+def find_all_project_sessions(
+    projects_dir: Path,
+    max_sessions: int | None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> list[tuple[str, Path]]:
+    """(project path, session file) for every project, newest first across projects.
 
+    max_sessions, since and until apply per project as in find_project_sessions.
+    Projects are labelled with project_path_for_folder.
+    """
+    if not projects_dir.exists():
+        return []
 
-def parse_session_file(session_path: Path) -> SessionData:
-    """Parse a session JSONL file with outcome and compaction tracking.
+    per_project = []
+    for project_dir in sorted(d for d in projects_dir.iterdir() if d.is_dir()):
+        newest = _newest_session_files(project_dir, max_sessions, since, until)
+        if newest:
+            project = project_path_for_folder(project_dir, Path(newest[0][1]))
+            per_project.append([(mtime, project, path) for mtime, path in newest])
+    # Each list is already newest first; ties keep project order
+    merged = heapq.merge(*per_project, key=lambda c: -c[0])
+    return [(project, Path(path)) for _, project, path in merged]
 
-    ADR-026: Tracks parse success rate and warns if schema may have changed.
-    ADR-047: Tracks session date and calculates recency weight.
-    """
-    # ADR-047: Get session date from file modification time
-    session_date = datetime.fromtimestamp(session_path.stat().st_mtime)
-    recency_weight = calculate_recency_weight(session_date)
 
-    session_data = SessionData(
-        session_id=session_path.stem[:8],
-        session_date=session_date,
-        recency_weight=recency_weight,
+def project_path_for_folder(project_dir: Path, session_file: Path | None = None) -> str:
+    """The project path a folder of ~/.claude/projects holds sessions for.
+
+    Used as the per_project label with --all-projects, matching the path
+    single-project runs use. It is the cwd recorded in the first entries of
+    session_file (by default any transcript in the folder); without one the
+    folder name is decoded, which is lossy for paths containing "-".
+    """
+    if session_file is None:
+        session_file = next(project_dir.glob("*.jsonl"), None) if project_dir.is_dir() else None
+    if session_file is not None:
+        try:
+            with open(session_file, "rb") as f:
+                for line in itertools.islice(f, PROJECT_CWD_SCAN_LINES):
+                    if b'"cwd"' not in line:
+                        continue
+                    try:
+                        cwd = json.loads(line).get("cwd")
+                    except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                        continue
+                    if isinstance(cwd, str) and cwd:
+                        return cwd
+        except OSError:
+            pass
+    return "/" + project_dir.name.lstrip("-").replace("-", "/")
+
+
+def _newest_session_files(
+    project_dir: Path,
+    max_sessions: int | None,
+    since: datetime | None,
+    until: datetime | None,
+) -> list[tuple[float, str]]:
+    candidates = _scan_session_files(
+        project_dir,
+        since.timestamp() if since else None,
+        until.timestamp() if until else None,
     )
-    # ADR-006: Include timestamp for duration tracking
-    pending_tools: dict[str, tuple[str, dict, Optional[float]]] = {}  # tool_use_id -> (tool_name, tool_input, timestamp)
-    awaiting_followup: list[tuple[str, dict, Optional[int], str]] = []  # (tool_name, tool_input, duration_ms, position)
+    if max_sessions is None:
+        return sorted(candidates, key=lambda c: c[0], reverse=True)
+    # Same order as sorted(..., reverse=True)[:max_sessions], ties included
+    return heapq.nlargest(max_sessions, candidates, key=lambda c: c[0])
 
-    try:
-        lines = session_path.read_text().strip().split("\n")
-        session_data.entries_total = len(lines)
 
-        for line_num, line in enumerate(lines, 1):
+def _scan_session_files(project_dir: Path, since_ts: float | None, until_ts: float | None) -> Iterator[tuple[float, str]]:
+    """Yield (mtime, path) for each *.jsonl file in project_dir within the time window."""
+    with os.scandir(project_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".jsonl"):
+                continue
             try:
-                entry = json.loads(line)
-                session_data.entries_parsed += 1
-                entry_type = entry.get("type")
-
-                # Detect compactions
-                if entry_type == "system" and entry.get("subtype") == "compact_boundary":
-                    session_data.compaction_count += 1
+                if not entry.is_file():
                     continue
-
-                if entry_type == "user":
-                    message = entry.get("message", {})
-                    content = message.get("content", "")
-
-                    # Extract user text from message (for followup capture)
-                    user_text = ""
-                    is_interruption = False
-
-                    if isinstance(content, str):
-                        if "[Request interrupted by user]" in content:
-                            is_interruption = True
-                        elif content.strip() and not _is_system_prompt(content):
-                            user_text = content
-                            session_data.prompts.append(content)
-                    elif isinstance(content, list):
-                        for item in content:
-                            if isinstance(item, dict):
-                                item_type = item.get("type")
-                                if item_type == "text":
-                                    text = item.get("text", "")
-                                    if "[Request interrupted by user]" in text:
-                                        is_interruption = True
-                                    elif not _is_system_prompt(text):
-                                        if not user_text:  # Take first non-system text
-                                            user_text = text
-                                        session_data.prompts.append(text)
-                                elif item_type == "tool_result":
-                                    # Tool results are in user messages
-                                    tool_use_id = item.get("tool_use_id", "")
-                                    result = item.get("content", "")
-
-                                    # Get tool info and remove from pending
-                                    tool_info = pending_tools.pop(tool_use_id, ("unknown", {}, None))
-                                    tool_name = tool_info[0]
-
-                                    if isinstance(result, str):
-                                        outcome = detect_outcome(tool_name, result)
-                                        if outcome == "success":
-                                            session_data.success_count += 1
-                                        else:
-                                            session_data.failure_count += 1
-
-                    # Handle interruption - capture which tools were pending
-                    if is_interruption:
-                        session_data.interrupted_count += 1
-                        # ADR-006: Get current timestamp for duration calculation
-                        interrupt_ts = entry.get("timestamp")
-                        # Mark all pending tools as interrupted, awaiting followup
-                        is_first = True
-                        for tool_use_id, (tool_name, tool_input, start_ts) in pending_tools.items():
-                            duration_ms = None
-                            if start_ts and interrupt_ts:
-                                duration_ms = int((interrupt_ts - start_ts) * 1000)
-                            # ADR-006: First pending tool is "primary", rest are "collateral"
-                            position = "primary" if is_first else "collateral"
-                            is_first = False
-                            awaiting_followup.append((tool_name, tool_input, duration_ms, position))
-                        pending_tools.clear()
-
-                    # If we have tools awaiting followup and user said something, capture it
-                    elif user_text and awaiting_followup:
-                        for tool_name, tool_input, duration_ms, position in awaiting_followup:
-                            followup = user_text[:MAX_PROMPT_LENGTH]
-                            session_data.interrupted_tools.append(InterruptedTool(
-                                tool_name=tool_name,
-                                tool_input=tool_input,
-                                followup_message=followup,
-                                duration_ms=duration_ms,
-                                position=position,
-                                category=classify_interruption(tool_name, duration_ms, followup),
-                            ))
-                        awaiting_followup.clear()
-
-                elif entry_type == "assistant":
-                    message = entry.get("message", {})
-                    content = message.get("content", [])
-
-                    if isinstance(content, list):
-                        for item in content:
-                            if isinstance(item, dict) and item.get("type") == "tool_use":
-                                tool_name = item.get("name", "")
-                                tool_use_id = item.get("id", "")
-                                tool_input = item.get("input", {})
-
-                                # Track pending tools with full info (ADR-006: include timestamp)
-                                if tool_use_id:
-                                    entry_ts = entry.get("timestamp")
-                                    pending_tools[tool_use_id] = (tool_name, tool_input, entry_ts)
-
-                                if tool_name == "Skill":
-                                    skill = tool_input.get("skill", "")
-                                    if skill:
-                                        session_data.skills_used.add(skill)
-
-                                elif tool_name == "Task":
-                                    agent = tool_input.get("subagent_type", "")
-                                    if agent:
-                                        session_data.agents_used.add(agent)
-
-                                else:
-                                    session_data.tools_used.add(tool_name)
-
-            except json.JSONDecodeError as e:
-                session_data.parsing_errors.append({"line": line_num, "error": str(e)})
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue  # Removed while scanning
+            if since_ts is not None and mtime < since_ts:
+                continue
+            if until_ts is not None and mtime >= until_ts:
                 continue
+            yield mtime, entry.path
 
-        # Remaining pending tools at session end are interrupted (no followup available)
-        is_first = True
-        for tool_use_id, (tool_name, tool_input, start_ts) in pending_tools.items():
-            session_data.interrupted_count += 1
-            position = "primary" if is_first else "collateral"
-            is_first = False
-            session_data.interrupted_tools.append(InterruptedTool(
-                tool_name=tool_name,
-                tool_input=tool_input,
-                followup_message="[session ended]",
-                duration_ms=None,  # Can't calculate without end timestamp
-                position=position,
-                category="session_abandon",  # ADR-006
-            ))
 
-    except Exception as e:
-        print(f"Warning: Could not parse {session_path}: {e}", file=sys.stderr)
+def iter_lines_from(path: Path, offset: int = 0, chunk_size: int = JSONL_READ_CHUNK_SIZE) -> Iterator[tuple[bytes, int, bool]]:
+    """Yield (line, end_offset, terminated) for each newline-separated line from offset.
 
-    # ADR-026: Check parse success rate and warn if below threshold
-    if session_data.entries_total > 0:
-        success_rate = session_data.entries_parsed / session_data.entries_total
-        if success_rate < MIN_PARSE_SUCCESS_RATE:
-            print(
-                f"WARNING: Parse success rate {success_rate:.1%} below {MIN_PARSE_SUCCESS_RATE:.0%} "
-                f"for {session_path.name}. JSONL schema may have changed. See ADR-026.",
-                file=sys.stderr
-            )
+    Reads in binary chunks so memory is bounded by the longest line.
+    end_offset is the byte position just past the line's newline. The segment
+    after the last newline comes last with terminated=False (possibly empty);
+    a writer may still be appending to it.
 
-    return session_data
+    NOTE: Duplicated in generate_session_summary.py for standalone operation.
+    Keep implementations in sync (ADR-013).
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        pos = offset
+        tail: list[bytes] = []
+        while chunk := f.read(chunk_size):
+            start = 0
+            while (nl := chunk.find(b"\n", start)) != -1:
+                line = chunk[start:nl]
+                if tail:
+                    tail.append(line)
+                    line = b"".join(tail)
+                    tail = []
+                pos += len(line) + 1
+                yield line, pos, True
+                start = nl + 1
+            if start < len(chunk):
+                tail.append(chunk[start:])
+        line = b"".join(tail)
+        yield line, pos + len(line), False
+
+
+def _iter_mapped_lines(
+    path: Path,
+    offset: int = 0,
+    chunk_size: int = JSONL_READ_CHUNK_SIZE,
+    min_bytes: int = JSONL_MMAP_MIN_BYTES,
+) -> Iterator[tuple[bytes, int, bool]]:
+    """iter_lines_from, memory-mapping files with at least min_bytes past offset.
+
+    Newlines are found in the map itself and each line is copied out of it
+    once: no read buffer, and no joining of lines that straddle chunks.
+    Smaller spans, and files that cannot be mapped, are read in chunks.
+    Only map files nothing truncates while they are read: a read past the
+    end of a shrunken map raises SIGBUS and kills the process, where a
+    buffered read just comes up short.
+    """
+    with open(path, "rb") as f:
+        mapped = None
+        if os.fstat(f.fileno()).st_size - offset >= min_bytes:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                pass
+        if mapped is None:
+            yield from iter_lines_from(path, offset, chunk_size)
+            return
+        with mapped:
+            find = mapped.find
+            start = offset
+            while (nl := find(b"\n", start)) != -1:
+                yield mapped[start:nl], nl + 1, True
+                start = nl + 1
+            line = mapped[start:]
+            yield line, start + len(line), False
+
+
+def _iter_session_lines(
+    session_path: Path,
+    offset: int = 0,
+    chunk_size: int = JSONL_READ_CHUNK_SIZE,
+) -> Iterator[tuple[bytes, int, bool]]:
+    """Yield (line, end_offset, terminated) as read_text().strip().split("\\n") would split the file.
+
+    Surrounding whitespace of the file is dropped and blank lines between
+    entries are kept, so parse statistics (ADR-026) match a whole-file read.
+    When resuming (offset > 0) the lines before offset count as content.
+    """
+    seen_content = offset > 0
+    held: tuple[bytes, int, bool] | None = None  # Last content line, emitted once the next one arrives
+    blanks: list[tuple[bytes, int, bool]] = []  # Blank lines after `held`; dropped if nothing follows
+    # Only full reads are mapped: a resumed read is of a transcript still being
+    # written, the kind a rewrite could truncate under the map (see _iter_mapped_lines)
+    if offset == 0:
+        lines = _iter_mapped_lines(session_path, offset, chunk_size, JSONL_MMAP_MIN_BYTES)
+    else:
+        lines = iter_lines_from(session_path, offset, chunk_size)
+    for raw, end_offset, terminated in lines:
+        if raw.endswith(b"\r"):
+            raw = raw[:-1]  # read_text() translates \r\n newlines
+        if not raw.strip():
+            if seen_content:
+                blanks.append((raw, end_offset, terminated))
+            continue
+        if not seen_content:
+            raw = raw.lstrip()
+            seen_content = True
+        if held is not None:
+            yield held
+        yield from blanks
+        blanks.clear()
+        held = (raw, end_offset, terminated)
+    if held is not None:
+        yield held[0].rstrip(), held[1], held[2]
+    elif offset == 0:
+        yield b"", 0, False  # A whitespace-only file reads as one empty entry
+
+
+def iter_jsonl_lines(session_path: Path, chunk_size: int = JSONL_READ_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the lines of a JSONL file lazily, reading it in binary chunks.
+
+    Produces the same sequence as read_text().strip().split("\\n") so parse
+    statistics (ADR-026) are unchanged. Only the current line (plus blank
+    lines that may still turn out to be trailing) is held in memory.
+    """
+    for line, _, _ in _iter_session_lines(session_path, 0, chunk_size):
+        yield line
 
 
-def calculate_length_score(trigger: str) -> float:
-    return min(100, len(trigger) * 10) / 100
+@dataclass
+class SessionParseState:
+    """Checkpoint of parse_session_file that can be resumed when the file grows.
 
+    byte_offset marks the end of the last newline-terminated line consumed and
+    prefix_digest fingerprints the bytes just before it, so a transcript that
+    was rewritten rather than appended to is parsed again from the start.
+    """
+    session_data: SessionData
+    byte_offset: int = 0
+    line_num: int = 0
+    prefix_digest: str = ""
+    # ADR-006: tool_use_id -> (tool_name, tool_input, timestamp)
+    pending_tools: dict[str, tuple[str, dict, Optional[float]]] = field(default_factory=dict)
+    # Interrupted tools waiting for the user's next message: (tool_name, tool_input, duration_ms, position)
+    awaiting_followup: list[tuple[str, dict, Optional[int], str]] = field(default_factory=list)
 
-def calculate_specificity_score(trigger: str) -> float:
-    return 1.0 if " " in trigger or "-" in trigger else 0.5
 
+def new_session_parse_state(session_path: Path) -> SessionParseState:
+    return SessionParseState(session_data=SessionData(session_id=session_path.stem[:8]))
 
-def calculate_position_score(match_position: int) -> float:
-    if match_position <= 20:
-        return 1.0
-    elif match_position >= 200:
-        return 0.0
-    else:
-        return 1.0 - ((match_position - 20) / 180)
 
+def _prefix_digest(session_path: Path, offset: int, window: int = 4096) -> str:
+    """Fingerprint the bytes just before offset to detect rewritten transcripts."""
+    if offset <= 0:
+        return ""
+    with open(session_path, "rb") as f:
+        f.seek(max(0, offset - window))
+        return hashlib.sha256(f.read(min(offset, window))).hexdigest()
+
+
+def make_entry_decoder(backend: str = "auto") -> tuple[str, Callable[[bytes], object]]:
+    """Return (backend, decode) for transcript lines; "auto" takes the first importable of JSON_BACKENDS.
+
+    msgspec decodes into typed structs holding only the fields the parsers
+    read (type, subtype, timestamp and the type/id/name/input/tool_use_id/
+    text/content of message items), so other fields such as thinking blocks
+    and usage are skipped instead of built. orjson builds the same dicts as
+    the stdlib, faster, except that integers beyond 64 bits become floats.
+    A line a fast backend rejects or cannot type is decoded again with
+    json.loads, so parse errors and their messages never depend on the
+    backend. Raises ImportError for a named backend that is not installed.
+    """
+    if backend != "auto" and backend not in JSON_BACKENDS:
+        raise ValueError(f"unknown JSON backend {backend!r} (choose auto, {', '.join(JSON_BACKENDS)})")
+    for name in JSON_BACKENDS if backend == "auto" else (backend,):
+        try:
+            if name == "msgspec":
+                import msgspec
+                from typing import Any, Union
+
+                # UNSET fields are left out of to_builtins(), like keys missing from the line
+                class Item(msgspec.Struct):
+                    type: Any = msgspec.UNSET
+                    id: Any = msgspec.UNSET
+                    name: Any = msgspec.UNSET
+                    input: Any = msgspec.UNSET
+                    tool_use_id: Any = msgspec.UNSET
+                    text: Any = msgspec.UNSET
+                    content: Any = msgspec.UNSET
+
+                class Message(msgspec.Struct):
+                    content: Union[str, list[Item], None, msgspec.UnsetType] = msgspec.UNSET
+
+                class Entry(msgspec.Struct):
+                    type: Any = msgspec.UNSET
+                    subtype: Any = msgspec.UNSET
+                    timestamp: Any = msgspec.UNSET
+                    message: Union[Message, None, msgspec.UnsetType] = msgspec.UNSET
+
+                decoder = msgspec.json.Decoder(Entry)
+
+                def fast_loads(line: bytes) -> object:
+                    if not line.isascii():
+                        line.decode("utf-8")  # Skipped fields are not validated by msgspec
+                    return msgspec.to_builtins(decoder.decode(line))
+
+                errors = (msgspec.DecodeError, UnicodeDecodeError)
+            elif name == "orjson":
+                import orjson
+                fast_loads, errors = orjson.loads, (orjson.JSONDecodeError,)
+            else:
+                return name, json.loads
+        except ImportError:
+            if backend != "auto":
+                raise
+            continue
 
-def calculate_confidence(trigger: str, match_position: int) -> float:
-    length = calculate_length_score(trigger)
-    specificity = calculate_specificity_score(trigger)
-    position = calculate_position_score(match_position)
-    return (length + specificity + position) / 3
+        def decode(line: bytes, fast_loads=fast_loads, errors=errors) -> object:
+            try:
+                return fast_loads(line)
+            except errors:
+                return json.loads(line)
 
+        return name, decode
 
-def find_matches(prompt: str, items: list[SkillOrAgent], min_triggers: int = 2, min_confidence: float = 0.80) -> list[MatchResult]:
-    """Find skills/agents that match a prompt based on triggers.
 
-    ADR-001 improvements:
-    - Unified threshold (>= 3 chars)
-    - 3-char triggers require UPPERCASE (e.g., TDD, API, DDD)
-    - Common words are blocked from matching
+def select_json_backend(backend: str = "auto") -> str:
+    """Decode transcript lines with backend from now on; returns the backend chosen."""
+    global _json_backend, _decode_entry
+    _json_backend, _decode_entry = make_entry_decoder(backend)
+    return _json_backend
+
+
+_json_backend, _decode_entry = make_entry_decoder()
+
+
+def _may_change_session(line: bytes) -> bool:
+    """Byte-level prefilter: can this raw JSONL line change SessionData?
+
+    Only user entries (prompts, tool results, interruptions), assistant
+    entries with tool_use blocks and compaction boundaries are decoded.
+    Everything else (assistant text, progress, system, snapshots) cannot,
+    and is usually most of a transcript's bytes. A false positive only
+    costs a decode.
     """
-    matches = []
-    prompt_lower = prompt.lower()
+    return b'"user"' in line or b'"tool_use"' in line or b'"compact_boundary"' in line
+
+
+def _looks_like_json_object(line: bytes) -> bool:
+    """Cheap check that a skipped line is a whole JSON object: braces at both ends, valid UTF-8.
+
+    Lines that fail it are decoded for their exact parse error; lines that
+    pass are counted in entries_skipped, not entries_parsed (ADR-026).
+    """
+    stripped = line.strip()
+    if not (stripped.startswith(b"{") and stripped.endswith(b"}")):
+        return False
+    if stripped.isascii():
+        return True
+    try:
+        stripped.decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+@dataclass
+class ToolUse:
+    """An assistant tool call; id links it to its ToolResult."""
+    id: str
+    name: str
+    input: dict
+    timestamp: float | str | None = None
+
+
+@dataclass
+class ToolResult:
+    """A tool result returned in a user entry."""
+    tool_use_id: str
+    content: object
+    timestamp: float | str | None = None
 
-    for item in items:
-        matched_triggers = []
-        earliest_position = len(prompt_lower)
-        for trigger in item.triggers:
-            trigger_lower = trigger.lower()
 
-            # Skip triggers below minimum length
-            if len(trigger_lower) < MIN_TRIGGER_LENGTH:
+@dataclass
+class Prompt:
+    """User text: string content with non-blank text, or a text item."""
+    text: str
+    timestamp: float | str | None = None
+
+
+@dataclass
+class Interruption:
+    """The "[Request interrupted by user]" marker, once per text that carries it."""
+    timestamp: float | str | None = None
+
+
+@dataclass
+class Compaction:
+    """A compact_boundary system entry."""
+    timestamp: float | str | None = None
+
+
+def entry_events(entry: dict) -> list:
+    """Walk one decoded transcript entry into events, in content order.
+
+    This is the one walk over entries shared by both parsers: the
+    collector's SessionData and the hook's summary stats both consume these
+    events.
+
+    NOTE: Duplicated in generate_session_summary.py / collect_usage.py for
+    standalone operation. Keep implementations in sync (ADR-013).
+    """
+    entry_type = entry.get("type")
+    timestamp = entry.get("timestamp")
+
+    if entry_type == "system":
+        return [Compaction(timestamp)] if entry.get("subtype") == "compact_boundary" else []
+
+    if entry_type == "assistant":
+        content = entry.get("message", {}).get("content", [])
+        if not isinstance(content, list):
+            return []
+        return [
+            ToolUse(item.get("id", ""), item.get("name", ""), item.get("input", {}), timestamp)
+            for item in content
+            if isinstance(item, dict) and item.get("type") == "tool_use"
+        ]
+
+    if entry_type != "user":
+        return []
+    content = entry.get("message", {}).get("content", "")
+    if isinstance(content, str):
+        if "[Request interrupted by user]" in content:
+            return [Interruption(timestamp)]
+        return [Prompt(content, timestamp)] if content.strip() else []
+
+    events = []
+    if isinstance(content, list):
+        for item in content:
+            if not isinstance(item, dict):
                 continue
+            item_type = item.get("type")
+            if item_type == "text":
+                text = item.get("text", "")
+                if "[Request interrupted by user]" in text:
+                    events.append(Interruption(timestamp))
+                else:
+                    events.append(Prompt(text, timestamp))
+            elif item_type == "tool_result":
+                # Tool results are in user messages
+                events.append(ToolResult(item.get("tool_use_id", ""), item.get("content", ""), timestamp))
+    return events
+
+
+def _add_session_events(state: SessionParseState, events: list) -> None:
+    """Apply one entry's events to the parse state."""
+    session_data = state.session_data
+    pending_tools = state.pending_tools
+    awaiting_followup = state.awaiting_followup
+
+    # Extract user text from message (for followup capture)
+    user_text = ""
+    is_interruption = False
+    interrupt_ts = None
+
+    for event in events:
+        if isinstance(event, ToolUse):
+            tool_name = event.name
+            tool_input = event.input
+
+            # Track pending tools with full info (ADR-006: include timestamp)
+            if event.id:
+                pending_tools[event.id] = (tool_name, tool_input, event.timestamp)
+
+            if tool_name == "Skill":
+                skill = tool_input.get("skill", "")
+                if skill:
+                    session_data.skills_used.add(skill)
+
+            elif tool_name == "Task":
+                agent = tool_input.get("subagent_type", "")
+                if agent:
+                    session_data.agents_used.add(agent)
 
-            # 3-char triggers: require UPPERCASE in original (ADR-001)
-            # This allows TDD, API, DDD but not "the", "for", etc.
-            if len(trigger_lower) == 3:
-                if not trigger.isupper():
-                    continue
-                if trigger_lower in COMMON_WORD_BLOCKLIST:
+            else:
+                session_data.tools_used.add(tool_name)
+
+        elif isinstance(event, ToolResult):
+            # Get tool info and remove from pending
+            tool_name = pending_tools.pop(event.tool_use_id, ("unknown", {}, None))[0]
+            if isinstance(event.content, (str, list)):
+                outcome = detect_outcome(tool_name, event.content)
+                if outcome == "success":
+                    session_data.success_count += 1
+                else:
+                    session_data.failure_count += 1
+
+        elif isinstance(event, Prompt):
+            if not _is_system_prompt(event.text):
+                if not user_text:  # Take first non-system text
+                    user_text = event.text
+                session_data.prompts.append(event.text)
+
+        elif isinstance(event, Interruption):
+            is_interruption = True
+            # ADR-006: Get current timestamp for duration calculation
+            interrupt_ts = event.timestamp
+
+        elif isinstance(event, Compaction):
+            session_data.compaction_count += 1
+
+    # Handle interruption - capture which tools were pending
+    if is_interruption:
+        session_data.interrupted_count += 1
+        # Mark all pending tools as interrupted, awaiting followup
+        is_first = True
+        for tool_use_id, (tool_name, tool_input, start_ts) in pending_tools.items():
+            duration_ms = None
+            if start_ts and interrupt_ts:
+                duration_ms = int((interrupt_ts - start_ts) * 1000)
+            # ADR-006: First pending tool is "primary", rest are "collateral"
+            position = "primary" if is_first else "collateral"
+            is_first = False
+            awaiting_followup.append((tool_name, tool_input, duration_ms, position))
+        pending_tools.clear()
+
+    # If we have tools awaiting followup and user said something, capture it
+    elif user_text and awaiting_followup:
+        for tool_name, tool_input, duration_ms, position in awaiting_followup:
+            followup = user_text[:MAX_PROMPT_LENGTH]
+            session_data.interrupted_tools.append(InterruptedTool(
+                tool_name=tool_name,
+                tool_input=tool_input,
+                followup_message=followup,
+                duration_ms=duration_ms,
+                position=position,
+                category=classify_interruption(tool_name, duration_ms, followup),
+            ))
+        awaiting_followup.clear()
+
+
+def _consume_session_line(state: SessionParseState, line: bytes) -> None:
+    """Apply one JSONL line to the parse state."""
+    session_data = state.session_data
+    state.line_num += 1
+    session_data.entries_total += 1
+
+    if not _may_change_session(line) and _looks_like_json_object(line):
+        # ADR-026: skipped lines are counted apart from decoded ones; lines that are not
+        # brace-delimited UTF-8 fall through for their exact error
+        session_data.entries_skipped += 1
+        return
+
+    try:
+        entry = _decode_entry(line)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        session_data.parsing_errors.append({"line": state.line_num, "error": str(e)})
+        return
+
+    session_data.entries_parsed += 1
+    _add_session_events(state, entry_events(entry))
+
+
+def _finish_session(state: SessionParseState) -> None:
+    """Remaining pending tools at session end are interrupted (no followup available)."""
+    session_data = state.session_data
+    is_first = True
+    for tool_use_id, (tool_name, tool_input, start_ts) in state.pending_tools.items():
+        session_data.interrupted_count += 1
+        position = "primary" if is_first else "collateral"
+        is_first = False
+        session_data.interrupted_tools.append(InterruptedTool(
+            tool_name=tool_name,
+            tool_input=tool_input,
+            followup_message="[session ended]",
+            duration_ms=None,  # Can't calculate without end timestamp
+            position=position,
+            category="session_abandon",  # ADR-006
+        ))
+    state.pending_tools.clear()
+
+
+def parse_session_file(
+    session_path: Path,
+    state: SessionParseState | None = None,
+) -> SessionData:
+    """Parse a session JSONL file with outcome and compaction tracking.
+
+    ADR-026: Tracks parse success rate and warns if schema may have changed.
+    ADR-047: Tracks session date and calculates recency weight.
+
+    Pass the state from an earlier call to resume at its byte offset, so only
+    lines appended since are read; the state is advanced in place. An
+    unterminated final line (still being written) is included in the result
+    but left out of the checkpoint.
+    """
+    # ADR-047: Get session date from file modification time
+    session_date = datetime.fromtimestamp(session_path.stat().st_mtime)
+    recency_weight = calculate_recency_weight(session_date)
+
+    checkpoint = state
+    if state is None:
+        state = new_session_parse_state(session_path)
+
+    try:
+        if state.byte_offset and state.prefix_digest != _prefix_digest(session_path, state.byte_offset):
+            vars(state).update(vars(new_session_parse_state(session_path)))
+
+        unterminated: list[bytes] = []
+        for line, end_offset, terminated in _iter_session_lines(session_path, state.byte_offset):
+            if not terminated:
+                unterminated.append(line)
+                continue
+            _consume_session_line(state, line)
+            state.byte_offset = end_offset
+        state.prefix_digest = _prefix_digest(session_path, state.byte_offset)
+
+        # The checkpoint stops at the last complete line; finish on a copy
+        if checkpoint is not None:
+            state = copy.deepcopy(state)
+        for line in unterminated:
+            _consume_session_line(state, line)
+        _finish_session(state)
+
+    except Exception as e:
+        print(f"Warning: Could not parse {session_path}: {e}", file=sys.stderr)
+
+    session_data = state.session_data
+    session_data.session_date = session_date
+    session_data.recency_weight = recency_weight
+
+    # ADR-026: Check parse success rate and warn if below threshold
+    if session_data.entries_total > 0:
+        success_rate = (session_data.entries_parsed + session_data.entries_skipped) / session_data.entries_total
+        if success_rate < MIN_PARSE_SUCCESS_RATE:
+            print(
+                f"WARNING: Parse success rate {success_rate:.1%} below {MIN_PARSE_SUCCESS_RATE:.0%} "
+                f"for {session_path.name}. JSONL schema may have changed. See ADR-026.",
+                file=sys.stderr
+            )
+
+    return session_data
+
+
+def session_to_dict(session: SessionData) -> dict:
+    """Serialize SessionData to JSON-compatible data (inverse of session_from_dict)."""
+    return {
+        "session_id": session.session_id,
+        "prompts": session.prompts,
+        "skills_used": sorted(session.skills_used),
+        "agents_used": sorted(session.agents_used),
+        "tools_used": sorted(session.tools_used),
+        "hooks_triggered": dict(session.hooks_triggered),
+        "success_count": session.success_count,
+        "failure_count": session.failure_count,
+        "interrupted_count": session.interrupted_count,
+        "compaction_count": session.compaction_count,
+        "interrupted_tools": [
+            {
+                "tool_name": it.tool_name,
+                "tool_input": it.tool_input,
+                "followup_message": it.followup_message,
+                "duration_ms": it.duration_ms,
+                "position": it.position,
+                "category": it.category,
+            }
+            for it in session.interrupted_tools
+        ],
+        "entries_total": session.entries_total,
+        "entries_parsed": session.entries_parsed,
+        "entries_skipped": session.entries_skipped,
+        "parsing_errors": session.parsing_errors,
+        "session_date": session.session_date.isoformat() if session.session_date else None,
+        "project_path": session.project_path,
+    }
+
+
+def session_from_dict(data: dict) -> SessionData:
+    """Rebuild SessionData from session_to_dict output.
+
+    ADR-047: recency_weight depends on the current time, so it is recomputed
+    rather than restored.
+    """
+    session_date = datetime.fromisoformat(data["session_date"]) if data.get("session_date") else None
+    hooks_triggered: dict[str, int] = defaultdict(int)
+    hooks_triggered.update(data.get("hooks_triggered", {}))
+    return SessionData(
+        session_id=data["session_id"],
+        prompts=list(data.get("prompts", [])),
+        skills_used=set(data.get("skills_used", [])),
+        agents_used=set(data.get("agents_used", [])),
+        tools_used=set(data.get("tools_used", [])),
+        hooks_triggered=hooks_triggered,
+        success_count=data.get("success_count", 0),
+        failure_count=data.get("failure_count", 0),
+        interrupted_count=data.get("interrupted_count", 0),
+        compaction_count=data.get("compaction_count", 0),
+        interrupted_tools=[InterruptedTool(**it) for it in data.get("interrupted_tools", [])],
+        entries_total=data.get("entries_total", 0),
+        entries_parsed=data.get("entries_parsed", 0),
+        entries_skipped=data.get("entries_skipped", 0),
+        parsing_errors=list(data.get("parsing_errors", [])),
+        session_date=session_date,
+        recency_weight=calculate_recency_weight(session_date),
+        project_path=data.get("project_path", "unknown"),
+    )
+
+
+def session_parse_state_to_dict(state: SessionParseState) -> dict:
+    """Serialize a parse checkpoint (inverse of session_parse_state_from_dict)."""
+    return {
+        "session": session_to_dict(state.session_data),
+        "byte_offset": state.byte_offset,
+        "line_num": state.line_num,
+        "prefix_digest": state.prefix_digest,
+        "pending_tools": {tool_use_id: list(info) for tool_use_id, info in state.pending_tools.items()},
+        "awaiting_followup": [list(item) for item in state.awaiting_followup],
+    }
+
+
+def session_parse_state_from_dict(data: dict) -> SessionParseState:
+    return SessionParseState(
+        session_data=session_from_dict(data["session"]),
+        byte_offset=data["byte_offset"],
+        line_num=data["line_num"],
+        prefix_digest=data["prefix_digest"],
+        pending_tools={tool_use_id: tuple(info) for tool_use_id, info in data["pending_tools"].items()},
+        awaiting_followup=[tuple(item) for item in data["awaiting_followup"]],
+    )
+
+
+def _session_cache_file(cache_dir: Path, session_path: Path) -> Path:
+    digest = hashlib.sha256(str(session_path.resolve()).encode()).hexdigest()[:32]
+    return cache_dir / f"{digest}.json"
+
+
+def _session_cache_key(session_path: Path) -> dict:
+    """Cache key for a session file: path + size + mtime + parser version."""
+    st = session_path.stat()
+    return {
+        "path": str(session_path.resolve()),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "parser_version": SESSION_PARSER_VERSION,
+    }
+
+
+def load_cached_session(
+    cache_dir: Path,
+    session_path: Path,
+    key: dict,
+) -> tuple[SessionData | None, SessionParseState | None]:
+    """Look up session_path in the cache.
+
+    Returns (session, None) when the key still matches, (None, state) when the
+    file has changed but its checkpoint can be resumed, and (None, None) on a miss.
+    """
+    cache_file = _session_cache_file(cache_dir, session_path)
+    try:
+        cached = json.loads(cache_file.read_text())
+        cached_key = cached["key"]
+        if cached_key == key:
+            return session_from_dict(cached["session"]), None
+        if cached_key["path"] != key["path"] or cached_key["parser_version"] != key["parser_version"]:
+            return None, None
+        state = session_parse_state_from_dict(cached["state"])
+        # A shrunken file was rewritten; parse_session_file checks the prefix digest otherwise
+        if key["size"] < state.byte_offset:
+            return None, None
+        return None, state
+    except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None, None
+
+
+def store_cached_session(
+    cache_dir: Path,
+    session_path: Path,
+    key: dict,
+    session: SessionData,
+    state: SessionParseState,
+) -> None:
+    """Write a cache entry atomically so concurrent runs never see partial files."""
+    cache_file = _session_cache_file(cache_dir, session_path)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    entry = {"key": key, "session": session_to_dict(session), "state": session_parse_state_to_dict(state)}
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file.write_text(json.dumps(entry))
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Warning: Could not write session cache {cache_file}: {e}", file=sys.stderr)
+        tmp_file.unlink(missing_ok=True)
+
+
+SESSION_STORE_SCHEMA = """
+CREATE TABLE sessions (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    project_dir TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    session_date TEXT,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    parser_version INTEGER NOT NULL,
+    success_count INTEGER NOT NULL,
+    failure_count INTEGER NOT NULL,
+    interrupted_count INTEGER NOT NULL,
+    compaction_count INTEGER NOT NULL,
+    entries_total INTEGER NOT NULL,
+    entries_parsed INTEGER NOT NULL,
+    entries_skipped INTEGER NOT NULL,
+    parsing_errors TEXT NOT NULL
+);
+CREATE INDEX sessions_by_project ON sessions (project_dir, mtime_ns);
+CREATE INDEX sessions_by_mtime ON sessions (mtime_ns);
+CREATE TABLE prompts (
+    session INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX prompts_by_session ON prompts (session);
+CREATE TABLE components (
+    session INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE INDEX components_by_session ON components (session);
+CREATE INDEX components_by_name ON components (kind, name);
+CREATE TABLE hooks (
+    session INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    event TEXT NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE INDEX hooks_by_session ON hooks (session);
+CREATE TABLE interruptions (
+    session INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tool_name TEXT NOT NULL,
+    tool_input TEXT NOT NULL,
+    followup_message TEXT NOT NULL,
+    duration_ms INTEGER,
+    interruption_position TEXT NOT NULL,
+    category TEXT NOT NULL
+);
+CREATE INDEX interruptions_by_session ON interruptions (session);
+"""
+
+
+class SessionStore:
+    """Parsed sessions in SQLite tables, one row per session and per event.
+
+    sessions holds one row per transcript (outcome counters, parse stats)
+    keyed by path; prompts, components (kind 'skill', 'agent' or 'tool'),
+    hooks and interruptions hold its events. Rows are added as sessions are
+    parsed with --store and outlive the transcripts, so long histories can
+    be analyzed with --from-store, or queried with any SQLite client,
+    without re-reading JSONL. A transcript that changed is replaced as a
+    whole; nothing else is ever rewritten.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SESSION_STORE_VERSION:
+            with self.conn:
+                for (table,) in self.conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+                ).fetchall():
+                    self.conn.execute(f"DROP TABLE {table}")
+            self.conn.executescript(SESSION_STORE_SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {SESSION_STORE_VERSION}")
+
+    def __enter__(self) -> "SessionStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def add_sessions(self, entries: list[tuple[Path, SessionData]]) -> int:
+        """Store (session file, parsed session) pairs; returns how many were written.
+
+        Sessions whose file size, mtime and parser version match the stored
+        row are skipped. A session's project is its file's folder name.
+        """
+        written = 0
+        with self.conn:
+            for session_path, session in entries:
+                try:
+                    st = session_path.stat()
+                except OSError:
                     continue
+                path = str(session_path.resolve())
+                row = self.conn.execute(
+                    "SELECT id, size, mtime_ns, parser_version FROM sessions WHERE path = ?", (path,)
+                ).fetchone()
+                if row is not None:
+                    if row[1:] == (st.st_size, st.st_mtime_ns, SESSION_PARSER_VERSION):
+                        continue
+                    self.conn.execute("DELETE FROM sessions WHERE id = ?", (row[0],))
+                self._insert(path, st, session)
+                written += 1
+        return written
+
+    def _insert(self, path: str, st: os.stat_result, session: SessionData) -> None:
+        cursor = self.conn.execute(
+            "INSERT INTO sessions (path, project_dir, session_id, session_date, size, mtime_ns, parser_version,"
+            " success_count, failure_count, interrupted_count, compaction_count, entries_total, entries_parsed,"
+            " entries_skipped, parsing_errors) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path, Path(path).parent.name, session.session_id,
+                session.session_date.isoformat() if session.session_date else None,
+                st.st_size, st.st_mtime_ns, SESSION_PARSER_VERSION,
+                session.success_count, session.failure_count, session.interrupted_count, session.compaction_count,
+                session.entries_total, session.entries_parsed, session.entries_skipped,
+                json.dumps(session.parsing_errors),
+            ),
+        )
+        rowid = cursor.lastrowid
+        self.conn.executemany(
+            "INSERT INTO prompts (session, position, text) VALUES (?, ?, ?)",
+            [(rowid, i, prompt) for i, prompt in enumerate(session.prompts)],
+        )
+        self.conn.executemany(
+            "INSERT INTO components (session, kind, name) VALUES (?, ?, ?)",
+            [(rowid, kind, name)
+             for kind, names in (("skill", session.skills_used), ("agent", session.agents_used), ("tool", session.tools_used))
+             for name in sorted(names)],
+        )
+        self.conn.executemany(
+            "INSERT INTO hooks (session, event, count) VALUES (?, ?, ?)",
+            [(rowid, event, count) for event, count in session.hooks_triggered.items()],
+        )
+        self.conn.executemany(
+            "INSERT INTO interruptions (session, position, tool_name, tool_input, followup_message, duration_ms,"
+            " interruption_position, category) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(rowid, i, it.tool_name, json.dumps(it.tool_input), it.followup_message, it.duration_ms, it.position, it.category)
+             for i, it in enumerate(session.interrupted_tools)],
+        )
 
-            # 4-char triggers: skip common words
-            if len(trigger_lower) == 4 and trigger_lower in COMMON_WORD_BLOCKLIST:
+    def load_sessions(
+        self,
+        project_dir: str | None,
+        max_sessions: int | None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[SessionData]:
+        """Stored sessions, newest first, selected like find_project_sessions.
+
+        project_dir is a project folder name, or None for every project (then
+        max_sessions applies per project, as with --all-projects). Each
+        session's project_path is its project folder name.
+        """
+        where, params = [], []
+        if project_dir is not None:
+            where.append("project_dir = ?")
+            params.append(project_dir)
+        if since is not None:
+            where.append("mtime_ns >= ?")
+            params.append(int(since.timestamp() * 1_000_000_000))
+        if until is not None:
+            where.append("mtime_ns < ?")
+            params.append(int(until.timestamp() * 1_000_000_000))
+        query = (
+            "SELECT id, project_dir, session_id, session_date, success_count, failure_count, interrupted_count,"
+            " compaction_count, entries_total, entries_parsed, entries_skipped, parsing_errors, mtime_ns, path,"
+            " ROW_NUMBER() OVER (PARTITION BY project_dir ORDER BY mtime_ns DESC, path) AS newest"
+            " FROM sessions"
+        )
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query = f"SELECT * FROM ({query})"
+        if max_sessions is not None:
+            query += " WHERE newest <= ?"
+            params.append(max_sessions)
+        query += " ORDER BY mtime_ns DESC, project_dir, path"
+
+        sessions: dict[int, SessionData] = {}
+        for row in self.conn.execute(query, params):
+            session_date = datetime.fromisoformat(row[3]) if row[3] else None
+            sessions[row[0]] = SessionData(
+                session_id=row[2],
+                success_count=row[4],
+                failure_count=row[5],
+                interrupted_count=row[6],
+                compaction_count=row[7],
+                entries_total=row[8],
+                entries_parsed=row[9],
+                entries_skipped=row[10],
+                parsing_errors=json.loads(row[11]),
+                session_date=session_date,
+                recency_weight=calculate_recency_weight(session_date),
+                project_path=row[1],
+            )
+        if not sessions:
+            return []
+
+        # Child rows are fetched per table for all selected sessions at once
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS selected (id INTEGER PRIMARY KEY)")
+        self.conn.execute("DELETE FROM selected")
+        self.conn.executemany("INSERT INTO selected (id) VALUES (?)", [(rowid,) for rowid in sessions])
+        for rowid, text in self.conn.execute(
+            "SELECT session, text FROM prompts JOIN selected ON session = selected.id ORDER BY session, position"
+        ):
+            sessions[rowid].prompts.append(text)
+        for rowid, kind, name in self.conn.execute(
+            "SELECT session, kind, name FROM components JOIN selected ON session = selected.id"
+        ):
+            {"skill": sessions[rowid].skills_used, "agent": sessions[rowid].agents_used,
+             "tool": sessions[rowid].tools_used}[kind].add(name)
+        for rowid, event, count in self.conn.execute(
+            "SELECT session, event, count FROM hooks JOIN selected ON session = selected.id"
+        ):
+            sessions[rowid].hooks_triggered[event] = count
+        for rowid, tool_name, tool_input, followup, duration_ms, position, category in self.conn.execute(
+            "SELECT session, tool_name, tool_input, followup_message, duration_ms, interruption_position, category"
+            " FROM interruptions JOIN selected ON session = selected.id ORDER BY session, position"
+        ):
+            sessions[rowid].interrupted_tools.append(InterruptedTool(
+                tool_name=tool_name, tool_input=json.loads(tool_input), followup_message=followup,
+                duration_ms=duration_ms, position=position, category=category,
+            ))
+        return list(sessions.values())
+
+    def quick_stats(self, since: datetime) -> dict:
+        """Quick stats for sessions modified since a time, as SQL aggregates.
+
+        Same layout as analyze_session_summaries, but the store keeps tool
+        names per session rather than call counts: total_tools and
+        tool_breakdown count sessions using each tool, and workflow stages
+        and session types are not recorded.
+        """
+        stats = _new_quick_stats()
+        where = (int(since.timestamp() * 1_000_000_000),)
+        row = self.conn.execute(
+            "SELECT COUNT(*), TOTAL(success_count), TOTAL(failure_count), TOTAL(compaction_count)"
+            " FROM sessions WHERE mtime_ns >= ?", where,
+        ).fetchone()
+        stats["sessions"] = row[0]
+        stats["total_success"], stats["total_failure"], stats["total_compactions"] = map(int, row[1:])
+        for tool, count in self.conn.execute(
+            "SELECT name, COUNT(*) FROM components JOIN sessions ON components.session = sessions.id"
+            " WHERE kind = 'tool' AND mtime_ns >= ? GROUP BY name ORDER BY name", where,
+        ):
+            stats["tool_breakdown"][tool] = count
+            stats["total_tools"] += count
+        for project, sessions, success, failure in self.conn.execute(
+            "SELECT project_dir, COUNT(*), SUM(success_count), SUM(failure_count) FROM sessions"
+            " WHERE mtime_ns >= ? GROUP BY project_dir ORDER BY project_dir", where,
+        ):
+            stats["by_project"][project] = {"sessions": sessions, "success": success, "failure": failure}
+        return stats
+
+
+def parse_sessions(
+    session_files: list[Path],
+    jobs: int = 1,
+    cache_dir: Path | None = None,
+    deadline: Deadline | None = None,
+    project_paths: list[str] | None = None,
+    store: SessionStore | None = None,
+) -> list[SessionData]:
+    """Parse session files, reusing cached results and parsing misses in parallel.
+
+    With cache_dir set, sessions whose (path, size, mtime, parser version) key
+    is unchanged are loaded from disk instead of re-parsed, and sessions that
+    grew since are resumed from their cached checkpoint so only the appended
+    lines are read. Results are returned in the order of session_files so
+    output stays deterministic.
+
+    With a deadline, parsing stops once DEADLINE_PARSE_RESERVE of the budget
+    is left; sessions not parsed by then are left out of the result.
+    project_paths, parallel to session_files, sets each session's project_path.
+    With a store, the parsed sessions are also recorded in it.
+    """
+    results: list[SessionData | None] = [None] * len(session_files)
+    keys: list[dict | None] = [None] * len(session_files)
+    states: list[SessionParseState | None] = [None] * len(session_files)
+    if cache_dir is not None:
+        for i, session_path in enumerate(session_files):
+            try:
+                keys[i] = _session_cache_key(session_path)
+            except OSError:
                 continue
+            results[i], states[i] = load_cached_session(cache_dir, session_path, keys[i])
+            if results[i] is None and states[i] is None:
+                states[i] = new_session_parse_state(session_path)
+
+    misses = [i for i, session in enumerate(results) if session is None]
+    _profiler.count("session_cache_hits", len(session_files) - len(misses))
+    resume_offsets = {i: states[i].byte_offset for i in misses if states[i] is not None}
+    parsed = _parse_session_files([(session_files[i], states[i]) for i in misses], jobs, deadline)
+    for i, (session, state) in zip(misses, parsed):
+        results[i] = session
+        _profiler.count("session_files_parsed")
+        try:
+            _profiler.count("session_bytes_parsed", session_files[i].stat().st_size - resume_offsets.get(i, 0))
+        except OSError:
+            pass
+        if cache_dir is not None and keys[i] is not None:
+            # Key was taken before parsing: a file appended mid-parse is resumed next run
+            store_cached_session(cache_dir, session_files[i], keys[i], session, state)
+
+    if project_paths is not None:
+        for session, project_path in zip(results, project_paths):
+            if session is not None:
+                session.project_path = project_path
+    if store is not None:
+        try:
+            stored = store.add_sessions([(path, session) for path, session in zip(session_files, results) if session is not None])
+            _profiler.count("sessions_stored", stored)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not update session store {store.path}: {e}", file=sys.stderr)
+    return [session for session in results if session is not None]
+
+
+def _parse_session_job(job: tuple[Path, SessionParseState | None]) -> tuple[SessionData, SessionParseState | None]:
+    """Parse one session, resuming from (and advancing) its checkpoint if given."""
+    session_path, state = job
+    return parse_session_file(session_path, state), state
+
+
+def _parse_session_files(
+    jobs_list: list[tuple[Path, SessionParseState | None]],
+    jobs: int,
+    deadline: Deadline | None = None,
+) -> list[tuple[SessionData, SessionParseState | None]]:
+    """Parse (session_path, checkpoint) pairs, fanning out over a process pool when jobs > 1.
+
+    Results are returned in input order regardless of which worker finished
+    first. Small inputs are parsed serially. With a deadline, only a prefix
+    of jobs_list is parsed: the jobs finished before the parse reserve is hit.
+    """
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    if jobs == 1 or len(jobs_list) < PARALLEL_MIN_SESSIONS:
+        return _parse_session_jobs_serially(jobs_list, deadline)
+
+    workers = min(jobs, len(jobs_list))
+    try:
+        if deadline is not None and deadline.seconds is not None:
+            return _parse_session_files_until(jobs_list, workers, deadline)
+        with ProcessPoolExecutor(max_workers=workers, initializer=select_json_backend, initargs=(_json_backend,)) as pool:
+            # Several chunks per worker keeps them busy when session sizes are uneven
+            chunksize = max(1, len(jobs_list) // (workers * 4))
+            return list(pool.map(_parse_session_job, jobs_list, chunksize=chunksize))
+    except (OSError, NotImplementedError) as e:
+        print(f"Warning: Parallel parsing unavailable ({e}), parsing serially", file=sys.stderr)
+        return _parse_session_jobs_serially(jobs_list, deadline)
+
+
+def _parse_session_files_until(
+    jobs_list: list[tuple[Path, SessionParseState | None]],
+    workers: int,
+    deadline: Deadline,
+) -> list[tuple[SessionData, SessionParseState | None]]:
+    """Parse the prefix of jobs_list that workers finish before the parse reserve is hit.
+
+    Sessions are handed to workers one at a time, so the budget is checked
+    between sessions rather than chunks. When it runs out, the pool is
+    terminated: queued sessions are dropped and its workers, still parsing,
+    are killed, so neither this phase nor interpreter exit waits for them.
+    """
+    parsed = []
+    with multiprocessing.Pool(workers, initializer=select_json_backend, initargs=(_json_backend,)) as pool:
+        results = [pool.apply_async(_parse_session_job, (job,)) for job in jobs_list]
+        for result in results:
+            try:
+                parsed.append(result.get(timeout=max(0.0, deadline.remaining(DEADLINE_PARSE_RESERVE))))
+            except multiprocessing.TimeoutError:
+                break
+    return parsed
+
+
+def _parse_session_jobs_serially(
+    jobs_list: list[tuple[Path, SessionParseState | None]],
+    deadline: Deadline | None = None,
+) -> list[tuple[SessionData, SessionParseState | None]]:
+    parsed = []
+    for job in jobs_list:
+        if deadline is not None and deadline.expired(DEADLINE_PARSE_RESERVE):
+            break
+        parsed.append(_parse_session_job(job))
+    return parsed
+
+
+def calculate_length_score(trigger: str) -> float:
+    return min(100, len(trigger) * 10) / 100
+
+
+def calculate_specificity_score(trigger: str) -> float:
+    return 1.0 if " " in trigger or "-" in trigger else 0.5
+
+
+def calculate_position_score(match_position: int) -> float:
+    if match_position <= 20:
+        return 1.0
+    elif match_position >= 200:
+        return 0.0
+    else:
+        return 1.0 - ((match_position - 20) / 180)
+
+
+def calculate_confidence(trigger: str, match_position: int) -> float:
+    length = calculate_length_score(trigger)
+    specificity = calculate_specificity_score(trigger)
+    position = calculate_position_score(match_position)
+    return (length + specificity + position) / 3
+
+
+def _is_matchable_trigger(trigger: str) -> bool:
+    """ADR-001 trigger filters applied before any matching."""
+    trigger_lower = trigger.lower()
+
+    # Skip triggers below minimum length
+    if len(trigger_lower) < MIN_TRIGGER_LENGTH:
+        return False
+
+    # 3-char triggers: require UPPERCASE in original (ADR-001)
+    # This allows TDD, API, DDD but not "the", "for", etc.
+    if len(trigger_lower) == 3:
+        if not trigger.isupper():
+            return False
+        if trigger_lower in COMMON_WORD_BLOCKLIST:
+            return False
+
+    # 4-char triggers: skip common words
+    if len(trigger_lower) == 4 and trigger_lower in COMMON_WORD_BLOCKLIST:
+        return False
+
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def _trigger_pattern(trigger_lower: str) -> re.Pattern:
+    # Match using word boundaries
+    return re.compile(r'\b' + re.escape(trigger_lower) + r'\b')
 
-            # Match using word boundaries
-            m = re.search(r'\b' + re.escape(trigger_lower) + r'\b', prompt_lower)
+
+_WORD_TOKEN_RE = re.compile(r'\w+')
+
+
+class TriggerIndex:
+    """Inverted index from word tokens to the triggers containing them.
+
+    A word-boundary match of a trigger implies each of its \\w+ tokens is a
+    whole token of the prompt, so only triggers whose longest token occurs in
+    the prompt are verified with their regex. Build once per item list and
+    reuse it across prompts.
+    """
+
+    def __init__(self, items: list[SkillOrAgent]):
+        self.items = items
+        # Per item: (trigger, compiled pattern) in trigger order, ADR-001 filters applied
+        self.triggers: list[list[tuple[str, re.Pattern]]] = []
+        # anchor token -> [(item index, trigger index)]
+        self.by_token: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        # Triggers without word characters can't be anchored and are always checked
+        self.unanchored: list[tuple[int, int]] = []
+
+        for item_idx, item in enumerate(items):
+            item_triggers = []
+            for trigger in item.triggers:
+                if not _is_matchable_trigger(trigger):
+                    continue
+                trigger_lower = trigger.lower()
+                ref = (item_idx, len(item_triggers))
+                item_triggers.append((trigger, _trigger_pattern(trigger_lower)))
+                tokens = _WORD_TOKEN_RE.findall(trigger_lower)
+                if tokens:
+                    self.by_token[max(tokens, key=len)].append(ref)
+                else:
+                    self.unanchored.append(ref)
+            self.triggers.append(item_triggers)
+
+    def candidates(self, prompt_lower: str) -> dict[int, list[int]]:
+        """Return {item index: sorted trigger indexes} that may match prompt_lower."""
+        found: dict[int, set[int]] = defaultdict(set)
+        for item_idx, trigger_idx in self.unanchored:
+            found[item_idx].add(trigger_idx)
+        for token in set(_WORD_TOKEN_RE.findall(prompt_lower)):
+            for item_idx, trigger_idx in self.by_token.get(token, ()):
+                found[item_idx].add(trigger_idx)
+        return {item_idx: sorted(found[item_idx]) for item_idx in sorted(found)}
+
+
+def find_matches(
+    prompt: str,
+    items: list[SkillOrAgent],
+    min_triggers: int = 2,
+    min_confidence: float = 0.80,
+    index: TriggerIndex | None = None,
+) -> list[MatchResult]:
+    """Find skills/agents that match a prompt based on triggers.
+
+    ADR-001 improvements:
+    - Unified threshold (>= 3 chars)
+    - 3-char triggers require UPPERCASE (e.g., TDD, API, DDD)
+    - Common words are blocked from matching
+
+    Pass a TriggerIndex built from the same items when matching many prompts.
+    """
+    if index is None:
+        index = TriggerIndex(items)
+
+    matches = []
+    prompt_lower = prompt.lower()
+
+    candidates = index.candidates(prompt_lower)
+    # With min_triggers <= 0 every item qualifies, matched or not
+    item_indexes = range(len(index.items)) if min_triggers <= 0 else candidates
+    regex_evaluations = 0
+
+    for item_idx in item_indexes:
+        item = index.items[item_idx]
+        item_triggers = index.triggers[item_idx]
+        matched_triggers = []
+        earliest_position = len(prompt_lower)
+        item_candidates = candidates.get(item_idx, ())
+        regex_evaluations += len(item_candidates)
+        for trigger_idx in item_candidates:
+            trigger, pattern = item_triggers[trigger_idx]
+            m = pattern.search(prompt_lower)
             if m:
                 matched_triggers.append(trigger)
                 earliest_position = min(earliest_position, m.start())
@@ -2258,9 +3837,59 @@ def find_matches(prompt: str, items: list[SkillOrAgent], min_triggers: int = 2,
             if confidence > min_confidence:
                 matches.append(MatchResult(skill=item, matched_triggers=matched_triggers, confidence=confidence))
 
+    _profiler.count("regex_evaluations", regex_evaluations)
     return matches
 
 
+class MatchMatrix:
+    """Trigger matches for every (session, prompt, item), computed once.
+
+    Stores find_matches results (min_triggers=2) before any confidence
+    threshold so analyze_jsonl, detect_missed_opportunities and
+    _classify_component can each apply their own cut-off without
+    re-matching the prompts.
+
+    With a deadline, matching stops once DEADLINE_MATCH_RESERVE of the budget
+    is left; .sessions lists the sessions that were matched.
+    """
+
+    def __init__(
+        self,
+        sessions: list[SessionData],
+        items: list[SkillOrAgent],
+        index: TriggerIndex | None = None,
+        deadline: Deadline | None = None,
+    ):
+        if index is None:
+            index = TriggerIndex(items)
+        self.sessions: list[SessionData] = []
+        # id(session) -> per prompt, matches in item order
+        self.by_prompt: dict[int, list[list[MatchResult]]] = {}
+        # id(item) -> id(session) -> [(prompt, match)] in prompt order
+        self.by_item: dict[int, dict[int, list[tuple[str, MatchResult]]]] = {id(item): {} for item in items}
+
+        for session in sessions:
+            if deadline is not None and deadline.expired(DEADLINE_MATCH_RESERVE):
+                break
+            self.sessions.append(session)
+            _profiler.count("prompts_matched", len(session.prompts))
+            rows = []
+            for prompt in session.prompts:
+                row = find_matches(prompt, items, min_confidence=float("-inf"), index=index)
+                rows.append(row)
+                for match in row:
+                    self.by_item[id(match.skill)].setdefault(id(session), []).append((prompt, match))
+            self.by_prompt[id(session)] = rows
+
+    def prompt_matches(self, session: SessionData, prompt_idx: int, min_confidence: float) -> list[MatchResult]:
+        """Matches for one prompt of session, as find_matches(prompt, items, min_confidence=...)."""
+        return [m for m in self.by_prompt[id(session)][prompt_idx] if m.confidence > min_confidence]
+
+    def item_matches(self, item: SkillOrAgent, session: SessionData, min_confidence: float) -> list[tuple[str, MatchResult]]:
+        """(prompt, match) pairs for item in session's prompts above min_confidence."""
+        return [(p, m) for p, m in self.by_item[id(item)].get(id(session), ()) if m.confidence > min_confidence]
+
+
 # Story 2.3: Impact scoring functions
 
 def calculate_frequency_score(occurrence_count: int) -> float:
@@ -2297,16 +3926,79 @@ def _was_component_invoked(item: SkillOrAgent, session: SessionData) -> bool:
     return bool(triggers_lower & used_lower) or bool(triggers_lower & used_suffixes)
 
 
+class InvocationIndex:
+    """Normalized invocation lookups for _was_component_invoked, built once per run.
+
+    Holds each session's lowercased used names and their plugin-qualified
+    suffixes, plus an inverted index from those names to sessions, so
+    checking an item against a session (or finding every session that
+    invoked it) needs no per-call set construction.
+    """
+
+    def __init__(self, sessions: list[SessionData]):
+        self.sessions = sessions
+        # used_field -> id(session) -> (used_lower, used_suffixes)
+        self.used: dict[str, dict[int, tuple[frozenset[str], frozenset[str]]]] = {}
+        # used_field -> normalized name or suffix -> session indexes
+        self.sessions_by_name: dict[str, dict[str, set[int]]] = {}
+        for used_field in ("skills_used", "agents_used"):
+            used = self.used[used_field] = {}
+            by_name = self.sessions_by_name[used_field] = defaultdict(set)
+            for i, session in enumerate(sessions):
+                used_lower = frozenset(s.lower().lstrip("/") for s in getattr(session, used_field))
+                used_suffixes = frozenset(s.split(":")[-1] for s in used_lower)
+                used[id(session)] = (used_lower, used_suffixes)
+                for name in used_lower | used_suffixes:
+                    by_name[name].add(i)
+        # id(item) -> (used_field, name_lower, triggers_lower)
+        self._items: dict[int, tuple[str, str, frozenset[str]]] = {}
+
+    def _item_keys(self, item: SkillOrAgent) -> tuple[str, str, frozenset[str]]:
+        keys = self._items.get(id(item))
+        if keys is None:
+            used_field = "skills_used" if item.type != "agent" else "agents_used"
+            triggers_lower = frozenset(t.lower().lstrip("/") for t in item.triggers)
+            keys = self._items[id(item)] = (used_field, item.name.lower(), triggers_lower)
+        return keys
+
+    def invoked(self, item: SkillOrAgent, session: SessionData) -> bool:
+        """Same result as _was_component_invoked(item, session)."""
+        used_field, name_lower, triggers_lower = self._item_keys(item)
+        used_lower, used_suffixes = self.used[used_field][id(session)]
+        if name_lower in used_lower:
+            return True
+        return not triggers_lower.isdisjoint(used_lower) or not triggers_lower.isdisjoint(used_suffixes)
+
+    def sessions_invoking(self, item: SkillOrAgent) -> list[SessionData]:
+        """Sessions in which item was invoked, in session order."""
+        used_field, name_lower, triggers_lower = self._item_keys(item)
+        by_name = self.sessions_by_name[used_field]
+        candidates: set[int] = set()
+        for name in (name_lower, *triggers_lower):
+            candidates |= by_name.get(name, set())
+        # by_name mixes full names and suffixes; the exact rule decides (the item name never matches a suffix)
+        return [self.sessions[i] for i in sorted(candidates) if self.invoked(item, self.sessions[i])]
+
+
 def detect_missed_opportunities(
     sessions: list[SessionData],
     skills: list[SkillOrAgent],
     analysis_period_days: int = DEFAULT_DAYS,
+    matrix: MatchMatrix | None = None,
+    invocations: InvocationIndex | None = None,
 ) -> list[dict]:
     """Story 2.3: Detect skills matched but not invoked, grouped by skill with impact scores.
 
     Returns list of dicts sorted by impact_score descending, each containing:
     skill_name, confidence, impact_score, occurrence_count, example_prompts, sessions_affected
+
+    Pass a MatchMatrix and InvocationIndex covering these sessions to reuse them.
     """
+    if matrix is None:
+        matrix = MatchMatrix(sessions, skills)
+    if invocations is None:
+        invocations = InvocationIndex(sessions)
+
     # Per-skill aggregation
     grouped: dict[str, dict] = {}
 
@@ -2317,16 +4009,13 @@ def detect_missed_opportunities(
             session_matched = False
             best_confidence = 0.0
             matched_prompt = ""
-            for prompt in session.prompts:
-                prompt_matches = find_matches(prompt, [skill])
-                if prompt_matches:
-                    session_matched = True
-                    for m in prompt_matches:
-                        if m.confidence > best_confidence:
-                            best_confidence = m.confidence
-                            matched_prompt = prompt
+            for prompt, m in matrix.item_matches(skill, session, min_confidence=0.80):
+                session_matched = True
+                if m.confidence > best_confidence:
+                    best_confidence = m.confidence
+                    matched_prompt = prompt
 
-            was_invoked = _was_component_invoked(skill, session)
+            was_invoked = invocations.invoked(skill, session)
 
             if session_matched and not was_invoked and best_confidence > CONFIDENCE_HIGH:
                 if skill.name not in grouped:
@@ -2377,7 +4066,13 @@ def detect_missed_opportunities(
     return result
 
 
-def _classify_component(item: SkillOrAgent, sessions: list[SessionData], used_field: str = "") -> str:
+def _classify_component(
+    item: SkillOrAgent,
+    sessions: list[SessionData],
+    used_field: str = "",
+    matrix: MatchMatrix | None = None,
+    invocations: InvocationIndex | None = None,
+) -> str:
     """Story 1.2 AC-1: Classify a skill or agent based on usage in sessions.
 
     Returns:
@@ -2388,33 +4083,53 @@ def _classify_component(item: SkillOrAgent, sessions: list[SessionData], used_fi
     if not sessions:
         return SkillClassification.UNUSED
 
-    if any(_was_component_invoked(item, s) for s in sessions):
+    if invocations is None:
+        invocations = InvocationIndex(sessions)
+    if invocations.sessions_invoking(item):
         return SkillClassification.ACTIVE
 
+    if matrix is None:
+        matrix = MatchMatrix(sessions, [item])
+
     for session in sessions:
-        for prompt in session.prompts:
-            matches = find_matches(prompt, [item], min_confidence=0.0)
-            if matches:
-                return SkillClassification.DORMANT
+        if matrix.item_matches(item, session, min_confidence=0.0):
+            return SkillClassification.DORMANT
 
     return SkillClassification.UNUSED
 
 
-def classify_skill(skill: SkillOrAgent, sessions: list[SessionData]) -> str:
-    return _classify_component(skill, sessions, "skills_used")
+def classify_skill(
+    skill: SkillOrAgent,
+    sessions: list[SessionData],
+    matrix: MatchMatrix | None = None,
+    invocations: InvocationIndex | None = None,
+) -> str:
+    return _classify_component(skill, sessions, "skills_used", matrix, invocations)
 
 
-def classify_agent(agent: SkillOrAgent, sessions: list[SessionData]) -> str:
-    return _classify_component(agent, sessions, "agents_used")
+def classify_agent(
+    agent: SkillOrAgent,
+    sessions: list[SessionData],
+    matrix: MatchMatrix | None = None,
+    invocations: InvocationIndex | None = None,
+) -> str:
+    return _classify_component(agent, sessions, "agents_used", matrix, invocations)
 
 
-def _get_component_usage_stats(item: SkillOrAgent, sessions: list[SessionData], used_field: str = "") -> tuple[int, list[str], str | None, str | None]:
+def _get_component_usage_stats(
+    item: SkillOrAgent,
+    sessions: list[SessionData],
+    used_field: str = "",
+    invocations: InvocationIndex | None = None,
+) -> tuple[int, list[str], str | None, str | None]:
     """Story 1.2 AC-2 & AC-4: Get usage count, sessions_used, and timestamps for a component.
 
     Returns:
         Tuple of (usage_count, list of session IDs, first_used ISO string or None, last_used ISO string or None)
     """
-    used_sessions = [s for s in sessions if _was_component_invoked(item, s)]
+    if invocations is None:
+        invocations = InvocationIndex(sessions)
+    used_sessions = invocations.sessions_invoking(item)
     sessions_used = [s.session_id for s in used_sessions]
 
     if not used_sessions:
@@ -2435,12 +4150,20 @@ def _get_component_usage_stats(item: SkillOrAgent, sessions: list[SessionData],
     )
 
 
-def get_skill_usage_stats(skill: SkillOrAgent, sessions: list[SessionData]) -> tuple[int, list[str], str | None, str | None]:
-    return _get_component_usage_stats(skill, sessions, "skills_used")
+def get_skill_usage_stats(
+    skill: SkillOrAgent,
+    sessions: list[SessionData],
+    invocations: InvocationIndex | None = None,
+) -> tuple[int, list[str], str | None, str | None]:
+    return _get_component_usage_stats(skill, sessions, "skills_used", invocations)
 
 
-def get_agent_usage_stats(agent: SkillOrAgent, sessions: list[SessionData]) -> tuple[int, list[str], str | None, str | None]:
-    return _get_component_usage_stats(agent, sessions, "agents_used")
+def get_agent_usage_stats(
+    agent: SkillOrAgent,
+    sessions: list[SessionData],
+    invocations: InvocationIndex | None = None,
+) -> tuple[int, list[str], str | None, str | None]:
+    return _get_component_usage_stats(agent, sessions, "agents_used", invocations)
 
 
 def compute_per_project_breakdown(sessions: list[SessionData]) -> dict:
@@ -2483,8 +4206,14 @@ def analyze_jsonl(
     agents: list[SkillOrAgent],
     commands: list[SkillOrAgent],
     sessions: list[SessionData],
+    matrix: MatchMatrix | None = None,
+    invocations: InvocationIndex | None = None,
 ) -> tuple[list[MissedOpportunity], dict]:
-    """Analyze sessions for missed opportunities."""
+    """Analyze sessions for missed opportunities.
+
+    Pass a MatchMatrix built over skills + agents + commands (and an
+    InvocationIndex over sessions) to reuse them.
+    """
     missed = []
     stats = {
         "total_sessions": len(sessions),
@@ -2503,6 +4232,10 @@ def analyze_jsonl(
     }
 
     all_items = skills + agents + commands
+    if matrix is None:
+        matrix = MatchMatrix(sessions, all_items)
+    if invocations is None:
+        invocations = InvocationIndex(sessions)
 
     for session in sessions:
         for skill in session.skills_used:
@@ -2510,12 +4243,12 @@ def analyze_jsonl(
         for agent in session.agents_used:
             stats["agents_used"][agent] += 1
 
-        for prompt in session.prompts:
-            matches = find_matches(prompt, all_items)
+        for prompt_idx, prompt in enumerate(session.prompts):
+            matches = matrix.prompt_matches(session, prompt_idx, min_confidence=0.80)
 
             for match in matches:
                 item, triggers = match.skill, match.matched_triggers
-                was_used = _was_component_invoked(item, session)
+                was_used = invocations.invoked(item, session)
                 if not was_used and item.type == "command":
                     was_used = f"/{item.name}" in prompt.lower()
 
@@ -2544,7 +4277,7 @@ def analyze_jsonl(
     return missed, stats
 
 
-def generate_analysis_json(
+def iter_analysis_sections(
     skills: list[SkillOrAgent],
     agents: list[SkillOrAgent],
     commands: list[SkillOrAgent],
@@ -2556,8 +4289,23 @@ def generate_analysis_json(
     missed: list[MissedOpportunity],  # ADR-046: Include for confidence data
     feedback: dict,  # ADR-048: User feedback
     cleanup_mode: bool = False,  # Story 3.4: Safe cleanup mode
-) -> dict:
-    """Generate rich JSON output for agent interpretation."""
+    matrix: MatchMatrix | None = None,  # Prompt matches shared with analyze_jsonl
+    invocations: InvocationIndex | None = None,  # Invocation lookups shared with analyze_jsonl
+    remote_version_cache: Path | None = None,  # On-disk cache for outdated plugin checks
+    offline: bool = False,  # Answer outdated plugin checks from the cache only
+    deadline: Deadline | None = None,  # --deadline budget; optional sections are skipped when it runs low
+) -> Iterator[tuple[str, object]]:
+    """Yield the top-level sections of the JSON analysis one at a time.
+
+    Each section is built only when requested, so write_analysis_json can
+    serialize and release it before the next one is computed. _schema comes
+    first; what is only known once the other sections are built (deadline
+    skips, and performance when main adds it) goes in a trailing _run section.
+    """
+    if matrix is None:
+        matrix = MatchMatrix(sessions, skills + agents + commands)
+    if invocations is None:
+        invocations = InvocationIndex(sessions)
 
     # Compute outcome stats
     total_outcomes = jsonl_stats["total_success"] + jsonl_stats["total_failure"] + jsonl_stats["total_interrupted"]
@@ -2570,40 +4318,59 @@ def generate_analysis_json(
     # ADR-026: Compute schema health metadata
     entries_total = sum(s.entries_total for s in sessions)
     entries_parsed = sum(s.entries_parsed for s in sessions)
+    entries_skipped = sum(s.entries_skipped for s in sessions)
     parsing_errors_count = sum(len(s.parsing_errors) for s in sessions)
-    parse_success_rate = entries_parsed / entries_total if entries_total > 0 else 1.0
+    # Skipped lines passed the brace check, so they count against the threshold as well-formed
+    parse_success_rate = (entries_parsed + entries_skipped) / entries_total if entries_total > 0 else 1.0
 
     # ADR-046: Compute confidence distribution for potential matches
     high_conf_count = sum(1 for m in missed if m.confidence >= CONFIDENCE_HIGH)
     med_conf_count = sum(1 for m in missed if CONFIDENCE_MEDIUM <= m.confidence < CONFIDENCE_HIGH)
     low_conf_count = sum(1 for m in missed if m.confidence < CONFIDENCE_MEDIUM)
 
-    # ADR-050: Assess data sufficiency
-    data_sufficiency = assess_data_sufficiency(sessions, missed)
-
-    # ADR-053: Compute quality metrics
-    quality_metrics = compute_quality_metrics(sessions, missed, feedback)
-
-    # ADR-054: Pre-compute deterministic findings
-    settings_path = CLAUDE_DIR / "settings.json"
-    pre_computed = compute_pre_computed_findings(
-        skills, agents, commands, sessions, missed, setup_profile,
-        cleanup_mode, jsonl_stats,
-        plugins_cache=PLUGINS_CACHE, settings_path=settings_path,
-    )
-
-    # Story 2.3: Detect missed opportunities grouped by skill with impact scores
-    missed_opportunities = detect_missed_opportunities(sessions, skills + agents)
+    schema = {
+        "description": "Claude Code usage analysis data for agent interpretation",
+        "version": "3.16",  # jsonl_parse_stats.entries_skipped
+        "cleanup_mode": cleanup_mode,  # Story 3.4: Whether cleanup suggestions are enabled
+        "collection_timestamp": datetime.now().isoformat(),  # Story 1.2 AC-5
+        "sections": {
+            "discovery": "All available skills, agents, commands, and hooks discovered from global, project, and plugin sources",
+            "sessions": "Parsed session data showing what was actually used",
+            "stats": "Aggregated statistics on usage, outcomes, interruptions with followup context, and missed opportunities",
+            "per_project": "Story 1.2: Per-project breakdown with sessions and skill/agent usage",
+            "data_sufficiency": "ADR-050: Statistical sufficiency assessment for pattern detection",
+            "quality_metrics": "ADR-053: Analysis quality metrics for self-evaluation",
+            "pre_computed_findings": "ADR-054: Deterministic findings (100% certain, no LLM needed)",
+            "missed_opportunities": "Story 2.3: Missed opportunities grouped by skill with impact scores",
+            "potential_matches_detailed": "ADR-046: Detailed potential matches with confidence scores and evidence",
+            "feedback": "ADR-048: User feedback on previous recommendations (accepted/dismissed)",
+            "claude_md": "Content and structure of CLAUDE.md configuration files",
+            "setup_profile": "Computed setup profile with complexity, shape, red flags, and coverage gaps",
+        },
+        # ADR-026: Schema health metadata
+        "jsonl_parse_stats": {
+            "entries_total": entries_total,
+            "entries_parsed": entries_parsed,
+            "entries_skipped": entries_skipped,
+            "parsing_errors_count": parsing_errors_count,
+            "parse_success_rate": round(parse_success_rate, 3),
+            "min_threshold": MIN_PARSE_SUCCESS_RATE,
+            "healthy": parse_success_rate >= MIN_PARSE_SUCCESS_RATE,
+        },
+    }
+    if deadline is not None and deadline.seconds is not None:
+        schema["sections"]["_run"] = RUN_SECTION_DESCRIPTION
+    yield "_schema", schema
 
     # Story 1.2 AC-2 & AC-4: Build skill/agent discovery with usage stats and timestamps
     def build_skill_discovery(s: SkillOrAgent) -> dict:
-        usage_count, sessions_used, first_used, last_used = get_skill_usage_stats(s, sessions)
+        usage_count, sessions_used, first_used, last_used = get_skill_usage_stats(s, sessions, invocations)
         return {
             "name": s.name,
             "description": s.description,
             "triggers": s.triggers,
             "source": s.source_type,
-            "classification": classify_skill(s, sessions),
+            "classification": classify_skill(s, sessions, matrix, invocations),
             "usage_count": usage_count,
             "sessions_used": sessions_used,
             "first_used": first_used,
@@ -2611,225 +4378,283 @@ def generate_analysis_json(
         }
 
     def build_agent_discovery(a: SkillOrAgent) -> dict:
-        usage_count, sessions_used, first_used, last_used = get_agent_usage_stats(a, sessions)
+        usage_count, sessions_used, first_used, last_used = get_agent_usage_stats(a, sessions, invocations)
         return {
             "name": a.name,
             "description": a.description,
             "triggers": a.triggers,
             "source": a.source_type,
-            "classification": classify_agent(a, sessions),
+            "classification": classify_agent(a, sessions, matrix, invocations),
             "usage_count": usage_count,
             "sessions_used": sessions_used,
             "first_used": first_used,
             "last_used": last_used,
         }
 
-    return {
-        "_schema": {
-            "description": "Claude Code usage analysis data for agent interpretation",
-            "version": "3.14",  # Story 4.4: Walk-through integration + rendered dicts
-            "cleanup_mode": cleanup_mode,  # Story 3.4: Whether cleanup suggestions are enabled
-            "collection_timestamp": datetime.now().isoformat(),  # Story 1.2 AC-5
-            "sections": {
-                "discovery": "All available skills, agents, commands, and hooks discovered from global, project, and plugin sources",
-                "sessions": "Parsed session data showing what was actually used",
-                "stats": "Aggregated statistics on usage, outcomes, interruptions with followup context, and missed opportunities",
-                "per_project": "Story 1.2: Per-project breakdown with sessions and skill/agent usage",
-                "data_sufficiency": "ADR-050: Statistical sufficiency assessment for pattern detection",
-                "quality_metrics": "ADR-053: Analysis quality metrics for self-evaluation",
-                "pre_computed_findings": "ADR-054: Deterministic findings (100% certain, no LLM needed)",
-                "missed_opportunities": "Story 2.3: Missed opportunities grouped by skill with impact scores",
-                "potential_matches_detailed": "ADR-046: Detailed potential matches with confidence scores and evidence",
-                "feedback": "ADR-048: User feedback on previous recommendations (accepted/dismissed)",
-                "claude_md": "Content and structure of CLAUDE.md configuration files",
-                "setup_profile": "Computed setup profile with complexity, shape, red flags, and coverage gaps",
-            },
-            # ADR-026: Schema health metadata
-            "jsonl_parse_stats": {
-                "entries_total": entries_total,
-                "entries_parsed": entries_parsed,
-                "parsing_errors_count": parsing_errors_count,
-                "parse_success_rate": round(parse_success_rate, 3),
-                "min_threshold": MIN_PARSE_SUCCESS_RATE,
-                "healthy": parse_success_rate >= MIN_PARSE_SUCCESS_RATE,
-            },
+    yield "discovery", {
+        "skills": [build_skill_discovery(s) for s in skills],
+        "agents": [build_agent_discovery(a) for a in agents],
+        "commands": [
+            {
+                "name": c.name,
+                "description": c.description,
+                "triggers": c.triggers,
+                "source": c.source_type,
+            }
+            for c in commands
+        ],
+        "hooks": [
+            {
+                "event_type": h.event_type,
+                "matcher": h.matcher,
+                "command": h.command[:MAX_TOOL_INPUT_LENGTH],
+                "source": h.source_type,
+            }
+            for h in hooks
+        ],
+        "totals": {
+            "skills": len(skills),
+            "agents": len(agents),
+            "commands": len(commands),
+            "hooks": len(hooks),
         },
+    }
 
-        "discovery": {
-            "skills": [build_skill_discovery(s) for s in skills],
-            "agents": [build_agent_discovery(a) for a in agents],
-            "commands": [
-                {
-                    "name": c.name,
-                    "description": c.description,
-                    "triggers": c.triggers,
-                    "source": c.source_type,
-                }
-                for c in commands
-            ],
-            "hooks": [
-                {
-                    "event_type": h.event_type,
-                    "matcher": h.matcher,
-                    "command": h.command[:MAX_TOOL_INPUT_LENGTH],
-                    "source": h.source_type,
-                }
-                for h in hooks
-            ],
-            "totals": {
-                "skills": len(skills),
-                "agents": len(agents),
-                "commands": len(commands),
-                "hooks": len(hooks),
-            },
-        },
+    yield "sessions", {
+        "count": len(sessions),
+        # ADR-047: Include temporal data per session
+        "temporal": [
+            {
+                "session_id": s.session_id,
+                "date": s.session_date.isoformat() if s.session_date else None,
+                "age_days": (datetime.now() - s.session_date).days if s.session_date else None,
+                "recency_weight": round(s.recency_weight, 2),
+            }
+            for s in sessions
+        ],
+        "prompts": [
+            {
+                "session_id": s.session_id,
+                "text": p[:MAX_PROMPT_LENGTH],
+            }
+            for s in sessions
+            for p in s.prompts[:5]
+        ][:50],
+    }
 
-        "sessions": {
-            "count": len(sessions),
-            # ADR-047: Include temporal data per session
-            "temporal": [
-                {
-                    "session_id": s.session_id,
-                    "date": s.session_date.isoformat() if s.session_date else None,
-                    "age_days": (datetime.now() - s.session_date).days if s.session_date else None,
-                    "recency_weight": round(s.recency_weight, 2),
-                }
-                for s in sessions
-            ],
-            "prompts": [
-                {
-                    "session_id": s.session_id,
-                    "text": p[:MAX_PROMPT_LENGTH],
-                }
-                for s in sessions
-                for p in s.prompts[:5]
-            ][:50],
+    yield "stats", {
+        "total_sessions": jsonl_stats["total_sessions"],
+        "total_prompts": jsonl_stats["total_prompts"],
+        "skills_used": dict(jsonl_stats["skills_used"]),
+        "agents_used": dict(jsonl_stats["agents_used"]),
+        "commands_used": dict(jsonl_stats.get("commands_used", {})),
+        "potential_matches": {
+            "skills": dict(jsonl_stats["missed_skills"]),
+            "agents": dict(jsonl_stats["missed_agents"]),
+            "commands": dict(jsonl_stats.get("missed_commands", {})),
         },
-
-        "stats": {
-            "total_sessions": jsonl_stats["total_sessions"],
-            "total_prompts": jsonl_stats["total_prompts"],
-            "skills_used": dict(jsonl_stats["skills_used"]),
-            "agents_used": dict(jsonl_stats["agents_used"]),
-            "commands_used": dict(jsonl_stats.get("commands_used", {})),
-            "potential_matches": {
-                "skills": dict(jsonl_stats["missed_skills"]),
-                "agents": dict(jsonl_stats["missed_agents"]),
-                "commands": dict(jsonl_stats.get("missed_commands", {})),
-            },
-            "outcomes": {
-                "success": jsonl_stats["total_success"],
-                "failure": jsonl_stats["total_failure"],
-                "interrupted": jsonl_stats["total_interrupted"],
-                "success_rate": round(success_rate, 1),
-            },
-            "compactions": {
-                "total": jsonl_stats["total_compactions"],
-                "avg_tools_per": round(avg_tools_per_compaction, 1),
-            },
-            "interruptions": [
-                {
-                    "tool": it.tool_name,
-                    "context": _summarize_tool_input(it.tool_name, it.tool_input),
-                    "followup": it.followup_message,
-                }
-                for s in sessions
-                for it in s.interrupted_tools
-            ][:20],  # Limit to 20 most recent
+        "outcomes": {
+            "success": jsonl_stats["total_success"],
+            "failure": jsonl_stats["total_failure"],
+            "interrupted": jsonl_stats["total_interrupted"],
+            "success_rate": round(success_rate, 1),
         },
-
-        # Story 1.2 AC-3: Per-project breakdown
-        "per_project": compute_per_project_breakdown(sessions),
-
-        # ADR-050: Statistical significance assessment
-        "data_sufficiency": data_sufficiency,
-
-        # ADR-053: Analysis quality metrics
-        "quality_metrics": quality_metrics,
-
-        # ADR-054: Pre-computed deterministic findings
-        "pre_computed_findings": pre_computed,
-
-        # Story 2.3: Missed opportunities grouped by skill with impact scores
-        "missed_opportunities": missed_opportunities,
-
-        # ADR-046 + ADR-047 + ADR-049: Detailed potential matches with limits
-        "potential_matches_detailed": {
-            "summary": {
-                "total": len(missed),
-                "high_confidence": high_conf_count,
-                "medium_confidence": med_conf_count,
-                "low_confidence": low_conf_count,
-                # ADR-047: Recency-weighted summary
-                "recent_matches": sum(1 for m in missed if m.recency_weight >= 0.5),
-                "stale_matches": sum(1 for m in missed if m.recency_weight < 0.5),
-            },
-            # ADR-049: Alert fatigue limits
-            "limits": {
-                "max_per_category": MAX_FINDINGS_PER_CATEGORY,
-                "max_total": MAX_TOTAL_FINDINGS,
-                "showing": min(len(missed), MAX_FINDINGS_DETAILED),
-                "hidden": max(0, len(missed) - MAX_FINDINGS_DETAILED),
-            },
-            # ADR-049: Findings by type (limited per category)
-            "by_type": {
-                "skill": sum(1 for m in missed if m.matched_item.type == "skill"),
-                "agent": sum(1 for m in missed if m.matched_item.type == "agent"),
-                "command": sum(1 for m in missed if m.matched_item.type == "command"),
-            },
-            # Sort by combined score (confidence * recency), limit to MAX_FINDINGS_DETAILED
-            "matches": [
-                {
-                    "component": m.matched_item.name,
-                    "type": m.matched_item.type,
-                    "source": m.matched_item.source_type,
-                    "prompt_preview": m.prompt[:100],
-                    "session_id": m.session_id,
-                    "confidence": round(m.confidence, 2),
-                    "evidence": m.evidence,
-                    "matched_triggers": m.matched_triggers,
-                    # ADR-047: Recency data
-                    "recency_weight": round(m.recency_weight, 2),
-                    "age_days": (datetime.now() - m.session_date).days if m.session_date else None,
-                    "priority_score": round(m.confidence * m.recency_weight, 2),  # Combined score
-                    # Story 2.3: Impact score
-                    "impact_score": round(calculate_impact_score(
-                        m.confidence,
-                        calculate_frequency_score(sum(1 for x in missed if x.matched_item.name == m.matched_item.name)),
-                        m.recency_weight,
-                    ), 4),
-                    # ADR-048: Finding hash for feedback tracking
-                    "finding_hash": m.finding_hash,
-                }
-                for m in sorted(missed, key=lambda x: -(x.confidence * x.recency_weight))[:MAX_FINDINGS_DETAILED]
-            ],
+        "compactions": {
+            "total": jsonl_stats["total_compactions"],
+            "avg_tools_per": round(avg_tools_per_compaction, 1),
         },
+        "interruptions": [
+            {
+                "tool": it.tool_name,
+                "context": _summarize_tool_input(it.tool_name, it.tool_input),
+                "followup": it.followup_message,
+            }
+            for s in sessions
+            for it in s.interrupted_tools
+        ][:20],  # Limit to 20 most recent
+    }
 
-        # ADR-048: User feedback data
-        "feedback": {
-            "has_feedback": bool(feedback.get("dismissed") or feedback.get("accepted")),
-            "acceptance_rates": compute_acceptance_rate(feedback),
-            "dismissed_count": len(feedback.get("dismissed", [])),
-            "accepted_count": len(feedback.get("accepted", [])),
-            "dismissed_hashes": list(get_dismissed_hashes(feedback)),
-        },
+    # Story 1.2 AC-3: Per-project breakdown
+    yield "per_project", compute_per_project_breakdown(sessions)
 
-        "claude_md": claude_md,
-
-        "setup_profile": {
-            "complexity": setup_profile.complexity,
-            "total_components": setup_profile.total_components,
-            "shape": setup_profile.shape,
-            "by_source": setup_profile.by_source,
-            "red_flags": setup_profile.red_flags,
-            "coverage": setup_profile.coverage,
-            "coverage_gaps": setup_profile.coverage_gaps,
-            "overlapping_triggers": setup_profile.overlapping_triggers,
-            "plugin_usage": setup_profile.plugin_usage,
-            "description_quality": setup_profile.description_quality,  # ADR-007
+    # ADR-050: Statistical significance assessment
+    yield "data_sufficiency", assess_data_sufficiency(sessions, missed)
+
+    # ADR-053: Analysis quality metrics
+    yield "quality_metrics", compute_quality_metrics(sessions, missed, feedback)
+
+    # ADR-054: Pre-computed deterministic findings
+    settings_path = CLAUDE_DIR / "settings.json"
+    pre_computed = compute_pre_computed_findings(
+        skills, agents, commands, sessions, missed, setup_profile,
+        cleanup_mode, jsonl_stats,
+        plugins_cache=PLUGINS_CACHE, settings_path=settings_path,
+        remote_version_cache=remote_version_cache, offline=offline, deadline=deadline,
+    )
+    yield "pre_computed_findings", pre_computed
+
+    # Story 2.3: Missed opportunities grouped by skill with impact scores
+    if deadline is not None and deadline.expired(DEADLINE_OPTIONAL_RESERVE):
+        missed_opportunities = []
+        deadline.skip("output", "missed opportunity scoring")
+    else:
+        missed_opportunities = detect_missed_opportunities(sessions, skills + agents, matrix=matrix, invocations=invocations)
+    yield "missed_opportunities", missed_opportunities
+
+    # ADR-046 + ADR-047 + ADR-049: Detailed potential matches with limits
+    yield "potential_matches_detailed", {
+        "summary": {
+            "total": len(missed),
+            "high_confidence": high_conf_count,
+            "medium_confidence": med_conf_count,
+            "low_confidence": low_conf_count,
+            # ADR-047: Recency-weighted summary
+            "recent_matches": sum(1 for m in missed if m.recency_weight >= 0.5),
+            "stale_matches": sum(1 for m in missed if m.recency_weight < 0.5),
+        },
+        # ADR-049: Alert fatigue limits
+        "limits": {
+            "max_per_category": MAX_FINDINGS_PER_CATEGORY,
+            "max_total": MAX_TOTAL_FINDINGS,
+            "showing": min(len(missed), MAX_FINDINGS_DETAILED),
+            "hidden": max(0, len(missed) - MAX_FINDINGS_DETAILED),
         },
+        # ADR-049: Findings by type (limited per category)
+        "by_type": {
+            "skill": sum(1 for m in missed if m.matched_item.type == "skill"),
+            "agent": sum(1 for m in missed if m.matched_item.type == "agent"),
+            "command": sum(1 for m in missed if m.matched_item.type == "command"),
+        },
+        # Sort by combined score (confidence * recency), limit to MAX_FINDINGS_DETAILED
+        "matches": [
+            {
+                "component": m.matched_item.name,
+                "type": m.matched_item.type,
+                "source": m.matched_item.source_type,
+                "prompt_preview": m.prompt[:100],
+                "session_id": m.session_id,
+                "confidence": round(m.confidence, 2),
+                "evidence": m.evidence,
+                "matched_triggers": m.matched_triggers,
+                # ADR-047: Recency data
+                "recency_weight": round(m.recency_weight, 2),
+                "age_days": (datetime.now() - m.session_date).days if m.session_date else None,
+                "priority_score": round(m.confidence * m.recency_weight, 2),  # Combined score
+                # Story 2.3: Impact score
+                "impact_score": round(calculate_impact_score(
+                    m.confidence,
+                    calculate_frequency_score(sum(1 for x in missed if x.matched_item.name == m.matched_item.name)),
+                    m.recency_weight,
+                ), 4),
+                # ADR-048: Finding hash for feedback tracking
+                "finding_hash": m.finding_hash,
+            }
+            for m in sorted(missed, key=lambda x: -(x.confidence * x.recency_weight))[:MAX_FINDINGS_DETAILED]
+        ],
     }
 
+    # ADR-048: User feedback data
+    yield "feedback", {
+        "has_feedback": bool(feedback.get("dismissed") or feedback.get("accepted")),
+        "acceptance_rates": compute_acceptance_rate(feedback),
+        "dismissed_count": len(feedback.get("dismissed", [])),
+        "accepted_count": len(feedback.get("accepted", [])),
+        "dismissed_hashes": list(get_dismissed_hashes(feedback)),
+    }
+
+    yield "claude_md", claude_md
+
+    yield "setup_profile", {
+        "complexity": setup_profile.complexity,
+        "total_components": setup_profile.total_components,
+        "shape": setup_profile.shape,
+        "by_source": setup_profile.by_source,
+        "red_flags": setup_profile.red_flags,
+        "coverage": setup_profile.coverage,
+        "coverage_gaps": setup_profile.coverage_gaps,
+        "overlapping_triggers": setup_profile.overlapping_triggers,
+        "plugin_usage": setup_profile.plugin_usage,
+        "description_quality": setup_profile.description_quality,  # ADR-007
+    }
+
+    if deadline is not None and deadline.seconds is not None:
+        yield "_run", {"deadline": deadline.to_dict()}
+
+
+def generate_analysis_json(
+    skills: list[SkillOrAgent],
+    agents: list[SkillOrAgent],
+    commands: list[SkillOrAgent],
+    hooks: list[Hook],
+    sessions: list[SessionData],
+    jsonl_stats: dict,
+    claude_md: dict,
+    setup_profile: SetupProfile,
+    missed: list[MissedOpportunity],  # ADR-046: Include for confidence data
+    feedback: dict,  # ADR-048: User feedback
+    cleanup_mode: bool = False,  # Story 3.4: Safe cleanup mode
+    matrix: MatchMatrix | None = None,  # Prompt matches shared with analyze_jsonl
+    invocations: InvocationIndex | None = None,  # Invocation lookups shared with analyze_jsonl
+    remote_version_cache: Path | None = None,  # On-disk cache for outdated plugin checks
+    offline: bool = False,  # Answer outdated plugin checks from the cache only
+    deadline: Deadline | None = None,  # --deadline budget; optional sections are skipped when it runs low
+) -> dict:
+    """Generate rich JSON output for agent interpretation.
+
+    The sections of iter_analysis_sections, built all at once as one dict.
+    """
+    return dict(iter_analysis_sections(
+        skills, agents, commands, hooks, sessions, jsonl_stats, claude_md, setup_profile, missed, feedback,
+        cleanup_mode=cleanup_mode, matrix=matrix, invocations=invocations,
+        remote_version_cache=remote_version_cache, offline=offline, deadline=deadline,
+    ))
+
+
+def write_analysis_json(sections: Iterable[tuple[str, object]], stream: TextIO, compact: bool = False) -> None:
+    """Serialize (key, value) sections into one JSON object as they arrive.
+
+    Each section is encoded in chunks straight to `stream` and flushed, so
+    only the section being written is held in memory and readers can start
+    on the early sections. The default layout matches json.dumps(indent=2);
+    compact drops all whitespace.
+    """
+    if compact:
+        encoder = json.JSONEncoder(separators=(",", ":"))
+        open_brace, separator, close_brace, key_separator = "{", ",", "}", ":"
+    else:
+        encoder = json.JSONEncoder(indent=JSON_INDENT)
+        pad = " " * JSON_INDENT
+        open_brace, separator, close_brace, key_separator = "{\n" + pad, ",\n" + pad, "\n}", ": "
+    empty = True
+    for key, value in sections:
+        stream.write((open_brace if empty else separator) + json.dumps(key) + key_separator)
+        for chunk in encoder.iterencode(value):
+            # Strings never contain raw newlines, so this only re-indents structure
+            stream.write(chunk if compact else chunk.replace("\n", "\n" + pad))
+        stream.flush()
+        empty = False
+    stream.write(("{}" if empty else close_brace) + "\n")
+    stream.flush()
+
+
+def _profiled_sections(sections: Iterable[tuple[str, object]]) -> Iterator[tuple[str, object]]:
+    """Time building and writing the sections as the output phase.
+
+    The run's profile, along with the JSON backend that decoded the
+    transcripts, is added to the trailing _run section as _run.performance.
+    """
+    run = {}
+    with _profiler.phase("output"):
+        for key, value in sections:
+            if key == "_schema":
+                value["sections"]["_run"] = RUN_SECTION_DESCRIPTION
+            elif key == "_run":
+                run = value
+                break
+            yield key, value
+    run["performance"] = {**_profiler.to_dict(), "json_backend": _json_backend}
+    yield "_run", run
+
 
 # =============================================================================
 # Output Formatters
@@ -2938,10 +4763,92 @@ def print_dashboard(jsonl_stats: dict):
 # Quick Stats (uses session summaries)
 # =============================================================================
 
-def analyze_session_summaries(summary_dir: Path, days: int = 14) -> dict:
-    """Analyze session summaries for quick stats."""
-    cutoff = datetime.now() - timedelta(days=days)
-    stats = {
+def connect_summary_index(path: Path) -> sqlite3.Connection:
+    """Open the SQLite index of session summaries, (re)creating its tables if needed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SUMMARY_INDEX_VERSION:
+        conn.executescript(f"""
+            DROP TABLE IF EXISTS summaries;
+            DROP TABLE IF EXISTS summary_tools;
+            DROP TABLE IF EXISTS summary_stages;
+            DROP TABLE IF EXISTS meta;
+            CREATE TABLE summaries (
+                summary_file TEXT PRIMARY KEY,
+                date TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                project TEXT NOT NULL,
+                session_type TEXT NOT NULL,
+                total_tools INTEGER NOT NULL,
+                success INTEGER NOT NULL,
+                failure INTEGER NOT NULL,
+                compactions INTEGER NOT NULL
+            );
+            -- Covering indexes: quick stats read only the index entries of the requested days
+            CREATE INDEX summaries_by_date ON summaries
+                (date, project, session_type, total_tools, success, failure, compactions);
+            CREATE TABLE summary_tools (summary_file TEXT NOT NULL, date TEXT NOT NULL, tool TEXT NOT NULL, count INTEGER NOT NULL);
+            CREATE INDEX summary_tools_by_file ON summary_tools (summary_file);
+            CREATE INDEX summary_tools_by_date ON summary_tools (date, tool, count);
+            CREATE TABLE summary_stages (summary_file TEXT NOT NULL, date TEXT NOT NULL, stage TEXT NOT NULL);
+            CREATE INDEX summary_stages_by_file ON summary_stages (summary_file);
+            CREATE INDEX summary_stages_by_date ON summary_stages (date, stage);
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            PRAGMA user_version = {SUMMARY_INDEX_VERSION};
+        """)
+    return conn
+
+
+def index_summary(conn: sqlite3.Connection, summary_file: str, summary: dict) -> None:
+    """Insert or replace one summary, keyed by its file name (date prefix included)."""
+    outcomes = summary.get("outcomes", {})
+    conn.execute("DELETE FROM summary_tools WHERE summary_file = ?", (summary_file,))
+    conn.execute("DELETE FROM summary_stages WHERE summary_file = ?", (summary_file,))
+    conn.execute(
+        "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            summary_file, summary_file[:10], summary.get("session_id", ""),
+            summary.get("project", "unknown"), summary.get("session_type", "UNKNOWN"),
+            summary.get("total_tools", 0), outcomes.get("success", 0), outcomes.get("failure", 0),
+            summary.get("compactions", 0),
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO summary_tools VALUES (?, ?, ?, ?)",
+        [(summary_file, summary_file[:10], tool, count) for tool, count in summary.get("tool_breakdown", {}).items()],
+    )
+    conn.executemany(
+        "INSERT INTO summary_stages VALUES (?, ?, ?)",
+        [(summary_file, summary_file[:10], stage) for stage in summary.get("stages_visited", [])],
+    )
+
+
+def rebuild_summary_index(summary_dir: Path, index_file: Path) -> int:
+    """Re-index every summary JSON file in summary_dir; returns how many were indexed."""
+    conn = connect_summary_index(index_file)
+    try:
+        with conn:
+            # Taken before the scan: a summary written meanwhile triggers another rebuild
+            dir_mtime_ns = summary_dir.stat().st_mtime_ns if summary_dir.exists() else 0
+            for table in ("summaries", "summary_tools", "summary_stages", "meta"):
+                conn.execute(f"DELETE FROM {table}")
+            indexed = 0
+            for summary_file in summary_dir.glob("*.json") if summary_dir.exists() else []:
+                try:
+                    datetime.strptime(summary_file.name[:10], "%Y-%m-%d")
+                    summary = json.loads(summary_file.read_text())
+                except (OSError, json.JSONDecodeError, ValueError):
+                    continue
+                index_summary(conn, summary_file.name, summary)
+                indexed += 1
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", [("complete", "1"), ("dir_mtime_ns", str(dir_mtime_ns))])
+        return indexed
+    finally:
+        conn.close()
+
+
+def _new_quick_stats() -> dict:
+    return {
         "sessions": 0,
         "total_tools": 0,
         "total_success": 0,
@@ -2953,6 +4860,23 @@ def analyze_session_summaries(summary_dir: Path, days: int = 14) -> dict:
         "by_project": defaultdict(lambda: {"sessions": 0, "success": 0, "failure": 0}),
     }
 
+
+def analyze_session_summaries(summary_dir: Path, days: int = 14, index_file: Path | None = None) -> dict:
+    """Analyze session summaries for quick stats.
+
+    With index_file, the numbers are SQL aggregates over the summary index
+    the session-summary hook keeps up to date. The index is rebuilt from the
+    JSON files when it is new or the summary directory changed behind its
+    back, and the JSON files are scanned directly if it cannot be used.
+    """
+    cutoff = datetime.now() - timedelta(days=days)
+    if index_file is not None:
+        try:
+            return _summary_index_stats(summary_dir, index_file, cutoff)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: Summary index {index_file} unavailable ({e}), reading summary files", file=sys.stderr)
+
+    stats = _new_quick_stats()
     if not summary_dir.exists():
         return stats
 
@@ -2991,6 +4915,47 @@ def analyze_session_summaries(summary_dir: Path, days: int = 14) -> dict:
     return stats
 
 
+def _summary_index_stats(summary_dir: Path, index_file: Path, cutoff: datetime) -> dict:
+    conn = connect_summary_index(index_file)
+    try:
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+        dir_mtime_ns = str(summary_dir.stat().st_mtime_ns) if summary_dir.exists() else "0"
+        if meta.get("complete") != "1" or meta.get("dir_mtime_ns") != dir_mtime_ns:
+            print(f"Indexing session summaries into {index_file}...", file=sys.stderr)
+            rebuild_summary_index(summary_dir, index_file)
+
+        # Summary dates are midnights: a day counts if its midnight is not before the cutoff
+        first_day = cutoff.date() if cutoff.time() == datetime.min.time() else cutoff.date() + timedelta(days=1)
+        since = (first_day.isoformat(),)
+        stats = _new_quick_stats()
+        row = conn.execute(
+            "SELECT COUNT(*), TOTAL(total_tools), TOTAL(success), TOTAL(failure), TOTAL(compactions)"
+            " FROM summaries WHERE date >= ?", since,
+        ).fetchone()
+        stats["sessions"] = row[0]
+        stats["total_tools"], stats["total_success"], stats["total_failure"], stats["total_compactions"] = map(int, row[1:])
+        for tool, count in conn.execute(
+            "SELECT tool, SUM(count) FROM summary_tools WHERE date >= ? GROUP BY tool ORDER BY tool", since,
+        ):
+            stats["tool_breakdown"][tool] = count
+        for stage, count in conn.execute(
+            "SELECT stage, COUNT(*) FROM summary_stages WHERE date >= ? GROUP BY stage ORDER BY stage", since,
+        ):
+            stats["stages_seen"][stage] = count
+        for session_type, count in conn.execute(
+            "SELECT session_type, COUNT(*) FROM summaries WHERE date >= ? GROUP BY session_type ORDER BY session_type", since,
+        ):
+            stats["session_types"][session_type] = count
+        for project, sessions, success, failure in conn.execute(
+            "SELECT project, COUNT(*), SUM(success), SUM(failure) FROM summaries"
+            " WHERE date >= ? GROUP BY project ORDER BY project", since,
+        ):
+            stats["by_project"][project] = {"sessions": sessions, "success": success, "failure": failure}
+        return stats
+    finally:
+        conn.close()
+
+
 def print_quick_stats(stats: dict, days: int):
     """Print quick stats from session summaries."""
     print("\n" + "=" * 80)
@@ -3041,23 +5006,91 @@ def print_quick_stats(stats: dict, days: int):
 # Main
 # =============================================================================
 
+def _parse_date_arg(value: str) -> datetime:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}' (expected YYYY-MM-DD)")
+
+
 def main():
     _yaml_parse_issues.clear()  # Reset for fresh run
+    _profiler.reset()
     parser = argparse.ArgumentParser(description="Collect Claude Code usage data for analysis")
-    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS, help=f"Sessions to analyze (default: {DEFAULT_SESSIONS})")
+    parser.add_argument("--sessions", type=int, help=f"Newest sessions to analyze (default: {DEFAULT_SESSIONS}, or all in the --since/--until window)")
+    parser.add_argument("--since", type=_parse_date_arg, metavar="YYYY-MM-DD", help="Only sessions modified on or after this date")
+    parser.add_argument("--until", type=_parse_date_arg, metavar="YYYY-MM-DD", help="Only sessions modified on or before this date")
     parser.add_argument("--format", choices=["table", "dashboard", "json"], default="table")
     parser.add_argument("--verbose", action="store_true", help="Show examples")
-    parser.add_argument("--project", help="Project path (default: current directory)")
-    parser.add_argument("--quick-stats", action="store_true", help="Show quick stats from session summaries")
+    parser.add_argument("--compact", action="store_true", help="JSON without indentation or spaces")
+    parser.add_argument("--output", metavar="PATH", help="Write JSON output to PATH instead of stdout")
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument("--project", help="Project path (default: current directory)")
+    scope.add_argument("--all-projects", action="store_true", help=f"Analyze sessions of every project in {PROJECTS_DIR} (--sessions applies per project)")
+    parser.add_argument("--quick-stats", action="store_true", help="Show quick stats from session summaries (or the session store with --from-store)")
+    parser.add_argument("--rebuild-summary-index", action="store_true", help=f"Re-index every session summary into {SUMMARY_INDEX_FILE}")
     parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help=f"Days to include in quick stats (default: {DEFAULT_DAYS})")
     parser.add_argument("--cleanup", action="store_true", help="Enable safe cleanup mode for deletion suggestions")
+    parser.add_argument("--jobs", type=int, help="Parallel session parsing workers (default: 1, or one per CPU with --all-projects; 0 = one per CPU)")
+    parser.add_argument("--no-cache", action="store_true", help=f"Re-parse every session and component file instead of using the caches in {CACHE_DIR}")
+    parser.add_argument("--offline", action="store_true", help="Check plugin versions against the local cache only, without contacting GitHub")
+    parser.add_argument("--profile", action="store_true", help="Print phase timings and work counters to stderr")
+    parser.add_argument(
+        "--json-backend", choices=["auto", *JSON_BACKENDS], default=os.environ.get(JSON_BACKEND_ENV, "auto"),
+        help=f"Transcript JSON decoder (default: ${JSON_BACKEND_ENV} or auto, the fastest installed)",
+    )
+    history = parser.add_mutually_exclusive_group()
+    history.add_argument("--store", action="store_true", help=f"Also record parsed sessions in the SQLite session store {SESSION_STORE_FILE}")
+    history.add_argument("--from-store", action="store_true", help="Analyze sessions from the session store instead of parsing transcripts")
+    parser.add_argument("--deadline", type=float, metavar="SECONDS", help="Wall-clock budget; sessions are sampled and optional sections skipped to stay within it")
     args = parser.parse_args()
+    if args.deadline is not None and args.deadline <= 0:
+        parser.error("--deadline must be positive")
+    if (args.compact or args.output) and args.format != "json":
+        parser.error("--compact and --output require --format json")
+    try:
+        select_json_backend(args.json_backend)
+    except (ImportError, ValueError) as e:
+        parser.error(f"--json-backend {args.json_backend}: {e}")
+    deadline = Deadline(args.deadline)
+    if args.jobs is None:
+        args.jobs = 0 if args.all_projects else 1
+    if args.sessions is not None:
+        max_sessions = args.sessions
+    elif args.since or args.until:
+        max_sessions = None
+    else:
+        max_sessions = DEFAULT_SESSIONS
 
     cwd = Path.cwd()
 
     # Quick stats mode
+    if args.rebuild_summary_index:
+        try:
+            indexed = rebuild_summary_index(SUMMARIES_DIR, SUMMARY_INDEX_FILE)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error: Could not rebuild summary index {SUMMARY_INDEX_FILE}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Indexed {indexed} session summaries into {SUMMARY_INDEX_FILE}", file=sys.stderr)
+        if not args.quick_stats:
+            return
+
     if args.quick_stats:
-        stats = analyze_session_summaries(SUMMARIES_DIR, args.days)
+        if args.from_store:
+            if not SESSION_STORE_FILE.exists():
+                print(f"Error: No session store at {SESSION_STORE_FILE} (run with --store first)", file=sys.stderr)
+                sys.exit(1)
+            try:
+                with SessionStore(SESSION_STORE_FILE) as store:
+                    stats = store.quick_stats(datetime.now() - timedelta(days=args.days))
+            except sqlite3.Error as e:
+                print(f"Error: Could not read session store {SESSION_STORE_FILE}: {e}", file=sys.stderr)
+                sys.exit(1)
+            print("Quick stats from the session store; tool counts are sessions using each tool", file=sys.stderr)
+        else:
+            stats = analyze_session_summaries(
+                SUMMARIES_DIR, args.days, index_file=None if args.no_cache else SUMMARY_INDEX_FILE,
+            )
         print_quick_stats(stats, args.days)
         return
 
@@ -3076,88 +5109,166 @@ def main():
         target_project_dir = Path(project_path) if project_path != str(cwd) else cwd
 
     print("\n[1/4] Discovering skills, agents, commands, hooks...", file=sys.stderr)
-    skill_paths = [CLAUDE_DIR / "skills", target_project_dir / ".claude" / "skills"]
-    agent_paths = [CLAUDE_DIR / "agents", target_project_dir / ".claude" / "agents"]
-    command_paths = [CLAUDE_DIR / "commands", target_project_dir / ".claude" / "commands"]
-
-    skills = discover_skills(skill_paths)
-    agents = discover_agents(agent_paths)
-    commands = discover_commands(command_paths)
-
-    plugin_skills, plugin_agents, plugin_commands = discover_from_plugins(PLUGINS_CACHE)
-    skills.extend(plugin_skills)
-    agents.extend(plugin_agents)
-    commands.extend(plugin_commands)
-
-    settings_paths = [
-        (CLAUDE_DIR / "settings.json", "global"),
-        (target_project_dir / ".claude" / "settings.json", "project"),
-        (target_project_dir / ".claude" / "settings.local.json", "project-local"),
-    ]
-    hooks = discover_hooks(settings_paths, PLUGINS_CACHE)
+    # Sessions of every project would be held against one project's local
+    # components, so --all-projects analyzes only global and plugin ones
+    project_dirs = [] if args.all_projects else [target_project_dir]
+    if args.all_projects:
+        print("  → All projects: global and plugin components only", file=sys.stderr)
+    skill_paths = [CLAUDE_DIR / "skills", *(d / ".claude" / "skills" for d in project_dirs)]
+    agent_paths = [CLAUDE_DIR / "agents", *(d / ".claude" / "agents" for d in project_dirs)]
+    command_paths = [CLAUDE_DIR / "commands", *(d / ".claude" / "commands" for d in project_dirs)]
+
+    with _profiler.phase("discovery"):
+        load_discovery_cache(None if args.no_cache else DISCOVERY_CACHE_FILE)
+        skills = discover_skills(skill_paths)
+        agents = discover_agents(agent_paths)
+        commands = discover_commands(command_paths)
+
+        plugins_skipped = deadline.expired(DEADLINE_DISCOVERY_RESERVE)
+        if plugins_skipped:
+            deadline.skip("discovery", "plugin components")
+        else:
+            plugin_skills, plugin_agents, plugin_commands = discover_from_plugins(PLUGINS_CACHE)
+            skills.extend(plugin_skills)
+            agents.extend(plugin_agents)
+            commands.extend(plugin_commands)
+        if not args.no_cache:
+            # Keep the skipped plugin entries so the next run does not start cold
+            save_discovery_cache(DISCOVERY_CACHE_FILE, keep_unvisited=plugins_skipped)
+
+        settings_paths = [(CLAUDE_DIR / "settings.json", "global")]
+        for d in project_dirs:
+            settings_paths.append((d / ".claude" / "settings.json", "project"))
+            settings_paths.append((d / ".claude" / "settings.local.json", "project-local"))
+        hooks = discover_hooks(settings_paths, PLUGINS_CACHE)
 
     print(f"  ✓ Found {len(skills)} skills, {len(agents)} agents, {len(commands)} commands, {len(hooks)} hooks", file=sys.stderr)
     if _yaml_parse_issues:
         print(f"  ⚠ Skipped {len(_yaml_parse_issues)} files with invalid YAML frontmatter", file=sys.stderr)
 
     print("\n[2/4] Parsing CLAUDE.md files...", file=sys.stderr)
-    claude_md_paths = [
-        CLAUDE_DIR / "CLAUDE.md",
-        target_project_dir / "CLAUDE.md",
-        target_project_dir / ".claude" / "instructions.md",
-    ]
-    claude_md = parse_claude_md_files(claude_md_paths)
+    claude_md_paths = [CLAUDE_DIR / "CLAUDE.md"]
+    for d in project_dirs:
+        claude_md_paths.extend([d / "CLAUDE.md", d / ".claude" / "instructions.md"])
+    if deadline.expired(DEADLINE_DISCOVERY_RESERVE):
+        deadline.skip("claude_md", "CLAUDE.md parsing")
+        claude_md_paths = []
+    with _profiler.phase("claude_md"):
+        claude_md = parse_claude_md_files(claude_md_paths)
     if claude_md["files_found"]:
         print(f"  ✓ Found {len(claude_md['files_found'])} config file(s)", file=sys.stderr)
     else:
         print("  ⊘ No CLAUDE.md files found", file=sys.stderr)
 
-    setup_profile = compute_setup_profile(skills, agents, commands, hooks, claude_md)
+    with _profiler.phase("setup_profile"):
+        setup_profile = compute_setup_profile(skills, agents, commands, hooks, claude_md, deadline)
     print(f"  ✓ Setup: {setup_profile.complexity} complexity, {len(setup_profile.red_flags)} red flags", file=sys.stderr)
 
     print("\n[3/4] Parsing session files...", file=sys.stderr)
 
-    if args.project and not Path(args.project).is_absolute():
-        resolved_dir, matches = resolve_project_path(PROJECTS_DIR, project_path)
-    else:
-        resolved_dir, matches = resolve_project_path(PROJECTS_DIR, project_path)
-
-    if resolved_dir:
-        if resolved_dir.name != project_path.replace("/", "-"):
-            print(f"  → Matched: {resolved_dir.name}", file=sys.stderr)
-        session_files = find_project_sessions(PROJECTS_DIR, resolved_dir, args.sessions)
-    elif len(matches) > 1:
-        print(f"  ✗ Multiple projects match '{project_path}':", file=sys.stderr)
-        for m in matches[:5]:
-            print(f"    - {m.name}", file=sys.stderr)
-        if len(matches) > 5:
-            print(f"    ... and {len(matches) - 5} more", file=sys.stderr)
-        print("  Use full path or more specific name", file=sys.stderr)
-        session_files = []
-    else:
-        print(f"  ✗ No project found matching '{project_path}'", file=sys.stderr)
-        if PROJECTS_DIR.exists():
-            available = sorted([d.name for d in PROJECTS_DIR.iterdir() if d.is_dir()])[:5]
-            if available:
-                print("  Available projects:", file=sys.stderr)
-                for p in available:
-                    print(f"    - {p}", file=sys.stderr)
-        session_files = []
-
-    if session_files:
-        sessions = [parse_session_file(f) for f in session_files]
-        # Story 1.2 AC-3: Set project_path on each session for per-project breakdown
-        for s in sessions:
-            s.project_path = project_path
-        total_prompts = sum(len(s.prompts) for s in sessions)
-        print(f"  ✓ Parsed {len(sessions)} sessions ({total_prompts} prompts)", file=sys.stderr)
+    until = args.until + timedelta(days=1) if args.until else None
+    resolved_dir = None
+    if args.from_store:
+        if not SESSION_STORE_FILE.exists():
+            print(f"  ✗ No session store at {SESSION_STORE_FILE} (run with --store first)", file=sys.stderr)
+            sessions = []
+        else:
+            if args.all_projects:
+                store_project = None
+            else:
+                resolved_dir, _ = resolve_project_path(PROJECTS_DIR, project_path)
+                # Transcripts may be gone while their stored sessions remain
+                store_project = resolved_dir.name if resolved_dir else project_path.replace("/", "-")
+            try:
+                with _profiler.phase("session_parsing"), SessionStore(SESSION_STORE_FILE) as store:
+                    sessions = store.load_sessions(store_project, max_sessions, since=args.since, until=until)
+            except sqlite3.Error as e:
+                print(f"  ✗ Could not read session store {SESSION_STORE_FILE}: {e}", file=sys.stderr)
+                sessions = []
+            folder_paths: dict[str, str] = {}
+            for session in sessions:
+                if args.all_projects:
+                    # The store labels sessions by folder; label them as parsed transcripts are
+                    folder = session.project_path
+                    if folder not in folder_paths:
+                        folder_paths[folder] = project_path_for_folder(PROJECTS_DIR / folder)
+                    session.project_path = folder_paths[folder]
+                else:
+                    session.project_path = project_path
+            total_prompts = sum(len(s.prompts) for s in sessions)
+            print(f"  ✓ Loaded {len(sessions)} sessions ({total_prompts} prompts) from {SESSION_STORE_FILE}", file=sys.stderr)
     else:
-        sessions = []
-        if resolved_dir:
-            print(f"  ✗ No sessions found in {resolved_dir.name}", file=sys.stderr)
+        if args.all_projects:
+            project_sessions = find_all_project_sessions(PROJECTS_DIR, max_sessions, since=args.since, until=until)
+            session_files = [f for _, f in project_sessions]
+            # Story 1.2 AC-3: Label each session with its project for per-project breakdown
+            project_paths = [project for project, _ in project_sessions]
+            print(f"  → {len(set(project_paths))} projects with sessions", file=sys.stderr)
+        else:
+            if args.project and not Path(args.project).is_absolute():
+                resolved_dir, matches = resolve_project_path(PROJECTS_DIR, project_path)
+            else:
+                resolved_dir, matches = resolve_project_path(PROJECTS_DIR, project_path)
+
+            if resolved_dir:
+                if resolved_dir.name != project_path.replace("/", "-"):
+                    print(f"  → Matched: {resolved_dir.name}", file=sys.stderr)
+                session_files = find_project_sessions(PROJECTS_DIR, resolved_dir, max_sessions, since=args.since, until=until)
+            elif len(matches) > 1:
+                print(f"  ✗ Multiple projects match '{project_path}':", file=sys.stderr)
+                for m in matches[:5]:
+                    print(f"    - {m.name}", file=sys.stderr)
+                if len(matches) > 5:
+                    print(f"    ... and {len(matches) - 5} more", file=sys.stderr)
+                print("  Use full path or more specific name", file=sys.stderr)
+                session_files = []
+            else:
+                print(f"  ✗ No project found matching '{project_path}'", file=sys.stderr)
+                if PROJECTS_DIR.exists():
+                    available = sorted([d.name for d in PROJECTS_DIR.iterdir() if d.is_dir()])[:5]
+                    if available:
+                        print("  Available projects:", file=sys.stderr)
+                        for p in available:
+                            print(f"    - {p}", file=sys.stderr)
+                session_files = []
+            project_paths = [project_path] * len(session_files)
+
+        if session_files:
+            store = None
+            if args.store:
+                try:
+                    store = SessionStore(SESSION_STORE_FILE)
+                except (OSError, sqlite3.Error) as e:
+                    print(f"Warning: Could not open session store {SESSION_STORE_FILE}: {e}", file=sys.stderr)
+            with _profiler.phase("session_parsing"):
+                sessions = parse_sessions(
+                    session_files, args.jobs, cache_dir=None if args.no_cache else SESSION_CACHE_DIR,
+                    deadline=deadline, project_paths=project_paths, store=store,
+                )
+            if store is not None:
+                store.close()
+            if len(sessions) < len(session_files):
+                deadline.skip("session_parsing", f"{len(session_files) - len(sessions)} of {len(session_files)} sessions",
+                              sessions_kept=len(sessions), sessions_dropped=len(session_files) - len(sessions))
+            total_prompts = sum(len(s.prompts) for s in sessions)
+            print(f"  ✓ Parsed {len(sessions)} sessions ({total_prompts} prompts)", file=sys.stderr)
+        else:
+            sessions = []
+            if resolved_dir:
+                print(f"  ✗ No sessions found in {resolved_dir.name}", file=sys.stderr)
+            elif args.all_projects:
+                print(f"  ✗ No sessions found in {PROJECTS_DIR}", file=sys.stderr)
 
     print("\n[4/4] Finding potential matches...", file=sys.stderr)
-    missed, jsonl_stats = analyze_jsonl(skills, agents, commands, sessions)
+    # Match every prompt and index invocations once; analysis and JSON output share them
+    with _profiler.phase("matching"):
+        match_matrix = MatchMatrix(sessions, skills + agents + commands, deadline=deadline)
+        if len(match_matrix.sessions) < len(sessions):
+            deadline.skip("matching", f"{len(sessions) - len(match_matrix.sessions)} of {len(sessions)} sessions",
+                          sessions_kept=len(match_matrix.sessions), sessions_dropped=len(sessions) - len(match_matrix.sessions))
+            sessions = match_matrix.sessions
+        invocations = InvocationIndex(sessions)
+        missed, jsonl_stats = analyze_jsonl(skills, agents, commands, sessions, match_matrix, invocations)
     print(f"  ✓ Found {len(missed)} potential matches", file=sys.stderr)
 
     # Read plugin enabled states from settings
@@ -3167,7 +5278,8 @@ def main():
     )
 
     # Compute plugin usage
-    setup_profile.plugin_usage = compute_plugin_usage(skills, agents, sessions, missed, enabled_states)
+    with _profiler.phase("plugin_usage"):
+        setup_profile.plugin_usage = compute_plugin_usage(skills, agents, sessions, missed, enabled_states)
     active_count = len(setup_profile.plugin_usage["active"])
     unused_count = len(setup_profile.plugin_usage["unused"])
     disabled_matched_count = len(setup_profile.plugin_usage.get("disabled_but_matched", []))
@@ -3193,16 +5305,29 @@ def main():
 
     # Output
     if args.format == "json":
-        output = generate_analysis_json(
+        sections = iter_analysis_sections(
             skills, agents, commands, hooks, sessions, jsonl_stats, claude_md, setup_profile, missed, feedback,
-            cleanup_mode=args.cleanup,
+            cleanup_mode=args.cleanup, matrix=match_matrix, invocations=invocations,
+            remote_version_cache=None if args.no_cache else REMOTE_VERSION_CACHE_FILE,
+            offline=args.offline, deadline=deadline,
         )
-        print(json.dumps(output, indent=2))
+        if args.profile:
+            # Wall-clock timings would make every run's output differ, so only --profile adds them
+            sections = _profiled_sections(sections)
+        if args.output:
+            with open(args.output, "w") as f:
+                write_analysis_json(sections, f, compact=args.compact)
+            print(f"Wrote {args.output}", file=sys.stderr)
+        else:
+            write_analysis_json(sections, sys.stdout, compact=args.compact)
     elif args.format == "dashboard":
         print_dashboard(jsonl_stats)
     else:
         print_table(jsonl_stats, missed, args.verbose)
 
+    if args.profile:
+        _profiler.report()
+
 
 if __name__ == "__main__":
     main()
@@ -3,7 +3,25 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add source directories to path
 _root = Path(__file__).parent.parent
 sys.path.insert(0, str(_root / "hooks"))
 sys.path.insert(0, str(_root / "skills" / "observability-usage-collector" / "scripts"))
+
+
+@pytest.fixture(params=["json", "orjson", "msgspec"])
+def json_backend(request, monkeypatch):
+    """Run the test once per transcript JSON backend, skipping backends that are not installed."""
+    import collect_usage
+    import generate_session_summary as hook
+
+    try:
+        backend, decode = collect_usage.make_entry_decoder(request.param)
+    except ImportError:
+        pytest.skip(f"{request.param} is not installed")
+    for module in (collect_usage, hook):
+        monkeypatch.setattr(module, "_json_backend", backend)
+        monkeypatch.setattr(module, "_decode_entry", decode)
+    return backend
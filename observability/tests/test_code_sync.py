@@ -10,10 +10,10 @@ import pytest
 
 
 def extract_function_ast(file_path: Path, func_name: str) -> str:
-    """Extract a function's AST representation from a file."""
+    """Extract a function's (or class's) AST representation from a file."""
     tree = ast.parse(file_path.read_text())
     for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef) and node.name == func_name:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)) and node.name == func_name:
             # Remove docstring for comparison (may differ)
             if (node.body and isinstance(node.body[0], ast.Expr) and
                 isinstance(node.body[0].value, ast.Constant) and
@@ -82,3 +82,42 @@ class TestCodeSync:
         assert hook_impl == collector_impl, (
             "infer_workflow_stage() implementations have diverged!"
         )
+
+    @pytest.mark.parametrize("func_name", ["iter_lines_from", "_prefix_digest", "make_entry_decoder"])
+    def test_incremental_reader_sync(self, func_name):
+        """Verify the resumable JSONL reader helpers are identical (ADR-013)."""
+        root = get_project_root()
+
+        hook_impl = extract_function_ast(root / "hooks" / "generate_session_summary.py", func_name)
+        collector_impl = extract_function_ast(
+            root / "skills" / "observability-usage-collector" / "scripts" / "collect_usage.py", func_name
+        )
+
+        assert hook_impl == collector_impl, f"{func_name}() implementations have diverged!"
+
+    @pytest.mark.parametrize("func_name", ["connect_summary_index", "index_summary"])
+    def test_summary_index_sync(self, func_name):
+        """Verify the hook writes the summary index the way --quick-stats reads it (ADR-013)."""
+        root = get_project_root()
+
+        hook_impl = extract_function_ast(root / "hooks" / "generate_session_summary.py", func_name)
+        collector_impl = extract_function_ast(
+            root / "skills" / "observability-usage-collector" / "scripts" / "collect_usage.py", func_name
+        )
+
+        assert hook_impl == collector_impl, f"{func_name}() implementations have diverged!"
+
+    @pytest.mark.parametrize("name", [
+        "ToolUse", "ToolResult", "Prompt", "Interruption", "Compaction",
+        "entry_events",
+    ])
+    def test_transcript_events_sync(self, name):
+        """Verify both parsers walk entries into the same events (ADR-013)."""
+        root = get_project_root()
+
+        hook_impl = extract_function_ast(root / "hooks" / "generate_session_summary.py", name)
+        collector_impl = extract_function_ast(
+            root / "skills" / "observability-usage-collector" / "scripts" / "collect_usage.py", name
+        )
+
+        assert hook_impl == collector_impl, f"{name} implementations have diverged!"
@@ -0,0 +1,174 @@
+"""Tests for the --deadline wall-clock budget."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+import collect_usage
+from collect_usage import (
+    DEADLINE_MATCH_RESERVE,
+    DEADLINE_PARSE_RESERVE,
+    Deadline,
+    MatchMatrix,
+    SessionData,
+    SetupProfile,
+    SkillOrAgent,
+    compute_setup_profile,
+    generate_analysis_json,
+    parse_sessions,
+)
+
+
+def _deadline(seconds: float, used: float) -> Deadline:
+    """A deadline with `used` seconds of its budget already spent."""
+    deadline = Deadline(seconds)
+    deadline.started -= used
+    return deadline
+
+
+def _write_session(path: Path, prompt: str) -> Path:
+    path.write_text(json.dumps({"type": "user", "message": {"content": prompt}}) + "\n")
+    return path
+
+
+def _skill(name: str, triggers: list[str]) -> SkillOrAgent:
+    return SkillOrAgent(name=name, type="skill", description="", triggers=triggers,
+                        source_path=f"/{name}", source_type="global")
+
+
+JSONL_STATS = {
+    "total_sessions": 0, "total_prompts": 0, "skills_used": {}, "agents_used": {}, "commands_used": {},
+    "missed_skills": {}, "missed_agents": {}, "missed_commands": {}, "total_success": 0,
+    "total_failure": 0, "total_interrupted": 0, "total_compactions": 0,
+}
+
+
+class TestDeadline:
+    def test_unbounded_never_expires(self):
+        deadline = _deadline(None, 1e6)
+
+        assert deadline.remaining() is None
+        assert not deadline.expired()
+
+    def test_reserve_expires_before_the_budget(self):
+        deadline = _deadline(10, 7)
+
+        assert deadline.expired(DEADLINE_PARSE_RESERVE)
+        assert not deadline.expired(0.1)
+        assert deadline.remaining(0.1) == pytest.approx(2, abs=0.5)
+
+    def test_skip_records_phase_and_details(self, capsys):
+        deadline = Deadline(5)
+        deadline.skip("session_parsing", "3 of 10 sessions", sessions_dropped=3)
+
+        report = deadline.to_dict()
+        assert report["budget_seconds"] == 5
+        assert report["skipped"] == [{"phase": "session_parsing", "skipped": "3 of 10 sessions", "sessions_dropped": 3}]
+        assert "3 of 10 sessions" in capsys.readouterr().err
+
+
+class TestSessionSampling:
+    def test_expired_deadline_keeps_only_cached_sessions(self, tmp_path):
+        cache_dir = tmp_path / "cache"
+        files = [_write_session(tmp_path / f"{i:08d}.jsonl", f"prompt {i}") for i in range(4)]
+        parse_sessions(files[2:], cache_dir=cache_dir)
+
+        sessions = parse_sessions(files, cache_dir=cache_dir, deadline=_deadline(10, 10))
+
+        assert [s.prompts for s in sessions] == [["prompt 2"], ["prompt 3"]]
+
+    def test_parsing_stops_at_the_reserve(self, tmp_path, monkeypatch):
+        files = [_write_session(tmp_path / f"{i:08d}.jsonl", f"prompt {i}") for i in range(5)]
+        deadline = Deadline(10)
+        original = collect_usage._parse_session_job
+
+        def slow_job(job):
+            deadline.started -= 2.5  # Each session uses a quarter of the budget
+            return original(job)
+
+        monkeypatch.setattr(collect_usage, "_parse_session_job", slow_job)
+
+        sessions = parse_sessions(files, deadline=deadline)
+
+        # 0, 2.5 and 5 seconds used are below the 6 second parse cut-off
+        assert [s.prompts for s in sessions] == [["prompt 0"], ["prompt 1"], ["prompt 2"]]
+
+    def test_match_matrix_samples_leading_sessions(self, monkeypatch):
+        sessions = []
+        for i in range(3):
+            session = SessionData(session_id=f"s{i}")
+            session.prompts = ["please debug this"]
+            sessions.append(session)
+        deadline = Deadline(10)
+        original = collect_usage.find_matches
+
+        def slow_find_matches(*args, **kwargs):
+            deadline.started -= 10 * (1 - DEADLINE_MATCH_RESERVE)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(collect_usage, "find_matches", slow_find_matches)
+
+        matrix = MatchMatrix(sessions, [_skill("debugging", ["debug this"])], deadline=deadline)
+
+        assert matrix.sessions == sessions[:1]
+        assert list(matrix.by_prompt) == [id(sessions[0])]
+
+
+class TestOptionalSections:
+    def test_semantic_overlap_detection_skipped(self):
+        skills = [_skill("a", ["review pull requests"]), _skill("b", ["reviewing pull request"])]
+        deadline = _deadline(10, 10)
+
+        profile = compute_setup_profile(skills, [], [], [], {"files_found": []}, deadline)
+
+        assert not [o for o in profile.overlapping_triggers if o["detection_method"] == "stemmed"]
+        assert deadline.skipped == [{"phase": "setup_profile", "skipped": "semantic overlap detection"}]
+
+    def test_semantic_overlap_detection_runs_within_budget(self):
+        skills = [_skill("a", ["review pull requests"]), _skill("b", ["reviewing pull request"])]
+
+        profile = compute_setup_profile(skills, [], [], [], {"files_found": []}, Deadline(60))
+
+        assert [o for o in profile.overlapping_triggers if o["detection_method"] == "stemmed"]
+
+    def test_schema_reports_skipped_sections(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(collect_usage, "CLAUDE_DIR", tmp_path)
+        monkeypatch.setattr(collect_usage, "PLUGINS_CACHE", tmp_path / "plugins")
+
+        output = generate_analysis_json(
+            [], [], [], [], [], JSONL_STATS, {"files_found": [], "content": {}},
+            SetupProfile("low", "minimal", [], [], [], [], {}, {}, []), [], {},
+            deadline=_deadline(10, 10),
+        )
+
+        assert output["missed_opportunities"] == []
+        assert {"phase": "output", "skipped": "missed opportunity scoring"} in output["_run"]["deadline"]["skipped"]
+
+    def test_no_deadline_block_without_budget(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(collect_usage, "CLAUDE_DIR", tmp_path)
+        monkeypatch.setattr(collect_usage, "PLUGINS_CACHE", tmp_path / "plugins")
+
+        output = generate_analysis_json(
+            [], [], [], [], [], JSONL_STATS, {"files_found": [], "content": {}},
+            SetupProfile("low", "minimal", [], [], [], [], {}, {}, []), [], {},
+            deadline=Deadline(None),
+        )
+
+        assert "_run" not in output
+
+    def test_remote_version_checks_fall_back_to_cache(self, tmp_path, monkeypatch):
+        calls = []
+        monkeypatch.setattr(collect_usage, "check_outdated_plugins", lambda *args: calls.append(args) or [])
+
+        collect_usage.compute_pre_computed_findings(
+            [], [], [], [], [], SetupProfile("low", "minimal", [], [], [], [], {}, {}, []),
+            plugins_cache=tmp_path, settings_path=tmp_path / "settings.json",
+            remote_version_cache=tmp_path / "remote-versions.json", deadline=_deadline(10, 10),
+        )
+
+        [(_, _, cache_file, offline, _)] = calls
+        assert cache_file == tmp_path / "remote-versions.json"
+        assert offline is True
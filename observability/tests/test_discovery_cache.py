@@ -0,0 +1,143 @@
+"""Tests for the discovery cache (parsed skill/agent/command records reused across runs)."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+import collect_usage
+from collect_usage import (
+    discover_agents,
+    discover_commands,
+    discover_from_plugins,
+    discover_skills,
+    load_discovery_cache,
+    save_discovery_cache,
+)
+
+
+def _write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def _touch_later(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    _write(tmp_path / "skills" / "tdd" / "SKILL.md", "---\nname: tdd\ndescription: Use for test driven work\n---\nbody\n")
+    _write(tmp_path / "skills" / "debug" / "skill.md", "---\nname: debug\ndescription: 'Triggers on \"debug this\"'\n---\n")
+    _write(tmp_path / "agents" / "explorer.md", "# Explorer\n\nExplores the codebase\n")
+    _write(tmp_path / "commands" / "ship.md", "---\ndescription: Ship it\n---\n")
+    version = tmp_path / "plugins" / "market" / "tools" / "1.0.0"
+    _write(version / "skills" / "lint" / "SKILL.md", "---\nname: lint\ndescription: Lint code\n---\n")
+    _write(version / "agents" / "reviewer.md", "# Reviewer\n\nReviews code\n")
+    _write(version / "commands" / "fmt.md", "---\nname: fmt\n---\n")
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    collect_usage._yaml_parse_issues.clear()
+    yield
+    load_discovery_cache(None)
+    collect_usage._yaml_parse_issues.clear()
+
+
+def _discover(root: Path) -> list[dict]:
+    plugin_skills, plugin_agents, plugin_commands = discover_from_plugins(root / "plugins")
+    items = (
+        discover_skills([root / "skills"]) + discover_agents([root / "agents"]) + discover_commands([root / "commands"])
+        + plugin_skills + plugin_agents + plugin_commands
+    )
+    return [vars(item) for item in items]
+
+
+def _run(root: Path, cache_file: Path) -> list[dict]:
+    load_discovery_cache(cache_file)
+    items = _discover(root)
+    save_discovery_cache(cache_file)
+    return items
+
+
+def _fail_parse(path, default_name, source_type):
+    raise AssertionError(f"{path} should have been served from cache")
+
+
+def test_cached_run_matches_uncached(tree, tmp_path, monkeypatch):
+    cache_file = tmp_path / "cache" / "discovery.json"
+    uncached = _discover(tree)
+    first = _run(tree, cache_file)
+
+    monkeypatch.setattr(collect_usage, "_COMPONENT_PARSERS", dict.fromkeys(collect_usage._COMPONENT_PARSERS, _fail_parse))
+    second = _run(tree, cache_file)
+
+    assert first == uncached
+    assert second == uncached
+
+
+def test_modified_file_is_reparsed(tree, tmp_path):
+    cache_file = tmp_path / "cache" / "discovery.json"
+    _run(tree, cache_file)
+
+    skill_md = _write(tree / "skills" / "tdd" / "SKILL.md", "---\nname: tdd\ndescription: Changed description\n---\n")
+    _touch_later(skill_md)
+
+    names = {item["name"]: item["description"] for item in _run(tree, cache_file)}
+    assert names["tdd"] == "Changed description"
+
+
+def test_added_and_removed_files_are_detected(tree, tmp_path):
+    cache_file = tmp_path / "cache" / "discovery.json"
+    _run(tree, cache_file)
+
+    (tree / "commands" / "ship.md").unlink()
+    _write(tree / "commands" / "deploy.md", "---\nname: deploy\n---\n")
+    _touch_later(tree / "commands")
+
+    names = [item["name"] for item in _run(tree, cache_file) if item["type"] == "command"]
+    assert "deploy" in names
+    assert "ship" not in names
+
+
+def test_partial_run_keeps_unvisited_entries(tree, tmp_path, monkeypatch):
+    cache_file = tmp_path / "cache" / "discovery.json"
+    expected = _run(tree, cache_file)
+
+    load_discovery_cache(cache_file)
+    discover_skills([tree / "skills"])  # Plugin discovery skipped, as under --deadline
+    save_discovery_cache(cache_file, keep_unvisited=True)
+
+    monkeypatch.setattr(collect_usage, "_COMPONENT_PARSERS", dict.fromkeys(collect_usage._COMPONENT_PARSERS, _fail_parse))
+    assert _run(tree, cache_file) == expected
+
+
+def test_yaml_issues_are_replayed_from_cache(tree, tmp_path):
+    cache_file = tmp_path / "cache" / "discovery.json"
+    bad = _write(tree / "agents" / "broken.md", "---\n: [unclosed\n---\n")
+    _run(tree, cache_file)
+    assert collect_usage._yaml_parse_issues == [str(bad)]
+
+    collect_usage._yaml_parse_issues.clear()
+    _run(tree, cache_file)
+
+    assert collect_usage._yaml_parse_issues == [str(bad)]
+
+
+def test_corrupt_cache_is_ignored(tree, tmp_path):
+    cache_file = _write(tmp_path / "cache" / "discovery.json", "{not json")
+
+    assert _run(tree, cache_file) == _discover(tree)
+
+
+def test_disabled_cache_writes_nothing(tree, tmp_path):
+    load_discovery_cache(None)
+    _discover(tree)
+
+    assert not (tmp_path / "cache").exists()
@@ -10,7 +10,7 @@ import pytest
 
 # Add the scripts directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
-from collect_usage import SkillOrAgent, find_matches, DEFAULT_DAYS, MIN_TRIGGER_LENGTH, COMMON_WORD_BLOCKLIST
+from collect_usage import SkillOrAgent, TriggerIndex, find_matches, DEFAULT_DAYS, MIN_TRIGGER_LENGTH, COMMON_WORD_BLOCKLIST
 
 
 @pytest.fixture
@@ -404,3 +404,63 @@ class TestCommonWordBlocklist:
     def test_min_trigger_length_constant(self):
         """MIN_TRIGGER_LENGTH should be 3 per ADR-001."""
         assert MIN_TRIGGER_LENGTH == 3
+
+
+class TestTriggerIndex:
+    """A prebuilt TriggerIndex gives the same results as matching without one."""
+
+    @pytest.fixture
+    def items(self, sample_skill, sample_agent):
+        punctuation = SkillOrAgent(
+            name="commit",
+            type="command",
+            description="Commit changes",
+            triggers=["/commit", "C++", "!!!!", "git commit"],
+            source_path="/test/path",
+            source_type="global",
+        )
+        return [sample_skill, sample_agent, punctuation]
+
+    @pytest.mark.parametrize("prompt", [
+        "please debug this error and fix the bug",
+        "Can you review my pull request? It's a PR for the API",
+        "run x/commit and git commit with C++ !!!!",
+        "nothing relevant here",
+        "",
+    ])
+    @pytest.mark.parametrize("min_triggers,min_confidence", [(2, 0.80), (1, 0.0), (0, 0.0)])
+    def test_index_matches_unindexed(self, items, prompt, min_triggers, min_confidence):
+        index = TriggerIndex(items)
+
+        indexed = find_matches(prompt, items, min_triggers, min_confidence, index=index)
+        unindexed = find_matches(prompt, items, min_triggers, min_confidence)
+
+        assert [(m.skill.name, m.matched_triggers, m.confidence) for m in indexed] == \
+            [(m.skill.name, m.matched_triggers, m.confidence) for m in unindexed]
+
+    def test_candidates_skip_items_without_shared_tokens(self, items):
+        index = TriggerIndex(items)
+
+        candidates = index.candidates("review the code")
+
+        assert 0 not in candidates
+        assert candidates[1] == [0, 1]
+
+    def test_punctuation_only_triggers_are_always_candidates(self, items):
+        index = TriggerIndex(items)
+
+        assert index.candidates("nothing relevant") == {2: [2]}
+
+    def test_filtered_triggers_are_not_indexed(self):
+        skill = SkillOrAgent(
+            name="x",
+            type="skill",
+            description="",
+            triggers=["the", "api", "TDD"],
+            source_path="/test/path",
+            source_type="global",
+        )
+
+        index = TriggerIndex([skill])
+
+        assert [t for t, _ in index.triggers[0]] == ["TDD"]
@@ -0,0 +1,81 @@
+"""Tests for session file selection (newest-K and --since/--until window)."""
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+from collect_usage import _parse_date_arg, find_project_sessions
+
+BASE = datetime(2026, 3, 1).timestamp()
+DAY = 86400
+
+
+def _touch(path: Path, mtime: float) -> Path:
+    path.write_text("{}\n")
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    project_dir = tmp_path / "-work-proj"
+    project_dir.mkdir()
+    rng = random.Random(7)
+    for i in range(60):
+        # Few distinct mtimes, so ties are common
+        _touch(project_dir / f"{i:04x}.jsonl", BASE + rng.randint(0, 9) * DAY)
+    return project_dir
+
+
+def _legacy(project_dir: Path, max_sessions: int) -> list[Path]:
+    return sorted(project_dir.glob("*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True)[:max_sessions]
+
+
+@pytest.mark.parametrize("max_sessions", [0, 1, 10, 59, 60, 100])
+def test_matches_full_sort(project_dir, max_sessions):
+    assert find_project_sessions(project_dir.parent, project_dir, max_sessions) == _legacy(project_dir, max_sessions)
+
+
+def test_ignores_other_files_and_directories(project_dir):
+    _touch(project_dir / "notes.txt", BASE + 30 * DAY)
+    (project_dir / "subagents.jsonl").mkdir()
+
+    result = find_project_sessions(project_dir.parent, project_dir, 100)
+
+    assert len(result) == 60
+    assert all(p.suffix == ".jsonl" and p.is_file() for p in result)
+
+
+def test_missing_project_dir(tmp_path):
+    assert find_project_sessions(tmp_path, tmp_path / "missing", 10) == []
+
+
+def test_date_window_is_half_open(project_dir):
+    since = datetime.fromtimestamp(BASE + 2 * DAY)
+    until = datetime.fromtimestamp(BASE + 5 * DAY)
+
+    result = find_project_sessions(project_dir.parent, project_dir, None, since=since, until=until)
+
+    expected = [p for p in _legacy(project_dir, 60) if BASE + 2 * DAY <= p.stat().st_mtime < BASE + 5 * DAY]
+    assert result == expected
+    assert result
+
+
+def test_window_and_limit_combine(project_dir):
+    since = datetime.fromtimestamp(BASE + 5 * DAY)
+
+    result = find_project_sessions(project_dir.parent, project_dir, 3, since=since)
+
+    assert result == _legacy(project_dir, 3)
+
+
+def test_parse_date_arg():
+    assert _parse_date_arg("2026-02-28") == datetime(2026, 2, 28)
+    with pytest.raises(argparse.ArgumentTypeError):
+        _parse_date_arg("28/02/2026")
@@ -0,0 +1,148 @@
+"""Tests for the session-summary hook's per-session parse state file."""
+
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+import generate_session_summary as hook
+
+pytestmark = pytest.mark.usefixtures("json_backend")
+
+SESSION_ID = "abcdef12-3456-7890-abcd-ef1234567890"
+CWD = "/work/proj"
+
+TURN_1 = [
+    {"type": "user", "message": {"content": "run the tests"}},
+    {"type": "assistant", "message": {"content": [
+        {"type": "tool_use", "id": "t1", "name": "Bash", "input": {"command": "pytest"}},
+    ]}},
+    {"type": "user", "message": {"content": [{"type": "tool_result", "tool_use_id": "t1", "content": "Exit code: 1"}]}},
+]
+TURN_2 = [
+    {"type": "assistant", "message": {"content": [
+        {"type": "tool_use", "id": "t2", "name": "Edit", "input": {"file_path": "a.py"}},
+        {"type": "tool_use", "id": "t3", "name": "Skill", "input": {"skill": "commit"}},
+    ]}},
+    {"type": "user", "message": {"content": [{"type": "tool_result", "tool_use_id": "t2", "content": "ok"}]}},
+]
+
+
+def _append(path: Path, entries) -> None:
+    with path.open("a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    project_dir = tmp_path / "projects" / "-work-proj"
+    project_dir.mkdir(parents=True)
+    monkeypatch.setattr(hook, "PROJECTS_DIR", tmp_path / "projects")
+    monkeypatch.setattr(hook, "SUMMARY_DIR", tmp_path / "summaries")
+    monkeypatch.setattr(hook, "STATE_DIR", tmp_path / "hook-state")
+    monkeypatch.setattr(hook, "SUMMARY_INDEX_FILE", tmp_path / "summaries.db")
+    monkeypatch.setattr(hook, "notify_macos", lambda *args: None)
+    return project_dir / f"{SESSION_ID}.jsonl"
+
+
+def _run_hook(monkeypatch) -> None:
+    monkeypatch.setattr(sys, "stdin", io.StringIO(json.dumps({"session_id": SESSION_ID, "cwd": CWD})))
+    try:
+        hook.main()
+    except SystemExit:
+        pass
+
+
+def _summary() -> dict:
+    [summary_file] = hook.SUMMARY_DIR.glob("*.json")
+    summary = json.loads(summary_file.read_text())
+    summary.pop("timestamp")
+    return summary
+
+
+def test_second_stop_reads_only_appended_lines(home, monkeypatch):
+    _append(home, TURN_1)
+    _run_hook(monkeypatch)
+    first_size = home.stat().st_size
+    _append(home, TURN_2)
+
+    offsets = []
+    original = hook.iter_lines_from
+    monkeypatch.setattr(hook, "iter_lines_from", lambda path, offset=0, *a: offsets.append(offset) or original(path, offset, *a))
+    _run_hook(monkeypatch)
+
+    assert offsets == [first_size]
+    expected = hook.generate_summary(SESSION_ID, CWD, hook.parse_session_file(home))
+    expected.pop("timestamp")
+    assert _summary() == expected
+
+
+def test_state_file_records_checkpoint(home, monkeypatch):
+    _append(home, TURN_1)
+
+    _run_hook(monkeypatch)
+
+    data = json.loads(hook._state_file(SESSION_ID).read_text())
+    assert data["version"] == hook.HOOK_STATE_VERSION
+    assert data["session_file"] == str(home)
+    assert data["state"]["byte_offset"] == home.stat().st_size
+    assert data["state"]["tool_counts"] == {"Bash": 1}
+
+
+def test_unchanged_transcript_skips_rewrite(home, monkeypatch):
+    _append(home, TURN_1)
+    _run_hook(monkeypatch)
+    [summary_file] = hook.SUMMARY_DIR.glob("*.json")
+    mtime = summary_file.stat().st_mtime_ns
+
+    monkeypatch.setattr(hook, "parse_session_file", lambda *a: pytest.fail("transcript should not be re-read"))
+    _run_hook(monkeypatch)
+
+    assert summary_file.stat().st_mtime_ns == mtime
+
+
+@pytest.mark.parametrize("content", [
+    "{truncated",
+    json.dumps({"version": hook.HOOK_STATE_VERSION + 1, "session_file": "x", "state": {}}),
+    json.dumps({"version": hook.HOOK_STATE_VERSION, "session_file": "/elsewhere.jsonl", "state": {}}),
+])
+def test_unusable_state_is_ignored(home, monkeypatch, content):
+    _append(home, TURN_1 + TURN_2)
+    hook.STATE_DIR.mkdir(parents=True)
+    hook._state_file(SESSION_ID).write_text(content)
+
+    _run_hook(monkeypatch)
+
+    assert _summary()["total_tools"] == 3
+
+
+def test_no_temp_files_left_behind(home, monkeypatch):
+    _append(home, TURN_1)
+
+    _run_hook(monkeypatch)
+
+    leftovers = [p for d in (hook.SUMMARY_DIR, hook.STATE_DIR) for p in d.iterdir() if p.name.endswith(".tmp")]
+    assert leftovers == []
+
+
+def test_old_states_are_pruned_when_a_new_session_starts(home, monkeypatch):
+    hook.STATE_DIR.mkdir(parents=True)
+    old = hook.STATE_DIR / "old-session.json"
+    recent = hook.STATE_DIR / "recent-session.json"
+    old.write_text("{}")
+    recent.write_text("{}")
+    stale = time.time() - (hook.HOOK_STATE_MAX_AGE_DAYS + 1) * 86400
+    os.utime(old, (stale, stale))
+    _append(home, TURN_1)
+
+    _run_hook(monkeypatch)
+
+    assert not old.exists()
+    assert recent.exists()
+    assert hook._state_file(SESSION_ID).exists()
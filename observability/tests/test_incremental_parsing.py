@@ -0,0 +1,152 @@
+"""Tests for resuming session parsing from a byte-offset checkpoint.
+
+Parsing a file in several appends must give the same result as parsing the
+final file from scratch, in both the collector and the hook.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+import collect_usage
+import generate_session_summary as hook
+from collect_usage import (
+    iter_lines_from,
+    new_session_parse_state,
+    parse_session_file,
+    parse_sessions,
+    session_to_dict,
+)
+
+pytestmark = pytest.mark.usefixtures("json_backend")
+
+
+ENTRIES = [
+    {"type": "user", "message": {"content": "please debug this"}},
+    {"type": "assistant", "timestamp": 1.0, "message": {"content": [
+        {"type": "tool_use", "id": "t1", "name": "Skill", "input": {"skill": "debugging"}},
+        {"type": "tool_use", "id": "t2", "name": "Bash", "input": {"command": "pytest"}},
+    ]}},
+    {"type": "user", "message": {"content": [{"type": "tool_result", "tool_use_id": "t1", "content": "ok"}]}},
+    {"type": "user", "timestamp": 5.0, "message": {"content": "[Request interrupted by user]"}},
+    {"type": "user", "message": {"content": "stop running tests"}},
+    {"type": "system", "subtype": "compact_boundary"},
+    {"type": "assistant", "message": {"content": [
+        {"type": "tool_use", "id": "t3", "name": "Edit", "input": {"file_path": "a.py"}},
+    ]}},
+    {"type": "user", "message": {"content": [{"type": "tool_result", "tool_use_id": "t3", "content": "Error: failed"}]}},
+    {"type": "assistant", "message": {"content": [
+        {"type": "tool_use", "id": "t4", "name": "Task", "input": {"subagent_type": "explorer"}},
+    ]}},
+]
+
+
+def _jsonl(entries) -> bytes:
+    return "".join(json.dumps(e) + "\n" for e in entries).encode()
+
+
+def _collector_view(session) -> dict:
+    data = session_to_dict(session)
+    data.pop("session_date")
+    return data
+
+
+def _hook_view(stats) -> dict:
+    data = json.loads(json.dumps(stats))
+    data.pop("byte_offset")
+    data.pop("prefix_digest")
+    return data
+
+
+@pytest.mark.parametrize("split", range(1, len(ENTRIES)))
+def test_collector_resume_matches_fresh_parse(tmp_path, split):
+    path = tmp_path / "session.jsonl"
+    path.write_bytes(_jsonl(ENTRIES[:split]))
+    state = new_session_parse_state(path)
+    parse_session_file(path, state)
+
+    with path.open("ab") as f:
+        f.write(_jsonl(ENTRIES[split:]))
+    resumed = parse_session_file(path, state)
+
+    assert _collector_view(resumed) == _collector_view(parse_session_file(path))
+
+
+@pytest.mark.parametrize("split", range(1, len(ENTRIES)))
+def test_hook_resume_matches_fresh_parse(tmp_path, split):
+    path = tmp_path / "session.jsonl"
+    path.write_bytes(_jsonl(ENTRIES[:split]))
+    state = hook.new_parse_state()
+    hook.parse_session_file(path, state)
+    # The checkpoint survives a JSON round trip (e.g. a state file between hook runs)
+    state = json.loads(json.dumps(state))
+
+    with path.open("ab") as f:
+        f.write(_jsonl(ENTRIES[split:]))
+    resumed = hook.parse_session_file(path, state)
+
+    assert _hook_view(resumed) == _hook_view(hook.parse_session_file(path))
+
+
+def test_partial_last_line_is_not_checkpointed(tmp_path):
+    """A line still being written is parsed but re-read on the next resume."""
+    path = tmp_path / "session.jsonl"
+    full = _jsonl(ENTRIES)
+    path.write_bytes(full[:-10])
+    state = new_session_parse_state(path)
+    parse_session_file(path, state)
+
+    assert state.byte_offset == len(_jsonl(ENTRIES[:-1]))
+
+    path.write_bytes(full)
+    assert _collector_view(parse_session_file(path, state)) == _collector_view(parse_session_file(path))
+
+
+def test_rewritten_file_is_parsed_from_start(tmp_path):
+    path = tmp_path / "session.jsonl"
+    path.write_bytes(_jsonl(ENTRIES[:4]))
+    state = new_session_parse_state(path)
+    parse_session_file(path, state)
+
+    path.write_bytes(_jsonl(ENTRIES[::-1]))
+    resumed = parse_session_file(path, state)
+
+    assert _collector_view(resumed) == _collector_view(parse_session_file(path))
+
+
+def test_iter_lines_from_offsets(tmp_path):
+    path = tmp_path / "session.jsonl"
+    path.write_bytes(b"ab\n\ncd\nef")
+
+    assert list(iter_lines_from(path, chunk_size=2)) == [
+        (b"ab", 3, True), (b"", 4, True), (b"cd", 7, True), (b"ef", 9, False),
+    ]
+    assert list(iter_lines_from(path, 4)) == [(b"cd", 7, True), (b"ef", 9, False)]
+
+
+def test_cache_resumes_grown_session(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    path = tmp_path / "session.jsonl"
+    path.write_bytes(_jsonl(ENTRIES[:5]))
+    parse_sessions([path], cache_dir=cache_dir)
+
+    with path.open("ab") as f:
+        f.write(_jsonl(ENTRIES[5:]))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    offsets = []
+    original = collect_usage.parse_session_file
+    monkeypatch.setattr(
+        collect_usage, "parse_session_file",
+        lambda p, state=None: offsets.append(state.byte_offset) or original(p, state),
+    )
+    [session] = parse_sessions([path], cache_dir=cache_dir)
+
+    assert offsets == [len(_jsonl(ENTRIES[:5]))]
+    assert _collector_view(session) == _collector_view(parse_session_file(path))
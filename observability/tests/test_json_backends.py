@@ -0,0 +1,103 @@
+"""Tests for the pluggable transcript JSON decoders (--json-backend)."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+import collect_usage
+import generate_session_summary as hook
+from collect_usage import make_entry_decoder, parse_session_file, session_to_dict
+
+LINES = [
+    b'{"type": "user", "uuid": "u1", "message": {"role": "user", "content": "fix the b\\u00fcg"}}',
+    b'{"type": "assistant", "timestamp": 1.5, "message": {"usage": {"input_tokens": 3}, "content": ['
+    b'{"type": "thinking", "thinking": "hmm", "signature": "abc"},'
+    b'{"type": "tool_use", "id": "t1", "name": "Skill", "input": {"skill": "debugging", "args": [1, null]}}]}}',
+    b'{"type": "user", "timestamp": 3.0, "message": {"content": [{"type": "tool_result", "tool_use_id": "t1", '
+    b'"content": [{"type": "text", "text": "ok"}], "is_error": false}]}}',
+    b'{"type": "user", "timestamp": null, "message": {"content": null}}',
+    b'{"type": "system", "subtype": "compact_boundary", "compactMetadata": {"trigger": "auto"}}',
+    b'{"message": {"content": [1, "loose item"]}}',
+    '{"type": "user", "message": {"content": "café \U0001f600"}}'.encode(),
+    b'[1, 2]',
+    b'{"type": "user", "message": {"content": "truncated',
+    b'{"type": "user", "message": {"content": "\xff"}}',
+]
+
+FIELDS = {"type", "subtype", "timestamp", "message"}
+ITEM_FIELDS = {"type", "id", "name", "input", "tool_use_id", "text", "content"}
+
+
+def _selected(entry: object) -> object:
+    """The part of a stdlib-decoded entry the parsers read."""
+    if not isinstance(entry, dict):
+        return entry
+    entry = {key: value for key, value in entry.items() if key in FIELDS}
+    message = entry.get("message")
+    if isinstance(message, dict):
+        content = message.get("content")
+        if isinstance(content, list) and all(isinstance(item, dict) for item in content):
+            content = [{key: value for key, value in item.items() if key in ITEM_FIELDS} for item in content]
+        entry["message"] = {"content": content} if "content" in message else {}
+    return entry
+
+
+def _decode(decode, line: bytes) -> object:
+    try:
+        return decode(line)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return type(e), str(e)
+
+
+@pytest.mark.parametrize("line", LINES)
+def test_backend_reads_the_same_fields_as_json(json_backend, line):
+    expected = _decode(json.loads, line)
+
+    decoded = _decode(collect_usage._decode_entry, line)
+
+    if json_backend == "msgspec":
+        assert decoded == _selected(expected)
+    else:
+        assert decoded == expected
+
+
+def test_parse_results_do_not_depend_on_backend(json_backend, tmp_path, monkeypatch):
+    path = tmp_path / "session.jsonl"
+    path.write_bytes(b"\n".join(line for line in LINES if line != b"[1, 2]") + b"\n")
+    collector, summary = session_to_dict(parse_session_file(path)), hook.parse_session_file(path)
+    for module in (collect_usage, hook):
+        monkeypatch.setattr(module, "_decode_entry", json.loads)
+
+    assert collector == session_to_dict(parse_session_file(path))
+    assert summary == hook.parse_session_file(path)
+
+
+def test_auto_picks_first_installed_backend():
+    name, _ = make_entry_decoder()
+
+    for backend in collect_usage.JSON_BACKENDS[:collect_usage.JSON_BACKENDS.index(name)]:
+        with pytest.raises(ImportError):
+            make_entry_decoder(backend)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="unknown JSON backend"):
+        make_entry_decoder("simdjson")
+
+
+def test_hook_falls_back_on_bad_environment_override():
+    hook_file = Path(hook.__file__)
+    result = subprocess.run(
+        [sys.executable, "-c", "import generate_session_summary as h; print(h._json_backend)"],
+        cwd=hook_file.parent, capture_output=True, text=True,
+        env={**os.environ, "OBSERVABILITY_JSON_BACKEND": "simdjson"},
+    )
+
+    assert result.stdout.strip() == make_entry_decoder()[0]
+    assert "OBSERVABILITY_JSON_BACKEND" in result.stderr
@@ -0,0 +1,134 @@
+"""Tests for the streaming JSON writer (--format json, --compact, --output)."""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+import collect_usage
+from collect_usage import (
+    SessionData,
+    SetupProfile,
+    SkillOrAgent,
+    _profiled_sections,
+    generate_analysis_json,
+    iter_analysis_sections,
+    write_analysis_json,
+)
+
+JSONL_STATS = {
+    "total_sessions": 1, "total_prompts": 1, "skills_used": {"test": 1}, "agents_used": {}, "commands_used": {},
+    "missed_skills": {}, "missed_agents": {}, "missed_commands": {}, "total_success": 1,
+    "total_failure": 0, "total_interrupted": 0, "total_compactions": 0,
+}
+
+
+@pytest.fixture
+def analysis_args(tmp_path, monkeypatch):
+    monkeypatch.setattr(collect_usage, "CLAUDE_DIR", tmp_path)
+    monkeypatch.setattr(collect_usage, "PLUGINS_CACHE", tmp_path / "plugins")
+    skill = SkillOrAgent(name="test", type="skill", description="Test skill", triggers=["test"],
+                         source_path="/test/path", source_type="global")
+    session = SessionData(session_id="test-1")
+    session.prompts = ["line one\nline two \"quoted\" ünïcode"]
+    claude_md = {"files_found": ["/p/CLAUDE.md"], "content": {"/p/CLAUDE.md": "# Rules\n\n- be nice\n"}}
+    return ([skill], [], [], [], [session], JSONL_STATS, claude_md,
+            SetupProfile("low", "minimal", [], [], [], [], {}, {}, []), [], {})
+
+
+def _write(sections, compact=False) -> str:
+    stream = io.StringIO()
+    write_analysis_json(sections, stream, compact=compact)
+    return stream.getvalue()
+
+
+class TestWriteAnalysisJson:
+    def test_indented_output_matches_json_dumps(self, analysis_args):
+        output = generate_analysis_json(*analysis_args)
+
+        assert _write(output.items()) == json.dumps(output, indent=2) + "\n"
+
+    def test_compact_output_matches_json_dumps(self, analysis_args):
+        output = generate_analysis_json(*analysis_args)
+
+        written = _write(output.items(), compact=True)
+
+        assert written == json.dumps(output, separators=(",", ":")) + "\n"
+        assert "\n" not in written.rstrip("\n")
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_no_sections(self, compact):
+        assert _write([], compact=compact) == "{}\n"
+
+    def test_sections_are_written_before_the_next_is_built(self):
+        stream = io.StringIO()
+        seen = []
+
+        def sections():
+            yield "first", [1, 2]
+            seen.append(stream.getvalue())
+            yield "second", {"a": None}
+
+        write_analysis_json(sections(), stream)
+
+        assert '"first": [' in seen[0]
+        assert json.loads(stream.getvalue()) == {"first": [1, 2], "second": {"a": None}}
+
+
+class TestIterAnalysisSections:
+    def test_streamed_output_is_semantically_identical(self, analysis_args):
+        output = generate_analysis_json(*analysis_args)
+        output["_schema"].pop("collection_timestamp")
+
+        streamed = json.loads(_write(iter_analysis_sections(*analysis_args)))
+        streamed["_schema"].pop("collection_timestamp")
+
+        assert streamed == output
+
+    def test_schema_is_the_first_section(self, analysis_args):
+        keys = [key for key, _ in iter_analysis_sections(*analysis_args)]
+
+        assert keys[0] == "_schema"
+        assert keys == list(generate_analysis_json(*analysis_args))
+
+    def test_run_metadata_is_the_last_section(self, analysis_args):
+        keys = [key for key, _ in iter_analysis_sections(*analysis_args, deadline=collect_usage.Deadline(60))]
+
+        assert keys[0] == "_schema"
+        assert keys[-1] == "_run"
+
+    def test_profile_is_attached_to_run_metadata(self, analysis_args):
+        collect_usage._profiler.reset()
+
+        streamed = json.loads(_write(_profiled_sections(iter_analysis_sections(*analysis_args))))
+
+        assert list(streamed)[-1] == "_run"
+        assert "output" in streamed["_run"]["performance"]["phases_seconds"]
+        assert "_run" in streamed["_schema"]["sections"]
+
+    def test_run_section_is_described_only_when_written(self, analysis_args):
+        plain = generate_analysis_json(*analysis_args)
+        bounded = generate_analysis_json(*analysis_args, deadline=collect_usage.Deadline(60))
+
+        assert "_run" not in plain and "_run" not in plain["_schema"]["sections"]
+        assert "_run" in bounded and "_run" in bounded["_schema"]["sections"]
+
+    def test_profile_joins_deadline_in_run_metadata(self, analysis_args):
+        sections = iter_analysis_sections(*analysis_args, deadline=collect_usage.Deadline(60))
+
+        streamed = json.loads(_write(_profiled_sections(sections)))
+
+        assert set(streamed["_run"]) == {"deadline", "performance"}
+
+    def test_parse_stats_report_skipped_lines_apart(self, analysis_args):
+        session = analysis_args[4][0]
+        session.entries_total, session.entries_parsed, session.entries_skipped = 10, 3, 6
+        session.parsing_errors = [{"line": 10, "error": "Expecting value"}]
+
+        stats = generate_analysis_json(*analysis_args)["_schema"]["jsonl_parse_stats"]
+
+        assert (stats["entries_total"], stats["entries_parsed"], stats["entries_skipped"]) == (10, 3, 6)
+        assert stats["parse_success_rate"] == 0.9
@@ -0,0 +1,137 @@
+"""Tests for the byte-level line prefilter in both session parsers.
+
+Lines the prefilter skips must not change any result: parsing with the
+prefilter disabled (every line decoded) gives the same SessionData and the
+same hook stats. Only the ADR-026 counters differ: a skipped line counts
+toward entries_skipped instead of entries_parsed (ADR-026, Prefiltered Lines).
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+import collect_usage
+import generate_session_summary as hook
+from collect_usage import parse_session_file, session_to_dict
+
+pytestmark = pytest.mark.usefixtures("json_backend")
+
+
+def _transcript(seed: int) -> list[str]:
+    rng = random.Random(seed)
+    lines = []
+    for i in range(60):
+        kind = rng.choice(["prompt", "text", "tool", "result", "progress", "system", "compact", "interrupt", "broken"])
+        if kind == "prompt":
+            entry = {"type": "user", "message": {"role": "user", "content": f"fix the bug ünïcode {i}"}}
+        elif kind == "text":
+            entry = {"type": "assistant", "message": {"content": [{"type": "text", "text": "thinking about the user " * 5}]}}
+        elif kind == "tool":
+            name = rng.choice(["Bash", "Edit", "Skill", "Task", "Read"])
+            entry = {"type": "assistant", "timestamp": float(i), "message": {"content": [
+                {"type": "tool_use", "id": f"t{i}", "name": name,
+                 "input": {"command": "pytest", "skill": "debugging", "subagent_type": "reviewer"}},
+            ]}}
+        elif kind == "result":
+            entry = {"type": "user", "message": {"content": [
+                {"type": "tool_result", "tool_use_id": f"t{i - rng.randint(1, 3)}",
+                 "content": rng.choice(["ok", "Error: failed", "Exit code: 1", "passed"])},
+            ]}}
+        elif kind == "progress":
+            entry = {"type": "progress", "data": {"type": "hook_progress", "hookEvent": "PreToolUse", "tool_use_id": f"t{i}"}}
+        elif kind == "system":
+            entry = {"type": "system", "subtype": "informational", "content": "note"}
+        elif kind == "compact":
+            entry = {"type": "system", "subtype": "compact_boundary"}
+        elif kind == "interrupt":
+            entry = {"type": "user", "timestamp": float(i), "message": {"content": "[Request interrupted by user]"}}
+        else:
+            lines.append(rng.choice(['{"type": "progress", "data": {', '{"type": "assistant"} trailing', "]"]))
+            continue
+        separators = rng.choice([(", ", ": "), (",", ":")])
+        lines.append(json.dumps(entry, separators=separators, ensure_ascii=rng.random() < 0.5))
+    return lines
+
+
+@pytest.fixture(params=range(8))
+def transcript(request, tmp_path):
+    path = tmp_path / "session.jsonl"
+    path.write_text("\n".join(_transcript(request.param)) + "\n")
+    return path
+
+
+def test_collector_results_unchanged(transcript, monkeypatch):
+    filtered = session_to_dict(parse_session_file(transcript))
+    monkeypatch.setattr(collect_usage, "_may_change_session", lambda line: True)
+    decoded = session_to_dict(parse_session_file(transcript))
+
+    assert decoded["entries_skipped"] == 0
+    assert filtered["entries_parsed"] + filtered["entries_skipped"] == decoded["entries_parsed"]
+    for key in ("entries_parsed", "entries_skipped"):
+        del filtered[key], decoded[key]
+    assert filtered == decoded
+
+
+def test_hook_results_unchanged(transcript, monkeypatch):
+    filtered = hook.parse_session_file(transcript)
+    monkeypatch.setattr(hook, "_may_change_stats", lambda line: True)
+
+    assert filtered == hook.parse_session_file(transcript)
+
+
+def test_skipped_lines_are_counted(tmp_path, monkeypatch):
+    path = tmp_path / "session.jsonl"
+    path.write_bytes(
+        b'{"type": "progress", "data": {}}\n'
+        b'{"type": "assistant", "message": {"content": [{"type": "text", "text": "hi"}]}}\n'
+        b'{"type": "progress", "data": {\n'
+        b'{"type": "system", "content": "\xff"}\n'
+    )
+    decoded = []
+    original = collect_usage._decode_entry
+    monkeypatch.setattr(collect_usage, "_decode_entry", lambda s: decoded.append(s) or original(s))
+
+    session = parse_session_file(path)
+
+    assert (session.entries_total, session.entries_parsed, session.entries_skipped) == (4, 0, 2)
+    assert [error["line"] for error in session.parsing_errors] == [3, 4]
+    # Only the two malformed lines were handed to the decoder, for their error messages
+    assert len(decoded) == 2
+
+
+def test_malformed_object_without_needles_counts_as_skipped(tmp_path):
+    path = tmp_path / "session.jsonl"
+    path.write_bytes(b'{"type": "progress", "data": {},}\n{bad json}\n{"type": "user", "message": {,}}\n')
+
+    session = parse_session_file(path)
+
+    # ADR-026: skipped lines are checked for braces only; a line that is decoded reports its error
+    assert (session.entries_total, session.entries_parsed, session.entries_skipped) == (3, 0, 2)
+    assert [error["line"] for error in session.parsing_errors] == [3]
+
+
+@pytest.mark.parametrize("line, relevant", [
+    (b'{"type":"user","message":{"content":"hi"}}', True),
+    (b'{"type": "assistant", "message": {"content": [{"type": "tool_use", "id": "t1"}]}}', True),
+    (b'{"type":"system","subtype":"compact_boundary"}', True),
+    (b'{"type":"assistant","message":{"content":[{"type":"text","text":"x"}]}}', False),
+    (b'{"type":"progress","data":{"tool_use_id":"t1"}}', False),
+])
+def test_collector_needles(line, relevant):
+    assert collect_usage._may_change_session(line) is relevant
+
+
+@pytest.mark.parametrize("line, relevant", [
+    (b'{"type":"user","message":{"content":"run the tests"}}', False),
+    (b'{"type":"user","message":{"content":"[Request interrupted by user]"}}', True),
+    (b'{"type":"user","message":{"content":[{"type":"tool_result","tool_use_id":"t1"}]}}', True),
+    (b'{"type":"assistant","message":{"content":[{"type":"tool_use","id":"t1"}]}}', True),
+    (b'{"type":"progress","data":{"tool_use_id":"t1"}}', False),
+])
+def test_hook_needles(line, relevant):
+    assert hook._may_change_stats(line) is relevant
@@ -13,12 +13,15 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
 from collect_usage import (
     SkillOrAgent,
+    MatchMatrix,
     SessionData,
+    analyze_jsonl,
     calculate_frequency_score,
     calculate_recency_score,
     calculate_impact_score,
     detect_missed_opportunities,
 )
+import collect_usage
 
 
 @pytest.fixture
@@ -247,3 +250,58 @@ class TestDetectMissedOpportunities:
         tdd = [r for r in result if r["skill_name"] == "test-driven-development"][0]
         assert "sessions_affected" in tdd
         assert set(tdd["sessions_affected"]) == {"s1", "s2"}
+
+
+class TestSharedMatchMatrix:
+    """All consumers give the same results from one MatchMatrix as when matching on their own."""
+
+    @pytest.fixture
+    def sessions(self):
+        return [
+            SessionData(
+                session_id="s1",
+                prompts=["help me write tests using test driven development", "investigate the root cause analysis"],
+                skills_used=set(),
+                session_date=datetime.now(),
+            ),
+            SessionData(
+                session_id="s2",
+                prompts=["TDD please", "write tests", "nothing to see"],
+                skills_used={"systematic-debugging"},
+                session_date=datetime.now() - timedelta(days=2),
+            ),
+        ]
+
+    def test_consumers_match_unshared_results(self, sessions, tdd_skill, debugging_skill):
+        skills = [tdd_skill, debugging_skill]
+        matrix = MatchMatrix(sessions, skills)
+
+        assert detect_missed_opportunities(sessions, skills, matrix=matrix) == \
+            detect_missed_opportunities(sessions, skills)
+        for skill in skills:
+            assert collect_usage.classify_skill(skill, sessions, matrix) == collect_usage.classify_skill(skill, sessions)
+        shared, _ = analyze_jsonl(skills, [], [], sessions, matrix)
+        unshared, _ = analyze_jsonl(skills, [], [], sessions)
+        assert [(m.prompt, m.matched_item.name, m.matched_triggers, m.confidence) for m in shared] == \
+            [(m.prompt, m.matched_item.name, m.matched_triggers, m.confidence) for m in unshared]
+
+    def test_prompts_are_matched_once(self, sessions, tdd_skill, debugging_skill, monkeypatch):
+        skills = [tdd_skill, debugging_skill]
+        calls = []
+        original = collect_usage.find_matches
+        monkeypatch.setattr(collect_usage, "find_matches", lambda prompt, *a, **kw: calls.append(prompt) or original(prompt, *a, **kw))
+
+        matrix = MatchMatrix(sessions, skills)
+        detect_missed_opportunities(sessions, skills, matrix=matrix)
+        analyze_jsonl(skills, [], [], sessions, matrix)
+        for skill in skills:
+            collect_usage.classify_skill(skill, sessions, matrix)
+
+        assert calls == [p for s in sessions for p in s.prompts]
+
+    def test_item_matches_applies_threshold(self, sessions, tdd_skill):
+        matrix = MatchMatrix(sessions, [tdd_skill])
+
+        all_matches = matrix.item_matches(tdd_skill, sessions[0], min_confidence=float("-inf"))
+        assert [p for p, _ in all_matches] == ["help me write tests using test driven development"]
+        assert matrix.item_matches(tdd_skill, sessions[0], min_confidence=1.0) == []
@@ -12,6 +12,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
 sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
 
+import collect_usage
+import generate_session_summary
 from generate_session_summary import detect_outcome as detect_outcome_hook
 from collect_usage import detect_outcome as detect_outcome_collector
 
@@ -188,6 +190,55 @@ class TestEdgeCases:
         assert detect_outcome("UnknownTool", result) == "failure"
 
 
+class TestContentLists:
+    """tool_result content can be a list of content blocks."""
+
+    def test_text_blocks_are_checked(self, detect_outcome):
+        result = [{"type": "text", "text": "Running build"}, {"type": "text", "text": "Exit code: 1"}]
+        assert detect_outcome("Bash", result) == "failure"
+
+    def test_success_marker_in_any_block(self, detect_outcome):
+        result = [{"type": "text", "text": "warning: failed to cache"}, {"type": "text", "text": "Exit code: 0"}]
+        assert detect_outcome("Bash", result) == "success"
+
+    def test_markers_do_not_span_blocks(self, detect_outcome):
+        result = [{"type": "text", "text": "fai"}, {"type": "text", "text": "led"}]
+        assert detect_outcome("Read", result) == "success"
+
+    def test_non_text_blocks_are_ignored(self, detect_outcome):
+        result = [{"type": "image", "source": {"data": "error"}}, "failed", {"type": "text", "text": None}]
+        assert detect_outcome("Read", result) == "success"
+
+    def test_empty_list_success(self, detect_outcome):
+        assert detect_outcome("Edit", []) == "success"
+
+
+class TestBoundedWindow:
+    """Only the head and tail of very long results are searched."""
+
+    @pytest.fixture
+    def padding(self):
+        return "x" * (3 * collect_usage.OUTCOME_WINDOW_CHARS)
+
+    def test_marker_at_head(self, detect_outcome, padding):
+        assert detect_outcome("Bash", "Traceback (most recent call last):\n" + padding) == "failure"
+
+    def test_marker_at_tail(self, detect_outcome, padding):
+        assert detect_outcome("Bash", padding + "\nExit code: 1") == "failure"
+
+    def test_marker_in_the_middle_is_not_read(self, detect_outcome, padding):
+        assert detect_outcome("Read", padding + " error " + padding) == "success"
+
+    def test_windows_do_not_join_into_a_marker(self, detect_outcome, padding):
+        window = collect_usage.OUTCOME_WINDOW_CHARS
+        result = "y" * (window - 3) + "err" + padding + "or" + "y" * (window - 2)
+        assert detect_outcome("Read", result) == "success"
+
+    def test_result_within_both_windows_is_read_whole(self, detect_outcome):
+        half = "x" * collect_usage.OUTCOME_WINDOW_CHARS
+        assert detect_outcome("Read", half + "error" + half[5:]) == "failure"
+
+
 class TestImplementationParity:
     """Verify both implementations behave identically."""
 
@@ -208,3 +259,9 @@ class TestImplementationParity:
         hook_result = detect_outcome_hook(tool, result)
         collector_result = detect_outcome_collector(tool, result)
         assert hook_result == collector_result == expected
+
+    @pytest.mark.parametrize("name", [
+        "OUTCOME_WINDOW_CHARS", "BASH_SUCCESS_MARKERS", "BASH_FAILURE_MARKERS", "EDIT_FAILURE_MARKERS", "FAILURE_MARKERS",
+    ])
+    def test_markers_match(self, name):
+        assert getattr(generate_session_summary, name) == getattr(collect_usage, name)
@@ -0,0 +1,122 @@
+"""Tests for parallel session parsing (--jobs)."""
+
+import json
+import multiprocessing
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+import collect_usage
+from collect_usage import PARALLEL_MIN_SESSIONS, Deadline, parse_session_file, parse_sessions
+
+pytestmark = pytest.mark.usefixtures("json_backend")
+
+
+def _write_session(path: Path, n: int) -> Path:
+    entries = [{"type": "user", "message": {"content": f"prompt {n}"}}]
+    for i in range(n % 4):
+        entries.append({
+            "type": "assistant",
+            "message": {"content": [{"type": "tool_use", "id": f"t{i}", "name": "Skill", "input": {"skill": f"skill-{n}"}}]},
+        })
+        entries.append({
+            "type": "user",
+            "message": {"content": [{"type": "tool_result", "tool_use_id": f"t{i}", "content": "Exit code: 1"}]},
+        })
+    path.write_text("\n".join(json.dumps(e) for e in entries))
+    return path
+
+
+def _slow_job(job):
+    time.sleep(0.25)
+    return collect_usage.parse_session_file(job[0], job[1]), job[1]
+
+
+def _summary(session) -> tuple:
+    return (
+        session.session_id,
+        session.prompts,
+        sorted(session.skills_used),
+        session.success_count,
+        session.failure_count,
+        session.entries_total,
+        session.entries_parsed,
+    )
+
+
+@pytest.fixture
+def session_files(tmp_path):
+    return [_write_session(tmp_path / f"{i:08d}-session.jsonl", i) for i in range(PARALLEL_MIN_SESSIONS * 2)]
+
+
+def test_parallel_matches_serial_order(session_files):
+    serial = [parse_session_file(f) for f in session_files]
+    parallel = parse_sessions(session_files, jobs=3)
+
+    assert [_summary(s) for s in parallel] == [_summary(s) for s in serial]
+
+
+def test_small_inputs_parse_serially(tmp_path, monkeypatch):
+    files = [_write_session(tmp_path / f"{i:08d}.jsonl", i) for i in range(PARALLEL_MIN_SESSIONS - 1)]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("process pool should not be used for small inputs")
+
+    monkeypatch.setattr(collect_usage, "ProcessPoolExecutor", fail)
+
+    assert len(parse_sessions(files, jobs=8)) == len(files)
+
+
+def test_single_job_parses_serially(session_files, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("process pool should not be used with jobs=1")
+
+    monkeypatch.setattr(collect_usage, "ProcessPoolExecutor", fail)
+
+    assert len(parse_sessions(session_files, jobs=1)) == len(session_files)
+
+
+def test_falls_back_to_serial_when_pool_unavailable(session_files, monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise OSError("no semaphores")
+
+    monkeypatch.setattr(collect_usage, "ProcessPoolExecutor", unavailable)
+
+    sessions = parse_sessions(session_files, jobs=4)
+
+    assert [s.session_id for s in sessions] == [f.stem[:8] for f in session_files]
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="workers must inherit the patched job")
+def test_deadline_does_not_wait_for_sessions_in_flight(session_files, monkeypatch):
+    monkeypatch.setattr(collect_usage, "_parse_session_job", _slow_job)
+    deadline = Deadline(1.0)  # Parsing stops after 0.6s, in the middle of the third pair of sessions
+
+    started = time.monotonic()
+    sessions = parse_sessions(session_files, jobs=2, deadline=deadline)
+
+    assert time.monotonic() - started < 0.9
+    assert [s.session_id for s in sessions] == [f.stem[:8] for f in session_files[:4]]
+    assert not multiprocessing.active_children()
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="workers must inherit the patched job")
+def test_deadline_leaves_other_child_processes_running(session_files, monkeypatch):
+    monkeypatch.setattr(collect_usage, "_parse_session_job", _slow_job)
+    other = multiprocessing.Process(target=time.sleep, args=(5,))
+    # Started by another thread while sessions are being parsed
+    starter = threading.Timer(0.1, other.start)
+    starter.start()
+    try:
+        parse_sessions(session_files, jobs=2, deadline=Deadline(1.0))
+        starter.join()
+
+        assert other.is_alive()
+        assert multiprocessing.active_children() == [other]
+    finally:
+        other.terminate()
+        other.join()
@@ -6,6 +6,9 @@ Requirements:
 - Add per_project section to JSON output
 """
 
+import json
+import os
+import subprocess
 import sys
 from pathlib import Path
 
@@ -15,9 +18,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-
 from collect_usage import (
     SkillOrAgent,
     SessionData,
+    compute_per_project_breakdown,
+    find_all_project_sessions,
     generate_analysis_json,
+    parse_sessions,
+    project_path_for_folder,
     SetupProfile,
 )
+import collect_usage
 
 
 @pytest.fixture
@@ -216,3 +224,71 @@ class TestProjectPathNotUnknown:
         result = compute_per_project_breakdown([s1])
         assert "unknown" not in result
         assert "/Users/foo/my-project" in result
+
+
+class TestAllProjects:
+    """--all-projects: sessions from every project folder, labelled by project path."""
+
+    def _make_projects(self, tmp_path):
+        projects = tmp_path / "projects"
+        layout = {"-work-alpha": [5, 1, 3], "-work-beta": [4, 2], "-work-empty": []}
+        for folder, mtimes in layout.items():
+            (projects / folder).mkdir(parents=True)
+            for i, mtime in enumerate(mtimes):
+                path = projects / folder / f"{folder[-4:]}{i:04d}.jsonl"
+                path.write_text(json.dumps({"type": "user", "message": {"content": f"{folder} {i}"}}) + "\n")
+                os.utime(path, (1_700_000_000 + mtime, 1_700_000_000 + mtime))
+        return projects
+
+    def test_sessions_are_merged_newest_first(self, tmp_path):
+        found = find_all_project_sessions(self._make_projects(tmp_path), None)
+
+        assert [(project, path.name) for project, path in found] == [
+            ("/work/alpha", "lpha0000.jsonl"),
+            ("/work/beta", "beta0000.jsonl"),
+            ("/work/alpha", "lpha0002.jsonl"),
+            ("/work/beta", "beta0001.jsonl"),
+            ("/work/alpha", "lpha0001.jsonl"),
+        ]
+
+    def test_session_limit_applies_per_project(self, tmp_path):
+        found = find_all_project_sessions(self._make_projects(tmp_path), 1)
+
+        assert [project for project, _ in found] == ["/work/alpha", "/work/beta"]
+
+    def test_parsed_sessions_fill_per_project(self, tmp_path):
+        found = find_all_project_sessions(self._make_projects(tmp_path), None)
+        sessions = parse_sessions([path for _, path in found], project_paths=[project for project, _ in found])
+
+        breakdown = compute_per_project_breakdown(sessions)
+        assert {project: data["sessions"] for project, data in breakdown.items()} == {"/work/alpha": 3, "/work/beta": 2}
+
+    def test_project_path_comes_from_transcript_cwd(self, tmp_path):
+        folder = tmp_path / "-work-my-app"
+        folder.mkdir()
+        (folder / "s1.jsonl").write_text(
+            json.dumps({"type": "summary", "summary": "x"}) + "\n"
+            + json.dumps({"type": "user", "cwd": "/work/my-app", "message": {"content": "hi"}}) + "\n"
+        )
+
+        assert project_path_for_folder(folder) == "/work/my-app"
+        assert project_path_for_folder(tmp_path / "-gone-project") == "/gone/project"
+
+    def test_local_components_of_the_cwd_are_not_analyzed(self, tmp_path):
+        home = tmp_path / "home"
+        self._make_projects(home / ".claude")
+        for root, name in ((home / ".claude", "global-skill"), (tmp_path / "cwd" / ".claude", "local-skill")):
+            skill_dir = root / "skills" / name
+            skill_dir.mkdir(parents=True)
+            (skill_dir / "SKILL.md").write_text(f"---\nname: {name}\ndescription: Use for {name}\n---\n")
+        (tmp_path / "cwd" / "CLAUDE.md").write_text("# Local rules\n")
+
+        result = subprocess.run(
+            [sys.executable, collect_usage.__file__, "--all-projects", "--format", "json", "--no-cache", "--offline"],
+            cwd=tmp_path / "cwd", capture_output=True, text=True, check=True, env={**os.environ, "HOME": str(home)},
+        )
+
+        output = json.loads(result.stdout)
+        assert [s["name"] for s in output["discovery"]["skills"]] == ["global-skill"]
+        assert output["claude_md"]["files_found"] == []
+        assert set(output["per_project"]) == {"/work/alpha", "/work/beta"}
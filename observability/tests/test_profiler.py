@@ -0,0 +1,134 @@
+"""Tests for the collector's phase timers and work counters (--profile)."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+import collect_usage
+from collect_usage import Profiler, SkillOrAgent, _similar_pairs, find_matches, parse_sessions
+
+
+@pytest.fixture(autouse=True)
+def fresh_profiler():
+    collect_usage._profiler.reset()
+    yield collect_usage._profiler
+    collect_usage._profiler.reset()
+
+
+def _skill(name: str, triggers: list[str]) -> SkillOrAgent:
+    return SkillOrAgent(name=name, type="skill", description="", triggers=triggers,
+                        source_path=f"/{name}", source_type="global")
+
+
+class TestProfiler:
+    def test_phases_accumulate(self):
+        profiler = Profiler()
+        with profiler.phase("parse"):
+            pass
+        with profiler.phase("parse"):
+            pass
+        with profiler.phase("match"):
+            pass
+
+        report = profiler.to_dict()
+
+        assert list(report["phases_seconds"]) == ["parse", "match"]
+        assert all(seconds >= 0 for seconds in report["phases_seconds"].values())
+        assert report["total_seconds"] >= sum(report["phases_seconds"].values())
+
+    def test_phase_is_timed_when_it_raises(self):
+        profiler = Profiler()
+        with pytest.raises(ValueError):
+            with profiler.phase("broken"):
+                raise ValueError
+
+        assert "broken" in profiler.to_dict()["phases_seconds"]
+
+    def test_counters_are_sorted_and_json_serializable(self):
+        profiler = Profiler()
+        profiler.count("regex_evaluations", 5)
+        profiler.count("files_read")
+        profiler.count("files_read")
+
+        report = json.loads(json.dumps(profiler.to_dict()))
+
+        assert report["counters"] == {"files_read": 2, "regex_evaluations": 5}
+
+    def test_reset_clears_everything(self):
+        profiler = Profiler()
+        profiler.count("files_read")
+        with profiler.phase("parse"):
+            pass
+
+        profiler.reset()
+
+        assert profiler.to_dict()["phases_seconds"] == {}
+        assert profiler.to_dict()["counters"] == {}
+
+    def test_report_goes_to_stderr(self, capsys):
+        profiler = Profiler()
+        profiler.count("session_files_parsed", 3)
+        with profiler.phase("session_parsing"):
+            pass
+
+        profiler.report()
+
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "session_parsing" in captured.err
+        assert "session_files_parsed" in captured.err
+
+
+class TestCounters:
+    def test_find_matches_counts_regex_evaluations(self, fresh_profiler):
+        items = [_skill("debugging", ["debug this", "debugging"]), _skill("testing", ["run tests"])]
+
+        find_matches("please debug this", items)
+
+        assert fresh_profiler.counters["regex_evaluations"] == 1
+
+    def test_similar_pairs_counts_compared_pairs(self, fresh_profiler):
+        stem_sets = [frozenset({"review", "code"}), frozenset({"review"}), frozenset({"deploy"})]
+
+        list(_similar_pairs(stem_sets, 0.4))
+
+        assert fresh_profiler.counters["trigger_pairs_compared"] == 1
+
+    def test_parse_sessions_counts_files_bytes_and_cache_hits(self, tmp_path, fresh_profiler):
+        files = []
+        for i in range(3):
+            path = tmp_path / f"{i:08d}.jsonl"
+            path.write_text(json.dumps({"type": "user", "message": {"content": f"prompt {i}"}}) + "\n")
+            files.append(path)
+        cache_dir = tmp_path / "cache"
+        parse_sessions(files[:1], cache_dir=cache_dir)
+        fresh_profiler.reset()
+
+        parse_sessions(files, cache_dir=cache_dir)
+
+        assert fresh_profiler.counters["session_cache_hits"] == 1
+        assert fresh_profiler.counters["session_files_parsed"] == 2
+        assert fresh_profiler.counters["session_bytes_parsed"] == sum(f.stat().st_size for f in files[1:])
+
+
+class TestJsonOutput:
+    def _collect(self, home: Path, *args: str) -> dict:
+        result = subprocess.run(
+            [sys.executable, collect_usage.__file__, "--project", str(home / "proj"), "--format", "json",
+             "--no-cache", "--offline", *args],
+            cwd=home, capture_output=True, text=True, check=True, env={**os.environ, "HOME": str(home)},
+        )
+        return json.loads(result.stdout)
+
+    def test_timings_only_with_profile(self, tmp_path):
+        assert "_run" not in self._collect(tmp_path)
+
+        output = self._collect(tmp_path, "--profile")
+
+        assert list(output)[-1] == "_run"
+        assert "output" in output["_run"]["performance"]["phases_seconds"]
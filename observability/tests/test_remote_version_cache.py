@@ -0,0 +1,231 @@
+"""Tests for concurrent, cached remote version checks against a local GitHub API stand-in."""
+
+import base64
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+import collect_usage
+from collect_usage import check_outdated_plugins, fetch_remote_version
+
+
+class FakeContentsAPI:
+    """Serves /repos/<repo>/contents/<plugin>/.claude-plugin/plugin.json with ETags."""
+
+    def __init__(self, delay: float = 0.0):
+        self.versions: dict[str, str] = {}
+        self.requests: list[tuple[str, str | None]] = []
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def etag(self, plugin: str) -> str:
+        return f'"{plugin}-{self.versions[plugin]}"'
+
+    def handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with api.lock:
+                    api.requests.append((self.path, self.headers.get("If-None-Match")))
+                    api.in_flight += 1
+                    api.max_in_flight = max(api.max_in_flight, api.in_flight)
+                try:
+                    time.sleep(api.delay)
+                    plugin = self.path.split("/contents/", 1)[1].split("/", 1)[0]
+                    if plugin not in api.versions:
+                        self.send_response(404)
+                        self.end_headers()
+                        return
+                    if self.headers.get("If-None-Match") == api.etag(plugin):
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+                    content = base64.b64encode(json.dumps({"version": api.versions[plugin]}).encode()).decode()
+                    body = json.dumps({"content": content}).encode()
+                    self.send_response(200)
+                    self.send_header("ETag", api.etag(plugin))
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with api.lock:
+                        api.in_flight -= 1
+
+        return Handler
+
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeContentsAPI()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), fake.handler())
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    monkeypatch.setattr(collect_usage, "GITHUB_API_BASE", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setenv("NO_PROXY", "*")
+    yield fake
+    server.shutdown()
+    server.server_close()
+
+
+def _install(tmp_path: Path, plugins: dict[str, str]) -> tuple[Path, Path]:
+    cache = tmp_path / "plugins"
+    for name, version in plugins.items():
+        pjson = cache / "test-mp" / name / version / ".claude-plugin"
+        pjson.mkdir(parents=True)
+        (pjson / "plugin.json").write_text(json.dumps({"version": version}))
+    mp_dir = cache / "test-mp" / ".claude-plugin"
+    mp_dir.mkdir(parents=True)
+    (mp_dir / "marketplace.json").write_text(json.dumps({
+        "plugins": [{"name": name, "source": f"./{name}"} for name in plugins],
+    }))
+    settings = tmp_path / "settings.json"
+    settings.write_text(json.dumps({
+        "extraKnownMarketplaces": {"test-mp": {"source": {"source": "github", "repo": "owner/repo"}}},
+    }))
+    return cache, settings
+
+
+def _age_cache(cache_file: Path, seconds: float) -> None:
+    data = json.loads(cache_file.read_text())
+    for entry in data["entries"].values():
+        entry["fetched_at"] -= seconds
+    cache_file.write_text(json.dumps(data))
+
+
+def test_findings_keep_plugin_order_under_concurrency(api, tmp_path, monkeypatch):
+    names = [f"plugin-{i:02d}" for i in range(12)]
+    api.versions = {name: "2.0.0" for name in names}
+    api.delay = 0.05
+    monkeypatch.setattr(collect_usage, "GITHUB_API_MAX_WORKERS", 4)
+    cache, settings = _install(tmp_path, {name: "1.0.0" for name in names})
+
+    result = check_outdated_plugins(cache, settings)
+
+    assert [f["plugin"] for f in result] == names
+    assert 1 < api.max_in_flight <= 4
+
+
+def test_fresh_cache_entries_skip_the_network(api, tmp_path):
+    api.versions = {"plugin-a": "2.0.0"}
+    cache, settings = _install(tmp_path, {"plugin-a": "1.0.0"})
+    cache_file = tmp_path / "remote-versions.json"
+
+    first = check_outdated_plugins(cache, settings, cache_file)
+    second = check_outdated_plugins(cache, settings, cache_file)
+
+    assert first == second
+    assert second[0]["latest_version"] == "2.0.0"
+    assert len(api.requests) == 1
+
+
+def test_expired_entry_is_revalidated_with_etag(api, tmp_path):
+    api.versions = {"plugin-a": "2.0.0"}
+    cache, settings = _install(tmp_path, {"plugin-a": "1.0.0"})
+    cache_file = tmp_path / "remote-versions.json"
+    check_outdated_plugins(cache, settings, cache_file)
+    _age_cache(cache_file, collect_usage.REMOTE_VERSION_TTL_SECONDS + 1)
+
+    result = check_outdated_plugins(cache, settings, cache_file)
+
+    assert result[0]["latest_version"] == "2.0.0"
+    assert api.requests[1][1] == api.etag("plugin-a")
+    entry = next(iter(json.loads(cache_file.read_text())["entries"].values()))
+    assert time.time() - entry["fetched_at"] < collect_usage.REMOTE_VERSION_TTL_SECONDS
+
+
+def test_changed_remote_replaces_expired_entry(api, tmp_path):
+    api.versions = {"plugin-a": "2.0.0"}
+    cache, settings = _install(tmp_path, {"plugin-a": "1.0.0"})
+    cache_file = tmp_path / "remote-versions.json"
+    check_outdated_plugins(cache, settings, cache_file)
+    _age_cache(cache_file, collect_usage.REMOTE_VERSION_TTL_SECONDS + 1)
+    api.versions["plugin-a"] = "3.0.0"
+
+    result = check_outdated_plugins(cache, settings, cache_file)
+
+    assert result[0]["latest_version"] == "3.0.0"
+
+
+def test_offline_serves_stale_entries_without_requests(api, tmp_path):
+    api.versions = {"plugin-a": "2.0.0"}
+    cache, settings = _install(tmp_path, {"plugin-a": "1.0.0"})
+    cache_file = tmp_path / "remote-versions.json"
+    check_outdated_plugins(cache, settings, cache_file)
+    _age_cache(cache_file, 30 * 24 * 60 * 60)
+    requests_before = len(api.requests)
+
+    result = check_outdated_plugins(cache, settings, cache_file, offline=True)
+
+    assert [f["latest_version"] for f in result] == ["2.0.0"]
+    assert len(api.requests) == requests_before
+
+
+def test_offline_without_cache_entry_reports_nothing(api, tmp_path):
+    api.versions = {"plugin-a": "2.0.0"}
+    cache, settings = _install(tmp_path, {"plugin-a": "1.0.0"})
+
+    assert check_outdated_plugins(cache, settings, tmp_path / "remote-versions.json", offline=True) == []
+    assert api.requests == []
+
+
+def test_failed_revalidation_falls_back_to_cached_version(api, tmp_path):
+    url = f"{collect_usage.GITHUB_API_BASE}/repos/owner/repo/contents/gone/.claude-plugin/plugin.json"
+    cache = {url: {"version": "2.0.0", "etag": '"old"', "fetched_at": 0}}
+
+    assert fetch_remote_version(url, cache) == "2.0.0"
+    assert api.requests == [("/repos/owner/repo/contents/gone/.claude-plugin/plugin.json", '"old"')]
+
+
+def test_corrupt_cache_file_is_ignored(api, tmp_path):
+    api.versions = {"plugin-a": "2.0.0"}
+    cache, settings = _install(tmp_path, {"plugin-a": "1.0.0"})
+    cache_file = tmp_path / "remote-versions.json"
+    cache_file.write_text("{truncated")
+
+    result = check_outdated_plugins(cache, settings, cache_file)
+
+    assert result[0]["latest_version"] == "2.0.0"
+    assert json.loads(cache_file.read_text())["entries"]
+
+
+def test_deadline_bounds_all_checks_together(api, tmp_path, monkeypatch):
+    names = [f"plugin-{i:02d}" for i in range(16)]
+    api.versions = {name: "2.0.0" for name in names}
+    monkeypatch.setattr(collect_usage, "GITHUB_API_MAX_WORKERS", 4)
+    cache, settings = _install(tmp_path, {name: "1.0.0" for name in names})
+    cache_file = tmp_path / "remote-versions.json"
+    check_outdated_plugins(cache, settings, cache_file)
+    _age_cache(cache_file, collect_usage.REMOTE_VERSION_TTL_SECONDS + 1)
+    cached_fetch = collect_usage.fetch_remote_version
+
+    def trickling_fetch(api_url, cache=None, offline=False, timeout=None):
+        if not offline:
+            time.sleep(0.3)  # Each read within the socket timeout, so the request as a whole is not bounded
+        return cached_fetch(api_url, cache, offline=True)
+
+    monkeypatch.setattr(collect_usage, "fetch_remote_version", trickling_fetch)
+    deadline = collect_usage.Deadline(0.5)
+
+    started = time.monotonic()
+    result = check_outdated_plugins(cache, settings, cache_file, deadline=deadline)
+
+    assert time.monotonic() - started < 0.7  # Four waves of four requests would take 1.2s
+    assert [f["latest_version"] for f in result] == ["2.0.0"] * len(names)
+    assert deadline.skipped == [{
+        "phase": "freshness_checks",
+        "skipped": "12 of 16 remote plugin version checks (cached versions used)",
+        "checks_completed": 4,
+        "checks_skipped": 12,
+    }]
@@ -5,10 +5,13 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
 
+import random
+
 import pytest
 from collect_usage import (
     tokenize_and_stem,
     _jaccard_similarity,
+    _similar_pairs,
     compute_setup_profile,
     SkillOrAgent,
     Hook,
@@ -354,3 +357,34 @@ class TestDelegationPatternDetection:
         assert len(delegation_patterns) == 0
         if semantic:
             assert semantic[0]["classification"] == "SEMANTIC"
+
+
+class TestSimilarPairs:
+    """The stem inverted index yields exactly what the all-pairs scan finds, in the same order."""
+
+    @staticmethod
+    def _exhaustive(stem_sets, threshold):
+        return [
+            (i, j, _jaccard_similarity(stem_sets[i], stem_sets[j]))
+            for i in range(len(stem_sets))
+            for j in range(i + 1, len(stem_sets))
+            if _jaccard_similarity(stem_sets[i], stem_sets[j]) >= threshold
+        ]
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_exhaustive_scan(self, seed):
+        rng = random.Random(seed)
+        vocab = [f"w{n}" for n in range(12)]
+        stem_sets = [frozenset(rng.sample(vocab, rng.randint(1, 4))) for _ in range(60)]
+
+        assert list(_similar_pairs(stem_sets, SEMANTIC_THRESHOLD)) == self._exhaustive(stem_sets, SEMANTIC_THRESHOLD)
+
+    def test_disjoint_sets_are_never_scored(self):
+        stem_sets = [frozenset({"a"}), frozenset({"b"}), frozenset({"a", "c"})]
+
+        assert list(_similar_pairs(stem_sets, 0.4)) == [(0, 2, 0.5)]
+
+    def test_zero_threshold_falls_back_to_all_pairs(self):
+        stem_sets = [frozenset({"a"}), frozenset({"b"})]
+
+        assert list(_similar_pairs(stem_sets, 0.0)) == [(0, 1, 0.0)]
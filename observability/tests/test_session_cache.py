@@ -0,0 +1,115 @@
+"""Tests for the persistent per-session parse cache."""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+import collect_usage
+from collect_usage import (
+    parse_session_file,
+    parse_sessions,
+    session_from_dict,
+    session_to_dict,
+)
+
+
+ENTRIES = [
+    {"type": "user", "message": {"content": "please debug this"}},
+    {"type": "assistant", "timestamp": 1.0, "message": {"content": [
+        {"type": "tool_use", "id": "t1", "name": "Skill", "input": {"skill": "debugging"}},
+        {"type": "tool_use", "id": "t2", "name": "Bash", "input": {"command": "pytest"}},
+    ]}},
+    {"type": "user", "message": {"content": [{"type": "tool_result", "tool_use_id": "t1", "content": "ok"}]}},
+    {"type": "user", "timestamp": 5.0, "message": {"content": "[Request interrupted by user]"}},
+    {"type": "user", "message": {"content": "stop running tests"}},
+    {"type": "system", "subtype": "compact_boundary"},
+    "not json",
+]
+
+
+def _write_session(path: Path, entries=ENTRIES) -> Path:
+    path.write_text("\n".join(e if isinstance(e, str) else json.dumps(e) for e in entries) + "\n")
+    return path
+
+
+def _fail_parse(path):
+    raise AssertionError(f"{path} should have been served from cache")
+
+
+def test_round_trip_preserves_session_data(tmp_path):
+    session = parse_session_file(_write_session(tmp_path / "abcdef12-session.jsonl"))
+    session.project_path = "/work/project"
+
+    restored = session_from_dict(json.loads(json.dumps(session_to_dict(session))))
+
+    assert vars(restored).keys() == vars(session).keys()
+    for name in ("session_id", "prompts", "skills_used", "tools_used", "success_count",
+                 "failure_count", "interrupted_count", "compaction_count", "entries_total",
+                 "entries_parsed", "entries_skipped", "parsing_errors", "session_date", "project_path"):
+        assert getattr(restored, name) == getattr(session, name), name
+    assert [vars(it) for it in restored.interrupted_tools] == [vars(it) for it in session.interrupted_tools]
+    assert restored.recency_weight == pytest.approx(session.recency_weight)
+
+
+def test_unchanged_sessions_are_served_from_cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    files = [_write_session(tmp_path / f"{i:08d}.jsonl") for i in range(3)]
+    first = parse_sessions(files, cache_dir=cache_dir)
+
+    monkeypatch.setattr(collect_usage, "parse_session_file", _fail_parse)
+    second = parse_sessions(files, cache_dir=cache_dir)
+
+    assert [session_to_dict(s) for s in second] == [session_to_dict(s) for s in first]
+
+
+def test_modified_session_is_reparsed(tmp_path):
+    cache_dir = tmp_path / "cache"
+    session_file = _write_session(tmp_path / "session.jsonl")
+    parse_sessions([session_file], cache_dir=cache_dir)
+
+    with session_file.open("a") as f:
+        f.write(json.dumps({"type": "user", "message": {"content": "one more prompt"}}) + "\n")
+    st = session_file.stat()
+    os.utime(session_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    [session] = parse_sessions([session_file], cache_dir=cache_dir)
+
+    assert session.prompts[-1] == "one more prompt"
+
+
+def test_parser_version_bump_invalidates_cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    session_file = _write_session(tmp_path / "session.jsonl")
+    parse_sessions([session_file], cache_dir=cache_dir)
+
+    monkeypatch.setattr(collect_usage, "SESSION_PARSER_VERSION", collect_usage.SESSION_PARSER_VERSION + 1)
+    calls = []
+    monkeypatch.setattr(collect_usage, "parse_session_file", lambda p, *a: calls.append(p) or parse_session_file(p, *a))
+
+    parse_sessions([session_file], cache_dir=cache_dir)
+
+    assert calls == [session_file]
+
+
+def test_corrupt_cache_entry_is_ignored(tmp_path):
+    cache_dir = tmp_path / "cache"
+    session_file = _write_session(tmp_path / "session.jsonl")
+    parse_sessions([session_file], cache_dir=cache_dir)
+    for cache_file in cache_dir.glob("*.json"):
+        cache_file.write_text("{truncated")
+
+    [session] = parse_sessions([session_file], cache_dir=cache_dir)
+
+    assert session.prompts == ["please debug this", "stop running tests"]
+
+
+def test_no_cache_dir_writes_nothing(tmp_path):
+    session_file = _write_session(tmp_path / "session.jsonl")
+
+    parse_sessions([session_file])
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["session.jsonl"]
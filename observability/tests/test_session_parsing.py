@@ -11,8 +11,11 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+import generate_session_summary
 from generate_session_summary import parse_session_file, get_session_file
 
+pytestmark = pytest.mark.usefixtures("json_backend")
+
 
 def create_temp_session_file(entries: list[dict]) -> Path:
     """Create a temporary JSONL file with given entries."""
@@ -340,6 +343,53 @@ class TestGetSessionFile:
         result = get_session_file("abc123", "/nonexistent/project/path")
         assert result is None
 
+    @pytest.fixture
+    def project_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(generate_session_summary, "PROJECTS_DIR", tmp_path / "projects")
+        monkeypatch.setattr(generate_session_summary, "SESSION_INDEX_FILE", tmp_path / "session-index.json")
+        project_dir = tmp_path / "projects" / "-work-proj"
+        project_dir.mkdir(parents=True)
+        return project_dir
+
+    def test_direct_path_skips_directory_scan(self, project_dir, monkeypatch):
+        session_file = project_dir / "abc123.jsonl"
+        session_file.write_text("")
+        monkeypatch.setattr(Path, "glob", lambda *a: pytest.fail("directory should not be scanned"))
+
+        assert get_session_file("abc123", "/work/proj") == session_file
+
+    def test_fallback_scan_is_indexed(self, project_dir, monkeypatch):
+        session_file = project_dir / "agent-abc123.jsonl"
+        session_file.write_text("")
+
+        assert get_session_file("abc123", "/work/proj") == session_file
+
+        monkeypatch.setattr(Path, "glob", lambda *a: pytest.fail("indexed session should not be scanned for"))
+        assert get_session_file("abc123", "/work/proj") == session_file
+
+    def test_stale_index_entry_falls_back_to_scan(self, project_dir):
+        moved = project_dir / "old-abc123.jsonl"
+        moved.write_text("")
+        get_session_file("abc123", "/work/proj")
+        moved.unlink()
+        session_file = project_dir / "new-abc123.jsonl"
+        session_file.write_text("")
+
+        assert get_session_file("abc123", "/work/proj") == session_file
+
+    def test_index_keeps_newest_entries(self, project_dir, monkeypatch):
+        monkeypatch.setattr(generate_session_summary, "SESSION_INDEX_MAX_ENTRIES", 2)
+        for name in ("s1", "s2", "s3"):
+            (project_dir / f"x-{name}.jsonl").write_text("")
+            get_session_file(name, "/work/proj")
+
+        assert list(json.loads(generate_session_summary.SESSION_INDEX_FILE.read_text())) == ["s2", "s3"]
+
+    def test_unknown_session_returns_none(self, project_dir):
+        (project_dir / "other.jsonl").write_text("")
+
+        assert get_session_file("abc123", "/work/proj") is None
+
 
 class TestEdgeCases:
     """Tests for edge cases and error handling."""
@@ -384,3 +434,22 @@ class TestEdgeCases:
             assert stats["interrupted_count"] == 1
         finally:
             session_file.unlink()
+
+    def test_tool_result_content_list(self, tmp_path):
+        """Tool results with a list of content blocks count toward outcomes."""
+        entries = [
+            {"type": "assistant", "message": {"content": [
+                {"type": "tool_use", "id": "tool_1", "name": "Bash", "input": {"command": "make"}},
+                {"type": "tool_use", "id": "tool_2", "name": "Read", "input": {"file_path": "a.png"}},
+            ]}},
+            {"type": "user", "message": {"content": [
+                {"type": "tool_result", "tool_use_id": "tool_1", "content": [{"type": "text", "text": "Exit code: 2"}]},
+                {"type": "tool_result", "tool_use_id": "tool_2", "content": [{"type": "image", "source": {}}]},
+            ]}},
+        ]
+        session_file = tmp_path / "session.jsonl"
+        session_file.write_text("".join(json.dumps(entry) + "\n" for entry in entries))
+
+        stats = parse_session_file(session_file)
+
+        assert (stats["success_count"], stats["failure_count"]) == (1, 1)
@@ -0,0 +1,157 @@
+"""Tests for the SQLite session store (--store / --from-store)."""
+
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+import collect_usage
+from collect_usage import SessionStore, parse_session_file, parse_sessions, session_to_dict
+
+BASE = datetime(2026, 3, 1).timestamp()
+DAY = 86400
+
+
+def _entries(i: int) -> list[dict]:
+    return [
+        {"type": "user", "timestamp": "2026-03-01T10:00:00Z", "message": {"content": f"debug the failing test {i}"}},
+        {"type": "assistant", "message": {"content": [
+            {"type": "tool_use", "id": f"t{i}", "name": "Bash", "input": {"command": "pytest"}},
+            {"type": "tool_use", "id": f"s{i}", "name": "Skill", "input": {"skill": "debugging"}},
+            {"type": "tool_use", "id": f"a{i}", "name": "Task", "input": {"subagent_type": "reviewer"}},
+        ]}},
+        {"type": "user", "message": {"content": [
+            {"type": "tool_result", "tool_use_id": f"t{i}", "content": "[Request interrupted by user for tool use]"},
+        ]}},
+        {"type": "user", "message": {"content": "use unittest instead"}},
+    ]
+
+
+def _write_session(project_dir: Path, i: int, days: int) -> Path:
+    project_dir.mkdir(parents=True, exist_ok=True)
+    path = project_dir / f"{i:08d}.jsonl"
+    path.write_text("".join(json.dumps(e) + "\n" for e in _entries(i)))
+    mtime = BASE + days * DAY
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def store(tmp_path):
+    with SessionStore(tmp_path / "sessions.db") as store:
+        yield store
+
+
+def _stored(store: SessionStore, paths: list[Path]) -> None:
+    store.add_sessions([(path, parse_session_file(path)) for path in paths])
+
+
+def test_sessions_round_trip(tmp_path, store):
+    path = _write_session(tmp_path / "-work-proj", 1, 0)
+    parsed = parse_session_file(path)
+    parsed.project_path = "-work-proj"
+    parsed.hooks_triggered["PreToolUse"] = 2
+    store.add_sessions([(path, parsed)])
+
+    [loaded] = store.load_sessions("-work-proj", None)
+
+    assert session_to_dict(loaded) == session_to_dict(parsed)
+    assert loaded.interrupted_tools and loaded.skills_used and loaded.agents_used and loaded.hooks_triggered
+
+
+def test_unchanged_sessions_are_not_rewritten(tmp_path, store):
+    paths = [_write_session(tmp_path / "-work-proj", i, i) for i in range(3)]
+    _stored(store, paths)
+
+    assert store.add_sessions([(path, parse_session_file(path)) for path in paths]) == 0
+
+
+def test_changed_session_replaces_its_rows(tmp_path, store):
+    path = _write_session(tmp_path / "-work-proj", 1, 0)
+    _stored(store, [path])
+    with path.open("a") as f:
+        f.write(json.dumps({"type": "user", "message": {"content": "one more prompt"}}) + "\n")
+
+    reparsed = parse_session_file(path)
+    assert store.add_sessions([(path, reparsed)]) == 1
+
+    [loaded] = store.load_sessions("-work-proj", None)
+    assert loaded.prompts[-1] == "one more prompt"
+    assert store.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 1
+    assert store.conn.execute("SELECT COUNT(*) FROM interruptions").fetchone()[0] == len(reparsed.interrupted_tools)
+
+
+def test_selection_matches_transcript_selection(tmp_path, store):
+    projects = tmp_path / "projects"
+    for i in range(6):
+        _write_session(projects / "-work-a", i, i)
+        _write_session(projects / "-work-b", 10 + i, i)
+    _stored(store, sorted(projects.glob("*/*.jsonl")))
+    since, until = datetime.fromtimestamp(BASE + DAY), datetime.fromtimestamp(BASE + 5 * DAY)
+
+    single = store.load_sessions("-work-a", 3, since=since, until=until)
+    every = store.load_sessions(None, 2)
+
+    assert [s.session_id for s in single] == [
+        p.stem for p in collect_usage.find_project_sessions(projects, projects / "-work-a", 3, since=since, until=until)
+    ]
+    assert [(s.project_path, s.session_date is not None) for s in every] == [
+        (path.parent.name, True) for _, path in collect_usage.find_all_project_sessions(projects, 2)
+    ]
+
+
+def test_events_are_queryable_with_sql(tmp_path, store):
+    _stored(store, [_write_session(tmp_path / "-work-proj", i, i) for i in range(4)])
+
+    rows = store.conn.execute(
+        "SELECT kind, name, COUNT(DISTINCT session) FROM components WHERE kind != 'tool' GROUP BY kind, name ORDER BY kind"
+    ).fetchall()
+
+    assert rows == [("agent", "reviewer", 4), ("skill", "debugging", 4)]
+
+
+def test_quick_stats_aggregate_stored_sessions(tmp_path, store):
+    projects = tmp_path / "projects"
+    for i in range(4):
+        _write_session(projects / "-work-a", i, i)
+    _write_session(projects / "-work-b", 10, 3)
+    _stored(store, sorted(projects.glob("*/*.jsonl")))
+
+    stats = store.quick_stats(datetime.fromtimestamp(BASE + 2 * DAY))
+
+    recent = store.load_sessions(None, None, since=datetime.fromtimestamp(BASE + 2 * DAY))
+    assert stats["sessions"] == len(recent) == 3
+    assert (stats["total_success"], stats["total_failure"], stats["total_compactions"]) == (
+        sum(s.success_count for s in recent), sum(s.failure_count for s in recent),
+        sum(s.compaction_count for s in recent),
+    )
+    assert dict(stats["tool_breakdown"]) == {"Bash": 3}
+    assert stats["total_tools"] == 3
+    assert {project: data["sessions"] for project, data in stats["by_project"].items()} == {"-work-a": 2, "-work-b": 1}
+
+
+def test_older_store_version_is_rebuilt(tmp_path):
+    db = tmp_path / "sessions.db"
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE sessions (path TEXT)")
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+
+    with SessionStore(db) as store:
+        assert store.load_sessions(None, None) == []
+        assert store.conn.execute("PRAGMA user_version").fetchone()[0] == collect_usage.SESSION_STORE_VERSION
+
+
+def test_parse_sessions_records_into_store(tmp_path, store):
+    paths = [_write_session(tmp_path / "-work-proj", i, i) for i in range(3)]
+
+    parsed = parse_sessions(paths, store=store)
+
+    loaded = store.load_sessions("-work-proj", None)
+    assert sorted(s.session_id for s in loaded) == sorted(s.session_id for s in parsed)
@@ -14,9 +14,11 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
 from collect_usage import (
+    InvocationIndex,
     SkillOrAgent,
     SessionData,
     SkillClassification,
+    _was_component_invoked,
     classify_skill,
     find_matches,
 )
@@ -273,3 +275,43 @@ class TestOutputStructureClassification:
         assert len(output["discovery"]["agents"]) == 1
         assert "classification" in output["discovery"]["agents"][0]
         assert output["discovery"]["agents"][0]["classification"] == SkillClassification.ACTIVE
+
+
+class TestInvocationIndex:
+    """InvocationIndex agrees with _was_component_invoked for every (item, session)."""
+
+    @pytest.fixture
+    def items(self):
+        return [
+            SkillOrAgent(name="observability-usage-collector", type="skill", description="",
+                         triggers=["/collect-usage", "usage"], source_path="/p", source_type="plugin"),
+            SkillOrAgent(name="Explorer", type="agent", description="",
+                         triggers=["explore"], source_path="/p", source_type="global"),
+            SkillOrAgent(name="commit", type="command", description="",
+                         triggers=["/commit"], source_path="/p", source_type="global"),
+            SkillOrAgent(name="obs", type="skill", description="",
+                         triggers=["other"], source_path="/p", source_type="global"),
+        ]
+
+    @pytest.fixture
+    def sessions(self):
+        return [
+            SessionData(session_id="s1", skills_used={"observability:collect-usage"}),
+            SessionData(session_id="s2", agents_used={"explorer"}, skills_used={"/Commit"}),
+            SessionData(session_id="s3", skills_used={"obs:other-thing"}),
+            SessionData(session_id="s4"),
+        ]
+
+    def test_invoked_matches_reference(self, items, sessions):
+        index = InvocationIndex(sessions)
+
+        for item in items:
+            for session in sessions:
+                assert index.invoked(item, session) == _was_component_invoked(item, session), (item.name, session.session_id)
+
+    def test_sessions_invoking_in_session_order(self, items, sessions):
+        index = InvocationIndex(sessions)
+
+        assert [[s.session_id for s in index.sessions_invoking(item)] for item in items] == [
+            [s.session_id for s in sessions if _was_component_invoked(item, s)] for item in items
+        ]
@@ -0,0 +1,164 @@
+"""Tests for the streaming JSONL reader used by the collector's session parser.
+
+iter_jsonl_lines must yield exactly what read_text().strip().split("\\n")
+produced, so entries_total/entries_parsed accounting (ADR-026) is unchanged.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+import collect_usage
+from collect_usage import iter_jsonl_lines, parse_session_file, session_to_dict
+
+pytestmark = pytest.mark.usefixtures("json_backend")
+
+
+def _legacy_lines(path: Path) -> list[bytes]:
+    return [line.encode() for line in path.read_text().strip().split("\n")]
+
+
+CONTENTS = [
+    "",
+    "\n\n  \n",
+    '{"a": 1}',
+    '{"a": 1}\n',
+    '{"a": 1}\n{"b": 2}\n\n\n',
+    '\n\n  {"a": 1}  \n\n{"b": 2}\n  \n{bad\n',
+    '{"a": 1}\r\n{"b": 2}\r\n',
+    '{"a": 1}\n\n\n{"b": 2}',
+]
+
+
+@pytest.mark.parametrize("content", CONTENTS)
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1 << 20])
+def test_matches_legacy_split(tmp_path, content, chunk_size):
+    path = tmp_path / "session.jsonl"
+    path.write_bytes(content.encode())
+
+    assert list(iter_jsonl_lines(path, chunk_size=chunk_size)) == _legacy_lines(path)
+
+
+def test_line_longer_than_chunk(tmp_path):
+    """Lines spanning many chunks are reassembled intact."""
+    big = json.dumps({"type": "user", "message": {"content": "x" * 10_000}})
+    path = tmp_path / "session.jsonl"
+    path.write_text(big + "\n" + big + "\n")
+
+    lines = list(iter_jsonl_lines(path, chunk_size=64))
+
+    assert lines == [big.encode(), big.encode()]
+
+
+def test_reader_is_lazy(tmp_path):
+    """The first line is available before the rest of the file is consumed."""
+    path = tmp_path / "session.jsonl"
+    path.write_text("\n".join(json.dumps({"n": i}) for i in range(1000)))
+
+    it = iter_jsonl_lines(path, chunk_size=16)
+    assert json.loads(next(it)) == {"n": 0}
+
+
+class TestParseStatsUnchanged:
+    """entries_total/entries_parsed/parsing_errors match the pre-streaming parser."""
+
+    def test_blank_lines_between_entries_count_as_errors(self, tmp_path):
+        path = tmp_path / "session.jsonl"
+        path.write_text(
+            '\n{"type": "user", "message": {"content": "hello"}}\n'
+            "\n"
+            '{"type": "user", "message": {"content": "world"}}\n\n'
+        )
+
+        session = parse_session_file(path)
+
+        assert session.entries_total == 3
+        assert session.entries_parsed == 2
+        assert [e["line"] for e in session.parsing_errors] == [2]
+        assert session.prompts == ["hello", "world"]
+
+    def test_empty_file_counts_one_entry(self, tmp_path):
+        path = tmp_path / "session.jsonl"
+        path.write_text("")
+
+        session = parse_session_file(path)
+
+        assert session.entries_total == 1
+        assert session.entries_parsed == 0
+
+    def test_invalid_utf8_line_is_a_parse_error(self, tmp_path):
+        path = tmp_path / "session.jsonl"
+        path.write_bytes(b'{"type": "user", "message": {"content": "ok"}}\n{"x": "\xff\xfe"}\n')
+
+        session = parse_session_file(path)
+
+        assert session.entries_total == 2
+        assert session.entries_parsed == 1
+        assert session.parsing_errors[0]["line"] == 2
+
+
+def _never_map(*args, **kwargs):
+    pytest.fail("transcript was memory-mapped")
+
+
+class TestMemoryMappedReader:
+    """The collector maps large unread spans of full reads; lines and offsets must not change."""
+
+    @pytest.mark.parametrize("content", CONTENTS)
+    def test_matches_buffered_reads(self, tmp_path, content):
+        path = tmp_path / "session.jsonl"
+        path.write_bytes(content.encode())
+        size = len(content.encode())
+        buffered = [list(collect_usage.iter_lines_from(path, offset, chunk_size=3)) for offset in range(size + 2)]
+
+        assert [list(collect_usage._iter_mapped_lines(path, offset, min_bytes=1)) for offset in range(size + 2)] == buffered
+
+    def test_parse_results_unchanged(self, tmp_path, monkeypatch):
+        path = tmp_path / "session.jsonl"
+        path.write_text("".join(json.dumps(entry) + "\n" for entry in [
+            {"type": "user", "message": {"content": "run the tests"}},
+            {"type": "assistant", "message": {"content": [{"type": "tool_use", "id": "t1", "name": "Bash", "input": {"command": "pytest"}}]}},
+            {"type": "user", "message": {"content": [{"type": "tool_result", "tool_use_id": "t1", "content": "Exit code: 1"}]}},
+        ]) + '{"type": "user", "message": {"content": "still wri')
+        expected = session_to_dict(parse_session_file(path))
+        monkeypatch.setattr(collect_usage, "JSONL_MMAP_MIN_BYTES", 1)
+        mapped = []
+        original = collect_usage.mmap.mmap
+        monkeypatch.setattr(collect_usage.mmap, "mmap", lambda *a, **k: mapped.append(a) or original(*a, **k))
+
+        assert session_to_dict(parse_session_file(path)) == expected
+        assert mapped
+
+    def test_small_files_are_read_in_chunks(self, tmp_path, monkeypatch):
+        path = tmp_path / "session.jsonl"
+        path.write_bytes(b'{"a": 1}\n' * 10)
+        monkeypatch.setattr(collect_usage.mmap, "mmap", _never_map)
+
+        assert len(list(collect_usage._iter_mapped_lines(path))) == 11
+
+    def test_resumed_reads_are_not_mapped(self, tmp_path, monkeypatch):
+        # A mapped transcript truncated by a rewrite raises SIGBUS; live transcripts are read in chunks
+        path = tmp_path / "session.jsonl"
+        path.write_text(json.dumps({"type": "user", "message": {"content": "hi"}}) + "\n")
+        state = collect_usage.new_session_parse_state(path)
+        parse_session_file(path, state)
+        with path.open("a") as f:
+            f.write(json.dumps({"type": "user", "message": {"content": "again"}}) + "\n")
+        monkeypatch.setattr(collect_usage, "JSONL_MMAP_MIN_BYTES", 1)
+        monkeypatch.setattr(collect_usage.mmap, "mmap", _never_map)
+
+        assert parse_session_file(path, state).prompts == ["hi", "again"]
+
+    def test_falls_back_when_mapping_fails(self, tmp_path, monkeypatch):
+        path = tmp_path / "session.jsonl"
+        path.write_bytes(b'{"a": 1}\n{"b": 2}')
+
+        def unavailable(*args, **kwargs):
+            raise OSError("mmap not supported")
+
+        monkeypatch.setattr(collect_usage.mmap, "mmap", unavailable)
+
+        assert list(collect_usage._iter_mapped_lines(path, min_bytes=1)) == [(b'{"a": 1}', 9, True), (b'{"b": 2}', 17, False)]
@@ -0,0 +1,119 @@
+"""Tests for the SQLite session summary index behind --quick-stats."""
+
+import json
+import os
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+import collect_usage
+import generate_session_summary as hook
+from collect_usage import analyze_session_summaries, rebuild_summary_index
+
+
+def _summary(rng: random.Random, i: int) -> dict:
+    success = rng.randint(0, 20)
+    return {
+        "session_id": f"{i:08x}-session",
+        "project": rng.choice(["api", "web", "infra"]),
+        "session_type": rng.choice(["DEV", "READ", "DEBUG"]),
+        "total_tools": rng.randint(1, 40),
+        "tool_breakdown": {tool: rng.randint(1, 9) for tool in rng.sample(["Bash", "Read", "Edit", "Grep"], 2)},
+        "stages_visited": rng.sample(["research", "implement", "test", "commit"], rng.randint(0, 3)),
+        "outcomes": {"success": success, "failure": rng.randint(0, 3), "interrupted": 0},
+        "compactions": rng.randint(0, 2),
+    }
+
+
+def _write(summary_dir: Path, day: date, i: int, summary: dict) -> Path:
+    path = summary_dir / f"{day.isoformat()}_{i:08x}.json"
+    path.write_text(json.dumps(summary))
+    return path
+
+
+def _touch_dir(summary_dir: Path) -> None:
+    """Change the directory mtime even within one filesystem timestamp tick."""
+    mtime_ns = summary_dir.stat().st_mtime_ns + 1_000_000_000
+    os.utime(summary_dir, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def summary_dir(tmp_path):
+    summary_dir = tmp_path / "session-summaries"
+    summary_dir.mkdir()
+    rng = random.Random(3)
+    for i in range(80):
+        _write(summary_dir, date.today() - timedelta(days=rng.randint(0, 30)), i, _summary(rng, i))
+    (summary_dir / "notes.json").write_text("{}")
+    (summary_dir / f"{date.today().isoformat()}_broken.json").write_text("{truncated")
+    return summary_dir
+
+
+@pytest.fixture
+def index_file(tmp_path):
+    return tmp_path / "cache" / "summaries.db"
+
+
+@pytest.mark.parametrize("days", [0, 1, 7, 14, 400])
+def test_index_matches_file_scan(summary_dir, index_file, days):
+    assert analyze_session_summaries(summary_dir, days, index_file) == analyze_session_summaries(summary_dir, days)
+
+
+def test_index_is_built_once(summary_dir, index_file, monkeypatch):
+    analyze_session_summaries(summary_dir, 7, index_file)
+    monkeypatch.setattr(collect_usage, "rebuild_summary_index", lambda *a: pytest.fail("index should be reused"))
+
+    analyze_session_summaries(summary_dir, 7, index_file)
+
+
+def test_hook_upsert_keeps_index_current(summary_dir, index_file, monkeypatch):
+    analyze_session_summaries(summary_dir, 7, index_file)
+    monkeypatch.setattr(hook, "SUMMARY_INDEX_FILE", index_file)
+    summary = _summary(random.Random(9), 999)
+    summary_file = _write(summary_dir, date.today(), 999, summary)
+    hook.update_summary_index(summary_file, summary)
+    # The hook rewrites the same file on later Stops; the row is replaced, not duplicated
+    summary["total_tools"] += 5
+    summary_file.write_text(json.dumps(summary))
+    hook.update_summary_index(summary_file, summary)
+    monkeypatch.setattr(collect_usage, "rebuild_summary_index", lambda *a: pytest.fail("index should be current"))
+
+    stats = analyze_session_summaries(summary_dir, 7, index_file)
+
+    monkeypatch.undo()
+    assert stats == analyze_session_summaries(summary_dir, 7)
+
+
+def test_files_changed_outside_the_hook_trigger_a_rebuild(summary_dir, index_file):
+    analyze_session_summaries(summary_dir, 7, index_file)
+    _write(summary_dir, date.today(), 1000, _summary(random.Random(5), 1000))
+    _touch_dir(summary_dir)
+
+    assert analyze_session_summaries(summary_dir, 7, index_file) == analyze_session_summaries(summary_dir, 7)
+
+
+def test_unreadable_index_falls_back_to_files(summary_dir, index_file, capsys):
+    index_file.parent.mkdir(parents=True)
+    index_file.write_bytes(b"not a database" * 100)
+
+    stats = analyze_session_summaries(summary_dir, 7, index_file)
+
+    assert stats == analyze_session_summaries(summary_dir, 7)
+    assert "reading summary files" in capsys.readouterr().err
+
+
+def test_rebuild_counts_valid_summaries(summary_dir, index_file):
+    assert rebuild_summary_index(summary_dir, index_file) == 80
+
+
+def test_missing_summary_dir(tmp_path, index_file):
+    assert analyze_session_summaries(tmp_path / "missing", 7, index_file)["sessions"] == 0
+
+
+def test_index_versions_match():
+    assert hook.SUMMARY_INDEX_VERSION == collect_usage.SUMMARY_INDEX_VERSION
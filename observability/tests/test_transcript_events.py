@@ -0,0 +1,107 @@
+"""Tests for the transcript event walk shared by the collector and the session-summary hook."""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+import generate_session_summary as hook
+from collect_usage import (
+    Compaction,
+    Interruption,
+    Prompt,
+    ToolResult,
+    ToolUse,
+    entry_events,
+)
+
+pytestmark = pytest.mark.usefixtures("json_backend")
+
+
+def _transcript(seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    entries = []
+    for i in range(80):
+        kind = rng.choice(["prompt", "items", "tool", "result", "progress", "compact", "interrupt"])
+        if kind == "prompt":
+            entries.append({"type": "user", "message": {"content": rng.choice(["fix it", "  ", "<command-name>x"])}})
+        elif kind == "items":
+            entries.append({"type": "user", "timestamp": float(i), "message": {"content": [
+                {"type": "text", "text": rng.choice(["use pytest", "[Request interrupted by user]", ""])},
+                {"type": "tool_result", "tool_use_id": f"t{i - 1}", "content": "Exit code: 1"},
+                "stray",
+            ]}})
+        elif kind == "tool":
+            entries.append({"type": "assistant", "timestamp": float(i), "message": {"content": [
+                {"type": "text", "text": "calling a tool"},
+                {"type": "tool_use", "id": rng.choice([f"t{i}", ""]), "name": rng.choice(["Bash", "Skill", "Task", "Edit", ""]),
+                 "input": {"command": "git commit", "skill": "tdd", "subagent_type": "code-reviewer"}},
+            ]}})
+        elif kind == "result":
+            entries.append({"type": "user", "message": {"content": [
+                {"type": "tool_result", "tool_use_id": f"t{i - rng.randint(1, 4)}",
+                 "content": rng.choice(["ok", "Error: failed", [{"type": "text", "text": "ok"}]])},
+            ]}})
+        elif kind == "progress":
+            entries.append({"type": "progress", "data": {"tool_use_id": f"t{i}"}})
+        elif kind == "compact":
+            entries.append({"type": "system", "subtype": "compact_boundary"})
+        else:
+            entries.append({"type": "user", "timestamp": float(i), "message": {"content": "[Request interrupted by user]"}})
+    return entries
+
+
+@pytest.fixture(params=range(6))
+def transcript(request, tmp_path):
+    path = tmp_path / "session.jsonl"
+    path.write_text("".join(json.dumps(entry) + "\n" for entry in _transcript(request.param)))
+    return path
+
+
+class TestEntryEvents:
+    def test_tool_uses_in_content_order(self):
+        entry = {"type": "assistant", "timestamp": 2.0, "message": {"content": [
+            {"type": "tool_use", "id": "t1", "name": "Read", "input": {"file_path": "a.py"}},
+            {"type": "text", "text": "and"},
+            {"type": "tool_use", "id": "t2", "name": "Bash"},
+        ]}}
+
+        assert entry_events(entry) == [
+            ToolUse("t1", "Read", {"file_path": "a.py"}, 2.0),
+            ToolUse("t2", "Bash", {}, 2.0),
+        ]
+
+    def test_user_items(self):
+        entry = {"type": "user", "timestamp": "2026-03-01T10:00:00Z", "message": {"content": [
+            {"type": "tool_result", "tool_use_id": "t1", "content": "ok"},
+            {"type": "text", "text": "[Request interrupted by user]"},
+            {"type": "text", "text": "try again"},
+        ]}}
+
+        assert entry_events(entry) == [
+            ToolResult("t1", "ok", "2026-03-01T10:00:00Z"),
+            Interruption("2026-03-01T10:00:00Z"),
+            Prompt("try again", "2026-03-01T10:00:00Z"),
+        ]
+
+    @pytest.mark.parametrize("entry, events", [
+        ({"type": "user", "message": {"content": "hello"}}, [Prompt("hello")]),
+        ({"type": "user", "message": {"content": " \n"}}, []),
+        ({"type": "user", "message": {"content": "[Request interrupted by user]"}}, [Interruption()]),
+        ({"type": "system", "subtype": "compact_boundary", "timestamp": 1.0}, [Compaction(1.0)]),
+        ({"type": "system", "subtype": "informational"}, []),
+        ({"type": "progress", "data": {}}, []),
+    ])
+    def test_entries(self, entry, events):
+        assert entry_events(entry) == events
+
+
+class TestBothParsers:
+    def test_same_events_for_every_entry(self, transcript):
+        for line in transcript.read_text().splitlines():
+            entry = json.loads(line)
+            assert [vars(event) for event in entry_events(entry)] == [vars(event) for event in hook.entry_events(entry)]
@@ -7,6 +7,9 @@ when skill/agent/command files have invalid YAML.
 import sys
 from pathlib import Path
 
+import pytest
+import yaml
+
 sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "observability-usage-collector" / "scripts"))
 import collect_usage
 
@@ -184,3 +187,74 @@ class TestPreComputedFindings:
 
         assert len(findings["invalid_yaml_files"]) == 20
         assert findings["counts"]["invalid_yaml_files"] == 30  # Full count preserved
+
+
+class TestFlatFrontmatterFastPath:
+    """_parse_flat_frontmatter either defers to YAML or agrees with it exactly."""
+
+    @pytest.mark.parametrize("text", [
+        "\nname: tdd\ndescription: Use for test driven development, red/green [refactor]\n",
+        "\nname: it's fine\nmodel: sonnet\n\n",
+        "\nname: foo#bar\n",
+        "\n",
+    ])
+    def test_flat_frontmatter_matches_yaml(self, text):
+        assert collect_usage._parse_flat_frontmatter(text) == (yaml.safe_load(text) or {})
+
+    @pytest.mark.parametrize("text", [
+        "\nname: yes\n",                       # boolean
+        "\nenabled: Off\n",                    # boolean
+        "\nname: null\n",                      # null
+        "\nversion: 1.0\n",                    # number
+        "\nname: 'quoted'\n",                  # quoting
+        "\ndescription: value # comment\n",    # comment
+        "\ndescription: has: colon\n",         # mapping indicator
+        "\ntools:\n  - Read\n",               # nested list
+        "\ndescription: >\n  folded\n",       # block scalar
+        "\nname: a\nname: b\n",               # duplicate key
+        "\non: push\n",                        # boolean key
+    ])
+    def test_non_flat_frontmatter_defers_to_yaml(self, text):
+        assert collect_usage._parse_flat_frontmatter(text) is None
+
+    def test_flat_frontmatter_does_not_import_yaml(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "yaml", None)  # Any import of yaml now fails
+
+        content = "---\nname: tdd\ndescription: Test driven development\n---\n"
+
+        assert collect_usage.extract_yaml_frontmatter(content) == {
+            "name": "tdd", "description": "Test driven development",
+        }
+
+
+class TestReadFrontmatterText:
+    """The bounded reader returns what content.split("---", 2)[1] would."""
+
+    @staticmethod
+    def _expected(path: Path):
+        content = path.read_text()
+        parts = content.split("---", 2)
+        return parts[1] if content.startswith("---") and len(parts) == 3 else None
+
+    @pytest.mark.parametrize("content", [
+        "---\nname: x\n---\n# Body\n",
+        "---\r\nname: x\r\n---\r\nbody",
+        "# No frontmatter\n---\n",
+        "---\nname: unclosed\n",
+        "---",
+        "------",
+        "---\ndescription: a---b\n---\n",
+    ])
+    @pytest.mark.parametrize("cap", [1, 8, 64 * 1024])
+    def test_matches_full_read(self, tmp_path, content, cap):
+        path = tmp_path / "SKILL.md"
+        path.write_bytes(content.encode())
+
+        assert collect_usage.read_frontmatter_text(path, cap) == self._expected(path)
+
+    def test_stops_at_closing_delimiter(self, tmp_path):
+        """The markdown body is not read (an undecodable byte deep in it goes unnoticed)."""
+        path = tmp_path / "SKILL.md"
+        path.write_bytes(b"---\nname: x\n---\n" + b"body\n" * 100_000 + b"\xff")
+
+        assert collect_usage.read_yaml_frontmatter(path) == {"name": "x"}